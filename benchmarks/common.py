@@ -0,0 +1,91 @@
+"""Common functions for benchmarks."""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import time
+import timeit
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from tests.common import config_entry_stub
+
+type BenchmarkResults = dict[str, dict[str, float]]
+
+BENCHMARK_RESULTS = pytest.StashKey[BenchmarkResults]()
+
+APPLIANCE_API_DIR = (
+    Path(__file__).parent.parent
+    / "custom_components"
+    / "geappliances"
+    / "appliance_api"
+)
+
+
+def load_appliance_api_erd_defs() -> list[dict[str, Any]]:
+    """Return the ERD definitions from the appliance API catalog."""
+    with (APPLIANCE_API_DIR / "appliance_api_erd_definitions.json").open(
+        encoding="utf-8"
+    ) as erd_defs:
+        return json.load(erd_defs)["erds"]
+
+
+def erd_size(erd_def: dict[str, Any]) -> int:
+    """Return the number of bytes needed to hold every field of the ERD."""
+    return max(
+        (field["offset"] + field["size"] for field in erd_def["data"]), default=0
+    )
+
+
+def time_per_call_us(fn: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Return the best observed time for a single call of the function in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def record(results: BenchmarkResults, name: str, **metrics: float) -> dict[str, float]:
+    """Record the metrics for the named benchmark."""
+    results.setdefault(name, {}).update(metrics)
+    return results[name]
+
+
+async def given_the_integration_uses_the_full_catalog(hass: HomeAssistant) -> None:
+    """Set up the integration with the appliance API, ERD definitions and meta ERDs it ships with."""
+    entry = config_entry_stub()
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+class CallTimer:
+    """Total the time spent in calls to an async method."""
+
+    def __init__(self) -> None:
+        """Initialize the timer."""
+        self.seconds = 0.0
+        self.calls = 0
+
+    def reset(self) -> None:
+        """Start counting from zero."""
+        self.seconds = 0.0
+        self.calls = 0
+
+    @contextmanager
+    def timing(self, target: Any, name: str) -> Iterator["CallTimer"]:
+        """Time every call to the named async method of the target while in the context."""
+        method = getattr(target, name)
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.calls += 1
+
+        with patch.object(target, name, timed):
+            yield self
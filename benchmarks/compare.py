@@ -0,0 +1,207 @@
+"""Compare benchmark results against a baseline measured on the same machine and fail on regressions.
+
+Run scripts/benchmark_base main base.json, scripts/benchmark --benchmark-json results.json, then
+scripts/compare_benchmarks results.json --baseline base.json.
+"""
+
+import argparse
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+import json
+from pathlib import Path
+import sys
+
+# Kept free of Home Assistant and pytest imports so the comparison runs without setting up a test environment
+type BenchmarkResults = dict[str, dict[str, float]]
+
+
+@dataclass(frozen=True)
+class Gate:
+    """A metric that fails the comparison if it gets worse than the baseline by more than the tolerance."""
+
+    benchmark: str
+    metric: str
+    higher_is_better: bool
+    tolerance: float
+
+    def matches(self, benchmark: str, metric: str) -> bool:
+        """Return true if the gate applies to the metric of the benchmark."""
+        return metric == self.metric and fnmatchcase(benchmark, self.benchmark)
+
+
+# Timings vary between runs on the same machine, so they are given more room than memory, which is traced deterministically
+GATES = (
+    Gate("ingest.*", "messages_per_second", higher_is_better=True, tolerance=0.25),
+    Gate("discovery.feature_api.total", "ms", higher_is_better=False, tolerance=0.25),
+    Gate(
+        "discovery.startup",
+        "start_discovery_ms",
+        higher_is_better=False,
+        tolerance=0.25,
+    ),
+    Gate("memory.fleet.*", "bytes_per_device", higher_is_better=False, tolerance=0.1),
+    Gate("memory.fleet.*", "bytes_per_entity", higher_is_better=False, tolerance=0.1),
+)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """How a gated metric compares with its baseline."""
+
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float | None
+    gate: Gate
+
+    @property
+    def change(self) -> float | None:
+        """Return the relative change from the baseline, positive when the metric went up."""
+        if self.current is None or self.baseline == 0:
+            return None
+
+        return (self.current - self.baseline) / self.baseline
+
+    @property
+    def status(self) -> str:
+        """Return whether the metric regressed, improved, stayed within its tolerance or was not run."""
+        if self.current is None:
+            return "not run"
+        if (change := self.change) is None:
+            return "ok"
+
+        worse = -change if self.gate.higher_is_better else change
+        if worse > self.gate.tolerance:
+            return "REGRESSED"
+        if worse < -self.gate.tolerance:
+            return "improved"
+        return "ok"
+
+
+def gate_for(benchmark: str, metric: str) -> Gate | None:
+    """Return the gate for the metric of the benchmark, or None if it is not gated."""
+    return next((gate for gate in GATES if gate.matches(benchmark, metric)), None)
+
+
+def gated_metrics(results: BenchmarkResults) -> BenchmarkResults:
+    """Return only the gated metrics of the results."""
+    gated: BenchmarkResults = {}
+    for benchmark, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            if gate_for(benchmark, metric) is not None:
+                gated.setdefault(benchmark, {})[metric] = value
+
+    return gated
+
+
+def compare(baseline: BenchmarkResults, current: BenchmarkResults) -> list[Comparison]:
+    """Compare every gated metric of the baseline with the current results."""
+    comparisons = []
+    for benchmark, metrics in sorted(baseline.items()):
+        for metric, value in sorted(metrics.items()):
+            if (gate := gate_for(benchmark, metric)) is not None:
+                comparisons.append(
+                    Comparison(
+                        benchmark,
+                        metric,
+                        value,
+                        current.get(benchmark, {}).get(metric),
+                        gate,
+                    )
+                )
+
+    return comparisons
+
+
+def format_table(comparisons: list[Comparison]) -> str:
+    """Return the comparisons as a table with a row per metric."""
+    rows = [("benchmark", "metric", "baseline", "current", "change", "limit", "status")]
+    for comparison in comparisons:
+        change = comparison.change
+        rows.append(
+            (
+                comparison.benchmark,
+                comparison.metric,
+                f"{comparison.baseline:,.1f}",
+                f"{comparison.current:,.1f}" if comparison.current is not None else "-",
+                f"{change:+.1%}" if change is not None else "-",
+                f"{'-' if comparison.gate.higher_is_better else '+'}{comparison.gate.tolerance:.0%}",
+                comparison.status,
+            )
+        )
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if column < 2 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths, strict=True))
+        ).rstrip()
+        for row in rows
+    )
+
+
+def load(path: Path) -> BenchmarkResults:
+    """Return the benchmark results stored in the file."""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Compare the results with the baseline, or replace the baseline with them, and return the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="scripts/compare_benchmarks",
+        description="Compare benchmark results written by scripts/benchmark --benchmark-json with the baseline.",
+    )
+    parser.add_argument("results", type=Path, help="benchmark results JSON file")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        required=True,
+        help="baseline JSON file, written by scripts/benchmark_base on the same machine",
+    )
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="do not fail on gated metrics of the baseline that are missing from the results, when only some benchmarks were run",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="replace the baseline with the gated metrics of the results",
+    )
+    args = parser.parse_args(argv)
+
+    current = load(args.results)
+    if args.update:
+        args.baseline.write_text(
+            json.dumps(gated_metrics(current), indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        sys.stdout.write(f"Updated {args.baseline}\n")
+        return 0
+
+    comparisons = compare(load(args.baseline), current)
+    sys.stdout.write(format_table(comparisons) + "\n")
+
+    status = 0
+    regressed = [c for c in comparisons if c.status == "REGRESSED"]
+    if regressed:
+        sys.stdout.write(
+            f"\n{len(regressed)} of {len(comparisons)} metrics regressed\n"
+        )
+        status = 1
+
+    missing = [c for c in comparisons if c.current is None]
+    if missing and not args.allow_missing:
+        sys.stdout.write(
+            f"\n{len(missing)} of {len(comparisons)} metrics were not run, "
+            "run every benchmark or pass --allow-missing\n"
+        )
+        status = 1
+
+    if status == 0:
+        sys.stdout.write(f"\nNo regressions in {len(comparisons)} metrics\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Configuration for benchmarks."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from .common import BENCHMARK_RESULTS, BenchmarkResults
+
+pytest_plugins = "pytest_homeassistant_custom_component"  # pylint: disable=invalid-name
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to write benchmark results to a file."""
+    parser.addoption(
+        "--benchmark-json",
+        action="store",
+        default=None,
+        help="Write the benchmark results to the given JSON file.",
+    )
+    parser.addoption(
+        "--memory-fleet-sizes",
+        action="store",
+        default="1,10,50",
+        help="Comma separated fleet sizes to measure the memory footprint at, such as 1,10,100,500.",
+    )
+    parser.addoption(
+        "--replay-capture",
+        action="append",
+        default=[],
+        help="Replay an MQTT recording saved by the stop_recording service. May be given more than once.",
+    )
+    parser.addoption(
+        "--replay-realtime",
+        action="store_true",
+        default=False,
+        help="Replay recordings at their recorded speed rather than as fast as possible.",
+    )
+    parser.addoption(
+        "--replay-update",
+        action="store_true",
+        default=False,
+        help="Store the entity states after replaying each recording as the states later replays must end in.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Create the store for the benchmark results."""
+    config.stash[BENCHMARK_RESULTS] = {}
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run the capture replay benchmark once for every recording given on the command line."""
+    if "replay_capture" in metafunc.fixturenames:
+        captures = [
+            Path(path) for path in metafunc.config.getoption("--replay-capture")
+        ]
+        metafunc.parametrize(
+            "replay_capture", captures, ids=[capture.name for capture in captures]
+        )
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Report the benchmark results and write them to a file if requested."""
+    results = config.stash.get(BENCHMARK_RESULTS, {})
+    if not results:
+        return
+
+    terminalreporter.section("benchmark results")
+    for name, metrics in sorted(results.items()):
+        terminalreporter.write_line(name)
+        for metric, value in sorted(metrics.items()):
+            terminalreporter.write_line(f"    {metric}: {value:.6g}")
+
+    if (path := config.getoption("--benchmark-json")) is not None:
+        Path(path).write_text(
+            json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+
+@pytest.fixture
+def benchmark_results(request: pytest.FixtureRequest) -> BenchmarkResults:
+    """Return the store that benchmarks record their results in."""
+    return request.config.stash[BENCHMARK_RESULTS]
+
+
+# This fixture enables loading custom integrations in all benchmarks.
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Automatically enable loading custom integrations in all benchmarks."""
+    return
+
+
+@pytest.fixture
+def memory_fleet_sizes(request: pytest.FixtureRequest) -> list[int]:
+    """Return the fleet sizes to measure the memory footprint at, smallest first."""
+    return sorted(
+        int(size)
+        for size in request.config.getoption("--memory-fleet-sizes").split(",")
+    )
+
+
+@pytest.fixture
+def replay_realtime(request: pytest.FixtureRequest) -> bool:
+    """Return true if recordings should be replayed at their recorded speed."""
+    return request.config.getoption("--replay-realtime")
+
+
+@pytest.fixture
+def replay_update(request: pytest.FixtureRequest) -> bool:
+    """Return true if the entity states after a replay should be stored rather than checked."""
+    return request.config.getoption("--replay-update")
@@ -0,0 +1,78 @@
+"""Benchmark decoding multi-field ERD updates."""
+
+import random
+
+from custom_components.geappliances.codec import ErdCodec
+
+from .common import (
+    BenchmarkResults,
+    erd_size,
+    load_appliance_api_erd_defs,
+    record,
+    time_per_call_us,
+)
+
+MIN_FIELDS = 4
+
+
+def given_the_multi_field_erds() -> list[tuple[ErdCodec, bytes]]:
+    """Return a compiled codec and a payload for every catalog ERD with several fields."""
+    rng = random.Random(0)
+    return [
+        (ErdCodec.from_erd_def(erd_def), rng.randbytes(erd_size(erd_def)))
+        for erd_def in load_appliance_api_erd_defs()
+        if len(erd_def["data"]) >= MIN_FIELDS
+    ]
+
+
+def decode_per_entity(erds: list[tuple[ErdCodec, bytes]]) -> list[list]:
+    """Decode every field separately, as each entity did before codecs were shared."""
+    return [
+        [layout.decode(payload) for layout in codec.layouts] for codec, payload in erds
+    ]
+
+
+def decode_shared(erds: list[tuple[ErdCodec, bytes]]) -> list[list]:
+    """Decode each ERD once and let every entity index into the shared result."""
+    values = []
+    for codec, payload in erds:
+        decoded = codec.decode(payload)
+        values.append([decoded[index] for index in range(len(codec.layouts))])
+    return values
+
+
+class TestCodecBenchmark:
+    """Hold codec benchmarks."""
+
+    def test_multi_field_update(self, benchmark_results: BenchmarkResults) -> None:
+        """Measure the CPU time to decode one update of each multi-field catalog ERD for all of its entities."""
+        erds = given_the_multi_field_erds()
+        assert decode_shared(erds) == decode_per_entity(erds)
+
+        per_entity_us = time_per_call_us(lambda: decode_per_entity(erds), 20)
+        shared_us = time_per_call_us(lambda: decode_shared(erds), 20)
+
+        record(
+            benchmark_results,
+            "codec.multi_field_update",
+            erds=len(erds),
+            fields=sum(len(codec.layouts) for codec, _ in erds),
+            per_entity_us_per_update=per_entity_us / len(erds),
+            shared_us_per_update=shared_us / len(erds),
+            speedup=per_entity_us / shared_us,
+        )
+
+    def test_compile_catalog(self, benchmark_results: BenchmarkResults) -> None:
+        """Measure the time to compile codecs for the whole catalog."""
+        erd_defs = load_appliance_api_erd_defs()
+
+        compile_us = time_per_call_us(
+            lambda: [ErdCodec.from_erd_def(erd_def) for erd_def in erd_defs], 1
+        )
+
+        record(
+            benchmark_results,
+            "codec.compile_catalog",
+            erds=len(erd_defs),
+            total_ms=compile_us / 1000,
+        )
@@ -0,0 +1,140 @@
+"""Test comparing benchmark results against the baseline."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from .compare import BenchmarkResults, gated_metrics, main
+
+BASELINE_RESULTS: BenchmarkResults = {
+    "ingest.single_field": {"messages_per_second": 1000.0, "p99_us": 50.0},
+    "discovery.feature_api.total": {"ms": 100.0},
+    "memory.fleet.10": {"bytes_per_device": 2000.0},
+}
+
+
+def given_the_baseline(tmp_path: Path) -> Path:
+    """Write the baseline results and return the file."""
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(BASELINE_RESULTS), encoding="utf-8")
+    return path
+
+
+def given_the_results(
+    tmp_path: Path, benchmark: str | None = None, **metrics: float
+) -> Path:
+    """Write results equal to the baseline apart from the metrics of the benchmark, and return the file."""
+    results = {name: dict(values) for name, values in BASELINE_RESULTS.items()}
+    if benchmark is not None:
+        results[benchmark].update(metrics)
+
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(results), encoding="utf-8")
+    return path
+
+
+def given_no_results(tmp_path: Path) -> Path:
+    """Write results without any benchmark, and return the file."""
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({}), encoding="utf-8")
+    return path
+
+
+def when_the_results_are_compared(results: Path, baseline: Path, *options: str) -> int:
+    """Compare the results with the baseline and return the exit status."""
+    return main([str(results), "--baseline", str(baseline), *options])
+
+
+def the_row_should_be(
+    capsys: pytest.CaptureFixture[str], benchmark: str, status: str
+) -> None:
+    """Assert the table row of the benchmark ends with the status."""
+    rows = [
+        line
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith(benchmark)
+    ]
+    assert len(rows) == 1
+    assert rows[0].endswith(status)
+
+
+class TestCompare:
+    """Hold benchmark comparison tests."""
+
+    def test_passes_within_tolerance(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test metrics a little worse than the baseline are accepted."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_the_results(
+            tmp_path, "ingest.single_field", messages_per_second=900.0
+        )
+
+        assert when_the_results_are_compared(results, baseline) == 0
+        the_row_should_be(capsys, "ingest.single_field", "ok")
+
+    def test_fails_when_throughput_drops(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test lower throughput than the tolerance allows fails the comparison."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_the_results(
+            tmp_path, "ingest.single_field", messages_per_second=500.0
+        )
+
+        assert when_the_results_are_compared(results, baseline) == 1
+        the_row_should_be(capsys, "ingest.single_field", "REGRESSED")
+
+    def test_fails_when_memory_grows(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test metrics where lower is better fail when they go up."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_the_results(
+            tmp_path, "memory.fleet.10", bytes_per_device=3000.0
+        )
+
+        assert when_the_results_are_compared(results, baseline) == 1
+        the_row_should_be(capsys, "memory.fleet.10", "REGRESSED")
+
+    def test_reports_improvements(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test metrics much better than the baseline are reported as improved."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_the_results(tmp_path, "discovery.feature_api.total", ms=10.0)
+
+        assert when_the_results_are_compared(results, baseline) == 0
+        the_row_should_be(capsys, "discovery.feature_api.total", "improved")
+
+    def test_fails_when_benchmarks_were_not_run(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test gated metrics missing from the results fail the comparison."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_no_results(tmp_path)
+
+        assert when_the_results_are_compared(results, baseline) == 1
+        the_row_should_be(capsys, "memory.fleet.10", "not run")
+
+    def test_allows_benchmarks_that_were_not_run_when_asked(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test running only some of the benchmarks passes with --allow-missing."""
+        baseline = given_the_baseline(tmp_path)
+        results = given_no_results(tmp_path)
+
+        assert when_the_results_are_compared(results, baseline, "--allow-missing") == 0
+        the_row_should_be(capsys, "memory.fleet.10", "not run")
+
+    def test_updates_the_baseline_with_gated_metrics(self, tmp_path: Path) -> None:
+        """Test updating the baseline keeps only the metrics that are compared."""
+        baseline = tmp_path / "baseline.json"
+        results = given_the_results(tmp_path)
+
+        main([str(results), "--baseline", str(baseline), "--update"])
+
+        stored = json.loads(baseline.read_text(encoding="utf-8"))
+        assert stored == gated_metrics(BASELINE_RESULTS)
+        assert "p99_us" not in stored["ingest.single_field"]
@@ -0,0 +1,177 @@
+"""Benchmark starting discovery and discovering a device for every feature appliance API in the catalog."""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+from custom_components.geappliances import (
+    get_appliance_api_erd_defs_json,
+    get_appliance_api_json,
+    get_meta_erds_json,
+    start_discovery,
+)
+from custom_components.geappliances.const import DISCOVERY, DOMAIN
+from custom_components.geappliances.ha_compatibility.data_source import DataSource
+from custom_components.geappliances.ha_compatibility.meta_erds import MetaErdCoordinator
+from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTClient
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .common import (
+    BenchmarkResults,
+    CallTimer,
+    given_the_integration_uses_the_full_catalog,
+    record,
+)
+
+from tests.simulator.catalog import Catalog
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+ALL_FEATURES = 0xFFFFFFFF
+
+
+def milliseconds_since(start: float) -> float:
+    """Return the milliseconds passed since the start time."""
+    return (time.perf_counter() - start) * 1000
+
+
+def given_every_feature_api_version() -> list[tuple[str, str]]:
+    """Return every (type, version) pair of the feature appliance APIs in the catalog."""
+    return [
+        (feature_type, version)
+        for feature_type, feature_api in Catalog.load()
+        .appliance_api["featureApis"]
+        .items()
+        for version in feature_api["versions"]
+    ]
+
+
+async def when_discovery_starts(hass: HomeAssistant) -> dict[str, float]:
+    """Start discovery, timing each part of it, and return the milliseconds each took."""
+    timings = {}
+
+    start = time.perf_counter()
+    appliance_api = await get_appliance_api_json()
+    erd_defs = await get_appliance_api_erd_defs_json()
+    meta_erds = await get_meta_erds_json()
+    timings["load_catalog_ms"] = milliseconds_since(start)
+
+    start = time.perf_counter()
+    data_source = DataSource(appliance_api, erd_defs, MagicMock(GeaMQTTClient))
+    timings["data_source_ms"] = milliseconds_since(start)
+
+    start = time.perf_counter()
+    data_source._create_status_pair_dict()
+    timings["status_pair_dict_ms"] = milliseconds_since(start)
+
+    start = time.perf_counter()
+    MetaErdCoordinator(data_source, json.loads(meta_erds))
+    timings["meta_erd_table_ms"] = milliseconds_since(start)
+
+    start = time.perf_counter()
+    await start_discovery(hass, hass.config_entries.async_entries(DOMAIN)[0])
+    timings["start_discovery_ms"] = milliseconds_since(start)
+
+    await data_source.shutdown()
+    return timings
+
+
+async def when_the_manifest_is_discovered(
+    device_name: str, feature_type: str, version: str, hass: HomeAssistant
+) -> float:
+    """Publish a feature appliance API manifest with every feature enabled and return the milliseconds until its entities are added."""
+    manifest = (
+        int(feature_type).to_bytes(2)
+        + int(version).to_bytes(2)
+        + ALL_FEATURES.to_bytes(4)
+    )
+
+    start = time.perf_counter()
+    async_fire_mqtt_message(
+        hass, f"geappliances/{device_name}/erd/0x0093/value", manifest.hex()
+    )
+    await hass.async_block_till_done()
+    return milliseconds_since(start)
+
+
+def the_entity_count_for(device_name: str, hass: HomeAssistant) -> int:
+    """Return the number of entities registered for the device."""
+    return sum(
+        entry.unique_id.startswith(f"{device_name}_")
+        for entry in er.async_get(hass).entities.values()
+    )
+
+
+class TestDiscoveryBenchmark:
+    """Hold discovery and startup benchmarks."""
+
+    async def test_start_discovery(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure loading the catalog and building the tables discovery needs."""
+        await given_the_integration_uses_the_full_catalog(hass)
+
+        timings = await when_discovery_starts(hass)
+
+        record(benchmark_results, "discovery.startup", **timings)
+
+    async def test_discover_every_feature_api(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure discovering a device with every feature of each feature appliance API version, breaking out where the time goes."""
+        await given_the_integration_uses_the_full_catalog(hass)
+        discovery = hass.data[DOMAIN][DISCOVERY]
+        erd_factory = discovery._erd_factory
+        build_config = CallTimer()
+        get_erd_def = CallTimer()
+        dispatch = CallTimer()
+        feature_api_versions = given_every_feature_api_version()
+
+        total_ms = 0.0
+        total_entities = 0
+        with (
+            build_config.timing(erd_factory._config_factory, "build_config"),
+            get_erd_def.timing(discovery._data_source, "get_erd_def"),
+            dispatch.timing(discovery._registry_updater, "add_entity_to_device"),
+        ):
+            for feature_type, version in feature_api_versions:
+                for timer in (build_config, get_erd_def, dispatch):
+                    timer.reset()
+                device_name = f"bench-{feature_type}-{version}"
+
+                elapsed_ms = await when_the_manifest_is_discovered(
+                    device_name, feature_type, version, hass
+                )
+                entities = the_entity_count_for(device_name, hass)
+
+                total_ms += elapsed_ms
+                total_entities += entities
+                record(
+                    benchmark_results,
+                    f"discovery.feature_api.{feature_type}.v{version}",
+                    ms=elapsed_ms,
+                    entities=entities,
+                    build_config_ms=build_config.seconds * 1000,
+                    get_erd_def_ms=get_erd_def.seconds * 1000,
+                    dispatch_ms=dispatch.seconds * 1000,
+                )
+
+        assert total_entities
+        record(
+            benchmark_results,
+            "discovery.feature_api.total",
+            manifests=len(feature_api_versions),
+            ms=total_ms,
+            entities=total_entities,
+        )
@@ -0,0 +1,238 @@
+"""Benchmark the ingest path from an MQTT message to the entities of a device built from the full catalog."""
+
+from collections.abc import Callable
+import json
+import math
+import random
+import statistics
+import time
+import tracemalloc
+
+from custom_components.geappliances.const import (
+    DISCOVERY,
+    DOMAIN,
+    MQTT_CLIENT,
+    SUBSCRIBE_TOPIC,
+    Erd,
+)
+from custom_components.geappliances.discovery import is_appliance_api_erd
+from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTMessage
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.core import HomeAssistant
+
+from .common import (
+    APPLIANCE_API_DIR,
+    BenchmarkResults,
+    given_the_integration_uses_the_full_catalog,
+    record,
+)
+
+from tests.simulator.appliance import VirtualAppliance
+from tests.simulator.catalog import Catalog
+from tests.simulator.fleet import Fleet
+from tests.simulator.transport import HassTransport
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+DEVICE_NAME = "sim-0000"
+FEATURE_APIS = [("0", "1"), ("1", "2"), ("3", "3")]
+MESSAGES = 2000
+
+
+def load_meta_erds() -> set[Erd]:
+    """Return the meta ERDs of the feature appliance APIs the benchmark device has."""
+    with (APPLIANCE_API_DIR.parent / "meta_erds.json").open(
+        encoding="utf-8"
+    ) as meta_erds:
+        meta_erd_json = json.load(meta_erds)
+
+    return {
+        int(erd, base=16)
+        for feature_type, version in FEATURE_APIS
+        for erd in meta_erd_json.get(feature_type, {}).get(version, {})
+    }
+
+
+def is_single_field(fields: list[dict]) -> bool:
+    """Return true if the ERD has one field that is not a bitfield."""
+    return len(fields) == 1 and "bits" not in fields[0]
+
+
+def is_multi_field(fields: list[dict]) -> bool:
+    """Return true if the ERD has several fields and none are bitfields."""
+    return len(fields) > 1 and all("bits" not in field for field in fields)
+
+
+def is_bitfield(fields: list[dict]) -> bool:
+    """Return true if any of the ERD's fields is a bitfield."""
+    return any("bits" in field for field in fields)
+
+
+PAYLOAD_KINDS: dict[str, Callable[[list[dict]], bool]] = {
+    "single_field": is_single_field,
+    "multi_field": is_multi_field,
+    "bitfield": is_bitfield,
+}
+
+
+async def given_a_device_from_the_full_catalog(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+) -> tuple[Catalog, VirtualAppliance]:
+    """Set up the integration with the catalog it ships with and discover a device with every feature of several feature APIs."""
+    await given_the_integration_uses_the_full_catalog(hass)
+
+    catalog = Catalog.load()
+    transport = HassTransport(hass, mqtt_mock)
+    fleet = Fleet(catalog, 0, transport.publish, heartbeat_period=None)
+    appliance = VirtualAppliance(
+        DEVICE_NAME,
+        catalog,
+        random.Random(0),
+        feature_apis=FEATURE_APIS,
+        all_features=True,
+    )
+    fleet.appliances[DEVICE_NAME] = appliance
+    fleet.start()
+    await hass.async_block_till_done()
+    return catalog, appliance
+
+
+def given_telemetry_is_never_shed(hass: HomeAssistant) -> None:
+    """Keep the overload controller at normal so every message takes the full path, even while allocations are traced."""
+    hass.data[DOMAIN][MQTT_CLIENT].overload._lag = math.inf
+
+
+def given_the_erds_of_each_kind(
+    catalog: Catalog, appliance: VirtualAppliance
+) -> dict[str, list[Erd]]:
+    """Group the device's ERDs by the kind of payload they carry."""
+    erds = [
+        erd
+        for erd in appliance.values
+        if not is_appliance_api_erd(erd) and erd in catalog.fields
+    ]
+    meta_erds = load_meta_erds()
+    kinds = {
+        kind: [
+            erd for erd in erds if erd not in meta_erds and is_kind(catalog.fields[erd])
+        ]
+        for kind, is_kind in PAYLOAD_KINDS.items()
+    }
+    kinds["meta_erd"] = [erd for erd in erds if erd in meta_erds]
+    return kinds
+
+
+def given_messages_for(
+    erds: list[Erd], appliance: VirtualAppliance
+) -> list[tuple[Erd, bytes]]:
+    """Return new values for the ERDs, cycling through them until there are enough messages."""
+    return [
+        (erd, appliance.update(erd))
+        for erd in (erds[index % len(erds)] for index in range(MESSAGES))
+    ]
+
+
+async def when_the_messages_arrive(
+    messages: list[tuple[Erd, bytes]], hass: HomeAssistant
+) -> float:
+    """Pass the messages to the MQTT client the way the MQTT integration does and return the seconds until every entity is updated."""
+    handle_message = hass.data[DOMAIN][MQTT_CLIENT].handle_message
+    received = [
+        ReceiveMessage(
+            f"geappliances/{DEVICE_NAME}/erd/{erd:#06x}/value",
+            value.hex().encode(),
+            0,
+            False,
+            SUBSCRIBE_TOPIC,
+            0,
+        )
+        for erd, value in messages
+    ]
+
+    start = time.perf_counter()
+    for message in received:
+        handle_message(message)
+    await hass.async_block_till_done()
+    return time.perf_counter() - start
+
+
+async def when_each_message_is_handled(
+    messages: list[tuple[Erd, bytes]], hass: HomeAssistant
+) -> list[float]:
+    """Pass each message to discovery as the ingest queue does and return the seconds each took."""
+    handle_message = hass.data[DOMAIN][DISCOVERY].handle_message
+    latencies = []
+    for erd, value in messages:
+        message = GeaMQTTMessage(DEVICE_NAME, f"{erd:#06x}", value)
+        start = time.perf_counter()
+        await handle_message(message)
+        latencies.append(time.perf_counter() - start)
+
+    await hass.async_block_till_done()
+    return latencies
+
+
+async def when_allocations_are_traced(
+    messages: list[tuple[Erd, bytes]], hass: HomeAssistant
+) -> tuple[int, int]:
+    """Return the memory blocks allocated and the peak bytes traced while the messages are handled."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await when_the_messages_arrive(messages, hass)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno"))
+    return blocks, peak - baseline
+
+
+class TestIngestBenchmark:
+    """Hold ingest hot path benchmarks."""
+
+    async def test_ingest_by_payload_kind(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure messages per second, per-message latency and allocations for each kind of payload."""
+        catalog, appliance = await given_a_device_from_the_full_catalog(hass, mqtt_mock)
+        given_telemetry_is_never_shed(hass)
+        kinds = given_the_erds_of_each_kind(catalog, appliance)
+
+        for kind, erds in kinds.items():
+            assert erds, f"The benchmark device has no {kind} ERDs"
+
+            seconds = await when_the_messages_arrive(
+                given_messages_for(erds, appliance), hass
+            )
+            latencies_us = [
+                latency * 1e6
+                for latency in await when_each_message_is_handled(
+                    given_messages_for(erds, appliance), hass
+                )
+            ]
+            blocks, peak = await when_allocations_are_traced(
+                given_messages_for(erds, appliance), hass
+            )
+
+            percentiles = statistics.quantiles(latencies_us, n=100)
+            record(
+                benchmark_results,
+                f"ingest.{kind}",
+                erds=len(erds),
+                messages=MESSAGES,
+                messages_per_second=MESSAGES / seconds,
+                p50_us=percentiles[49],
+                p99_us=percentiles[98],
+                allocated_blocks_per_message=blocks / MESSAGES,
+                peak_kib=peak / 1024,
+            )
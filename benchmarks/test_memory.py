@@ -0,0 +1,195 @@
+"""Benchmark the memory footprint of the integration as a simulated fleet grows."""
+
+from collections import defaultdict
+import gc
+import json
+import tracemalloc
+from unittest.mock import MagicMock
+
+from custom_components.geappliances import (
+    get_appliance_api_erd_defs_json,
+    get_appliance_api_json,
+    get_meta_erds_json,
+)
+from custom_components.geappliances.const import DATA_SOURCE, DOMAIN
+from custom_components.geappliances.ha_compatibility.data_source import (
+    SUPPORTED_ERDS,
+    UNSUPPORTED_ERDS,
+    DataSource,
+)
+from custom_components.geappliances.ha_compatibility.meta_erds import MetaErdCoordinator
+from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTClient
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .common import (
+    BenchmarkResults,
+    given_the_integration_uses_the_full_catalog,
+    record,
+)
+
+from tests.simulator.catalog import Catalog
+from tests.simulator.fleet import Fleet
+from tests.simulator.transport import HassTransport
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+# Regression thresholds, roughly twice what was measured on the shipped catalog
+MAX_CATALOG_KIB = 22_000
+MAX_BYTES_PER_DEVICE = 5_000_000
+MAX_BYTES_PER_ENTITY = 25_000
+
+# Where memory allocated by the integration's own modules is accounted, by module name
+SUBSYSTEMS = {
+    "data_source": "data_source",
+    "event": "data_source",
+    "write_buffer": "data_source",
+    "write_pipeline": "data_source",
+    "codec": "data_source",
+    "meta_erds": "meta_erds",
+}
+
+
+def subsystem_of(filename: str) -> str:
+    """Return the subsystem memory allocated in the file is accounted to."""
+    if "custom_components/geappliances" in filename:
+        module = filename.rsplit("/", 1)[-1].removesuffix(".py")
+        return SUBSYSTEMS.get(module, "entities")
+    if "/homeassistant/" in filename:
+        return "home_assistant"
+    return "other"
+
+
+def traced_bytes_by_subsystem(
+    snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot
+) -> dict[str, int]:
+    """Return the bytes allocated since the baseline and still held, by subsystem."""
+    by_subsystem: dict[str, int] = defaultdict(int)
+    for stat in snapshot.compare_to(baseline, "filename"):
+        by_subsystem[subsystem_of(stat.traceback[0].filename)] += stat.size_diff
+
+    return by_subsystem
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Collect garbage and take a snapshot of what is still allocated."""
+    gc.collect()
+    return tracemalloc.take_snapshot()
+
+
+async def when_the_catalog_is_loaded(hass: HomeAssistant) -> dict[str, float]:
+    """Return the KiB held by the parsed catalog and by the meta ERD tables built from it."""
+    appliance_api = await get_appliance_api_json()
+    erd_defs = await get_appliance_api_erd_defs_json()
+    meta_erd_json = json.loads(await get_meta_erds_json())
+
+    tracemalloc.start()
+    try:
+        before = take_snapshot()
+        data_source = DataSource(appliance_api, erd_defs, MagicMock(GeaMQTTClient))
+        loaded = take_snapshot()
+        coordinator = MetaErdCoordinator(data_source, meta_erd_json)
+        built = take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    assert coordinator is not None
+    await data_source.shutdown()
+    return {
+        "catalog_kib": sum(
+            stat.size_diff for stat in loaded.compare_to(before, "filename")
+        )
+        / 1024,
+        "meta_erd_tables_kib": sum(
+            stat.size_diff for stat in built.compare_to(loaded, "filename")
+        )
+        / 1024,
+    }
+
+
+def the_fleet_counts(hass: HomeAssistant) -> tuple[int, int]:
+    """Return the number of ERDs held and entities registered for the running fleet."""
+    data = hass.data[DOMAIN][DATA_SOURCE]._data
+    erds = sum(
+        len(device[SUPPORTED_ERDS]) + len(device[UNSUPPORTED_ERDS])
+        for device in data.values()
+    )
+    entities = sum(
+        entry.platform == DOMAIN for entry in er.async_get(hass).entities.values()
+    )
+    return erds, entities
+
+
+class TestMemoryBenchmark:
+    """Hold memory footprint benchmarks."""
+
+    async def test_catalog_footprint(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure the memory held by the loaded catalog and the meta ERD tables."""
+        await given_the_integration_uses_the_full_catalog(hass)
+
+        footprint = await when_the_catalog_is_loaded(hass)
+
+        record(benchmark_results, "memory.catalog", **footprint)
+        assert footprint["catalog_kib"] < MAX_CATALOG_KIB
+
+    async def test_fleet_footprint(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+        memory_fleet_sizes: list[int],
+    ) -> None:
+        """Measure the memory held per device, ERD and entity as the fleet grows."""
+        await given_the_integration_uses_the_full_catalog(hass)
+        transport = HassTransport(hass, mqtt_mock)
+        fleet = Fleet(
+            Catalog.load(),
+            max(memory_fleet_sizes),
+            transport.publish,
+            heartbeat_period=None,
+        )
+        names = list(fleet.appliances)
+
+        tracemalloc.start()
+        try:
+            baseline = take_snapshot()
+            started = 0
+            for fleet_size in memory_fleet_sizes:
+                for name in names[started:fleet_size]:
+                    fleet.start_appliance(name)
+                    await hass.async_block_till_done()
+                started = fleet_size
+
+                by_subsystem = traced_bytes_by_subsystem(take_snapshot(), baseline)
+                erds, entities = the_fleet_counts(hass)
+                total = sum(by_subsystem.values())
+                bytes_per_device = total / fleet_size
+                bytes_per_entity = total / entities
+                record(
+                    benchmark_results,
+                    f"memory.fleet.{fleet_size}",
+                    devices=fleet_size,
+                    erds=erds,
+                    entities=entities,
+                    total_kib=total / 1024,
+                    **{
+                        f"{subsystem}_kib": size / 1024
+                        for subsystem, size in by_subsystem.items()
+                    },
+                    bytes_per_device=bytes_per_device,
+                    bytes_per_erd=by_subsystem["data_source"] / erds,
+                    bytes_per_entity=bytes_per_entity,
+                )
+        finally:
+            tracemalloc.stop()
+
+        assert bytes_per_device < MAX_BYTES_PER_DEVICE
+        assert bytes_per_entity < MAX_BYTES_PER_ENTITY
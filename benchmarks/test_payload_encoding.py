@@ -0,0 +1,75 @@
+"""Benchmark hex and binary MQTT payload encodings."""
+
+import random
+
+from custom_components.geappliances.const import (
+    PAYLOAD_ENCODING_BINARY,
+    PAYLOAD_ENCODING_HEX,
+)
+from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTClient
+
+from homeassistant.core import HomeAssistant
+
+from .common import (
+    BenchmarkResults,
+    erd_size,
+    load_appliance_api_erd_defs,
+    record,
+    time_per_call_us,
+)
+
+
+def given_the_catalog_values() -> list[bytes]:
+    """Return a value for every catalog ERD."""
+    rng = random.Random(0)
+    return [
+        rng.randbytes(erd_size(erd_def)) for erd_def in load_appliance_api_erd_defs()
+    ]
+
+
+def encode_for_the_wire(client: GeaMQTTClient, values: list[bytes]) -> list[bytes]:
+    """Return the payloads as they arrive from the broker in the client's encoding."""
+    payloads = []
+    for value in values:
+        payload = client.encode_payload(value)
+        payloads.append(
+            payload.encode("ascii") if isinstance(payload, str) else payload
+        )
+    return payloads
+
+
+class TestPayloadEncodingBenchmark:
+    """Hold payload encoding benchmarks."""
+
+    async def test_catalog_throughput(
+        self, hass: HomeAssistant, benchmark_results: BenchmarkResults
+    ) -> None:
+        """Measure the payloads per second decoded and encoded for every catalog ERD in each encoding."""
+        values = given_the_catalog_values()
+
+        for encoding in (PAYLOAD_ENCODING_HEX, PAYLOAD_ENCODING_BINARY):
+            client = GeaMQTTClient(hass, payload_encoding=encoding)
+            payloads = encode_for_the_wire(client, values)
+            assert [client.decode_payload(payload) for payload in payloads] == values
+
+            decode_us = time_per_call_us(
+                lambda client=client, payloads=payloads: [
+                    client.decode_payload(payload) for payload in payloads
+                ],
+                50,
+            )
+            encode_us = time_per_call_us(
+                lambda client=client: [
+                    client.encode_payload(value) for value in values
+                ],
+                50,
+            )
+
+            record(
+                benchmark_results,
+                f"payload_encoding.{encoding}",
+                erds=len(values),
+                wire_bytes=sum(len(payload) for payload in payloads),
+                decodes_per_second=len(values) / decode_us * 1e6,
+                encodes_per_second=len(values) / encode_us * 1e6,
+            )
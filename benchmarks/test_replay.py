@@ -0,0 +1,164 @@
+"""Benchmark replaying recorded MQTT sessions into the integration set up with the full catalog."""
+
+import json
+from pathlib import Path
+
+from custom_components.geappliances.const import DATA_SOURCE, DOMAIN
+from custom_components.geappliances.ha_compatibility.recorder import (
+    MqttRecorder,
+    RecordedMessage,
+    read_recording,
+)
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from .common import (
+    BenchmarkResults,
+    given_the_integration_uses_the_full_catalog,
+    record,
+)
+from .test_ingest import given_telemetry_is_never_shed
+
+from tests.simulator.catalog import Catalog
+from tests.simulator.fleet import Fleet
+from tests.simulator.replay import async_replay, entity_states
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+FLEET_SIZE = 10
+SESSION_SECONDS = 600
+
+# Regression threshold, roughly twice what was measured replaying a short capture that is mostly discovery
+MAX_MS_PER_MESSAGE = 2.0
+
+# None of the appliance APIs the simulated fleet reports enable the smoker cooking request, so it stays unsupported without a value
+UNSUPPORTED_FLEET_ERDS = {0x9401}
+
+
+def given_a_recorded_session(tmp_path: Path) -> tuple[Fleet, list[RecordedMessage]]:
+    """Record a simulated fleet starting up and running for a while, and return the fleet and the saved messages."""
+    fleet = Fleet(
+        Catalog.load(),
+        FLEET_SIZE,
+        lambda topic, payload: recorder.record(topic, payload),
+    )
+    recorder = MqttRecorder(clock=lambda: fleet.time)
+    fleet.start()
+    fleet.advance(SESSION_SECONDS)
+
+    path = tmp_path / "simulated.mqtt.gz"
+    recorder.save(str(path))
+    return fleet, read_recording(str(path))
+
+
+async def the_integration_should_have_the_fleet_values(
+    fleet: Fleet, hass: HomeAssistant
+) -> None:
+    """Assert every appliance was discovered and the integration holds the last value the fleet published for every supported ERD."""
+    data_source = hass.data[DOMAIN][DATA_SOURCE]
+    for name, appliance in fleet.appliances.items():
+        assert await data_source.device_exists(name)
+        for erd, value in appliance.values.items():
+            if erd in UNSUPPORTED_FLEET_ERDS:
+                assert await data_source.erd_read(name, erd) in (value, None)
+            else:
+                assert await data_source.erd_read(name, erd) == value
+
+
+def expected_states_path(capture: Path) -> Path:
+    """Return the file holding the entity states expected after replaying the capture."""
+    return capture.with_name(capture.name.removesuffix(".mqtt.gz") + ".states.json")
+
+
+def when_the_entity_states_are_stored(capture: Path, hass: HomeAssistant) -> None:
+    """Store the entity states beside the capture as the states later replays must end in."""
+    expected_states_path(capture).write_text(
+        json.dumps(entity_states(hass), indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+
+def the_entity_states_should_match(capture: Path, hass: HomeAssistant) -> None:
+    """Assert the entity states match those stored beside the capture."""
+    path = expected_states_path(capture)
+    if not path.exists():
+        pytest.fail(
+            f"{path.name} does not exist, replay {capture.name} with --replay-update to store the expected entity states"
+        )
+
+    assert entity_states(hass) == json.loads(path.read_text(encoding="utf-8"))
+
+
+def the_replay_should_be_fast_enough(seconds: float, messages: int) -> None:
+    """Assert the integration kept up with the replayed messages."""
+    assert seconds * 1000 / messages < MAX_MS_PER_MESSAGE
+
+
+def record_replay(
+    results: BenchmarkResults, name: str, messages: int, seconds: float
+) -> None:
+    """Record the time taken to replay the messages."""
+    record(
+        results,
+        name,
+        messages=messages,
+        seconds=seconds,
+        messages_per_second=messages / seconds,
+        ms_per_message=seconds * 1000 / messages,
+    )
+
+
+class TestReplayBenchmark:
+    """Hold MQTT session replay benchmarks."""
+
+    async def test_replay_simulated_session(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+        tmp_path: Path,
+    ) -> None:
+        """Measure replaying a recording of a simulated fleet starting up and running for ten minutes."""
+        await given_the_integration_uses_the_full_catalog(hass)
+        given_telemetry_is_never_shed(hass)
+        fleet, messages = given_a_recorded_session(tmp_path)
+
+        seconds = await async_replay(hass, messages)
+
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+        record_replay(benchmark_results, "replay.simulated", len(messages), seconds)
+        the_replay_should_be_fast_enough(seconds, len(messages))
+
+    async def test_replay_capture(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+        replay_capture: Path,
+        replay_realtime: bool,
+        replay_update: bool,
+    ) -> None:
+        """Measure replaying a recording given with --replay-capture and check the entities end in the states stored beside it.
+
+        With --replay-update the states are stored instead.
+        """
+        await given_the_integration_uses_the_full_catalog(hass)
+        given_telemetry_is_never_shed(hass)
+        messages = read_recording(str(replay_capture))
+
+        seconds = await async_replay(hass, messages, realtime=replay_realtime)
+
+        if replay_update:
+            when_the_entity_states_are_stored(replay_capture, hass)
+        else:
+            the_entity_states_should_match(replay_capture, hass)
+        record_replay(
+            benchmark_results,
+            f"replay.{replay_capture.name.removesuffix('.mqtt.gz')}",
+            len(messages),
+            seconds,
+        )
+        if not replay_realtime:
+            the_replay_should_be_fast_enough(seconds, len(messages))
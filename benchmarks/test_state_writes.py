@@ -0,0 +1,145 @@
+"""Benchmark writing entity states for a large install."""
+
+import json
+import random
+import time
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_platform
+
+from .common import BenchmarkResults, record, time_per_call_us
+
+from tests.common import (
+    ERD_VALUE_TOPIC,
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+ERD_COUNT = 100
+FIELDS_PER_ERD = 4
+UPDATE_ROUNDS = 5
+FIRST_ERD = 0x1000
+
+
+def given_a_large_appliance_api() -> tuple[str, str]:
+    """Return an appliance API and ERD definitions with many multi-field sensor ERDs."""
+    erds = [FIRST_ERD + index for index in range(ERD_COUNT)]
+    appliance_api = {
+        "common": {"versions": {"1": {"required": [], "features": []}}},
+        "featureApis": {
+            "0": {
+                "featureType": "0",
+                "versions": {
+                    "1": {
+                        "required": [
+                            {
+                                "erd": f"{erd:#06x}",
+                                "name": f"Load Test {erd:#06x}",
+                                "length": FIELDS_PER_ERD,
+                            }
+                            for erd in erds
+                        ],
+                        "features": [],
+                    }
+                },
+            }
+        },
+    }
+    erd_defs = {
+        "erds": [
+            {
+                "name": f"Load Test {erd:#06x}",
+                "id": f"{erd:#06x}",
+                "operations": ["read"],
+                "data": [
+                    {
+                        "name": f"Field {field}",
+                        "type": "u8",
+                        "offset": field,
+                        "size": 1,
+                    }
+                    for field in range(FIELDS_PER_ERD)
+                ],
+            }
+            for erd in erds
+        ]
+    }
+    return json.dumps(appliance_api), json.dumps(erd_defs)
+
+
+async def given_a_large_install(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+) -> None:
+    """Initialize the integration and discover a device with many sensors."""
+    appliance_api, erd_defs = given_a_large_appliance_api()
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(appliance_api, hass)
+    given_the_appliance_api_erd_defs_are(erd_defs, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0093, "0000 0001 0000 0000", hass)
+
+
+async def when_every_erd_updates(
+    hass: HomeAssistant, rounds: int, rng: random.Random
+) -> float:
+    """Publish new values for every ERD and return the seconds until all states are written."""
+    payloads = [
+        [rng.randbytes(FIELDS_PER_ERD).hex() for _ in range(ERD_COUNT)]
+        for _ in range(rounds)
+    ]
+
+    start = time.perf_counter()
+    for round_payloads in payloads:
+        for index, payload in enumerate(round_payloads):
+            async_fire_mqtt_message(
+                hass, ERD_VALUE_TOPIC.format(f"{FIRST_ERD + index:#06x}"), payload
+            )
+        await hass.async_block_till_done()
+
+    return time.perf_counter() - start
+
+
+class TestStateWritesBenchmark:
+    """Hold state write benchmarks."""
+
+    async def test_large_install_updates(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure the state writes per second when every ERD of a large install updates."""
+        await given_a_large_install(hass, mqtt_mock)
+        sensors = [
+            entity
+            for platform in entity_platform.async_get_platforms(hass, "geappliances")
+            if platform.domain == "sensor"
+            for entity in platform.entities.values()
+        ]
+        assert len(sensors) >= ERD_COUNT * FIELDS_PER_ERD
+
+        rng = random.Random(0)
+        await when_every_erd_updates(hass, 1, rng)
+        elapsed = await when_every_erd_updates(hass, UPDATE_ROUNDS, rng)
+
+        read_us = time_per_call_us(
+            lambda: [sensor.native_value for sensor in sensors], 20
+        )
+
+        writes = UPDATE_ROUNDS * ERD_COUNT * FIELDS_PER_ERD
+        record(
+            benchmark_results,
+            "state_writes.large_install",
+            entities=len(sensors),
+            state_writes=writes,
+            writes_per_second=writes / elapsed,
+            native_value_read_us=read_us / len(sensors),
+        )
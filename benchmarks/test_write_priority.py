@@ -0,0 +1,166 @@
+"""Benchmark write latency while a device floods the integration with telemetry."""
+
+import json
+import random
+import statistics
+import time
+
+from custom_components.geappliances.const import DOMAIN, MQTT_CLIENT, SUBSCRIBE_TOPIC
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.components import switch
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TOGGLE
+from homeassistant.core import HassJob, HomeAssistant
+
+from .common import BenchmarkResults, record
+
+from tests.common import (
+    ERD_VALUE_TOPIC,
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+TELEMETRY_ERD_COUNT = 100
+FIRST_TELEMETRY_ERD = 0x1000
+SWITCH_ERD = 0x0001
+FLOOD_SIZE = 1000
+WRITES = 30
+
+
+def given_an_appliance_api_with_a_switch() -> tuple[str, str]:
+    """Return an appliance API and ERD definitions with a switch and many sensor ERDs."""
+    telemetry_erds = [
+        FIRST_TELEMETRY_ERD + index for index in range(TELEMETRY_ERD_COUNT)
+    ]
+    appliance_api = {
+        "common": {
+            "versions": {
+                "1": {
+                    "required": [
+                        {"erd": f"{erd:#06x}", "name": f"Flood {erd:#06x}", "length": 1}
+                        for erd in [SWITCH_ERD, *telemetry_erds]
+                    ],
+                    "features": [],
+                }
+            }
+        },
+        "featureApis": {},
+    }
+    erd_defs = {
+        "erds": [
+            {
+                "name": f"Flood {SWITCH_ERD:#06x}",
+                "id": f"{SWITCH_ERD:#06x}",
+                "operations": ["read", "write"],
+                "data": [{"name": "Switch", "type": "bool", "offset": 0, "size": 1}],
+            },
+            *(
+                {
+                    "name": f"Flood {erd:#06x}",
+                    "id": f"{erd:#06x}",
+                    "operations": ["read"],
+                    "data": [{"name": "Value", "type": "u8", "offset": 0, "size": 1}],
+                }
+                for erd in telemetry_erds
+            ),
+        ]
+    }
+    return json.dumps(appliance_api), json.dumps(erd_defs)
+
+
+async def given_a_device_with_a_switch(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+) -> str:
+    """Discover a device with a switch and many sensors and return the switch's entity ID."""
+    appliance_api, erd_defs = given_an_appliance_api_with_a_switch()
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(appliance_api, hass)
+    given_the_appliance_api_erd_defs_are(erd_defs, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(SWITCH_ERD, "00", hass)
+    return f"switch.flood_{SWITCH_ERD:#06x}_switch"
+
+
+def when_telemetry_floods_in(hass: HomeAssistant, rng: random.Random) -> None:
+    """Schedule a burst of telemetry to be delivered by the event loop ahead of anything started afterwards.
+
+    Messages go straight to the integration's MQTT callback the way the MQTT integration runs it, so the cost measured is the integration's own.
+    """
+    job = HassJob(hass.data[DOMAIN][MQTT_CLIENT].handle_message)
+    for _ in range(FLOOD_SIZE):
+        erd = FIRST_TELEMETRY_ERD + rng.randrange(TELEMETRY_ERD_COUNT)
+        topic = ERD_VALUE_TOPIC.format(f"{erd:#06x}")
+        message = ReceiveMessage(
+            topic, rng.randbytes(1).hex().encode(), 0, False, SUBSCRIBE_TOPIC, 0
+        )
+        hass.loop.call_soon(hass.async_run_hass_job, job, message)
+
+
+async def when_the_switch_is_toggled_during_floods(
+    entity_id: str, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+) -> list[float]:
+    """Toggle the switch right after each telemetry flood and return the seconds until each write is published."""
+    rng = random.Random(0)
+    published: list[float] = []
+
+    async def record_publish(*args) -> None:
+        published.append(time.perf_counter())
+
+    mqtt_mock.async_publish.side_effect = record_publish
+
+    latencies = []
+    for _ in range(WRITES):
+        when_telemetry_floods_in(hass, rng)
+        published.clear()
+        start = time.perf_counter()
+        hass.async_create_task(
+            hass.services.async_call(
+                switch.DOMAIN,
+                SERVICE_TOGGLE,
+                {ATTR_ENTITY_ID: entity_id},
+                blocking=True,
+            )
+        )
+        await hass.async_block_till_done()
+        assert published
+        latencies.append(published[0] - start)
+
+    return latencies
+
+
+class TestWritePriorityBenchmark:
+    """Hold write priority benchmarks."""
+
+    async def test_write_latency_during_telemetry_flood(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        benchmark_results: BenchmarkResults,
+    ) -> None:
+        """Measure how long a user's write waits to be published while telemetry floods in."""
+        entity_id = await given_a_device_with_a_switch(hass, mqtt_mock)
+        assert hass.states.get(entity_id) is not None
+
+        latencies_ms = [
+            latency * 1000
+            for latency in await when_the_switch_is_toggled_during_floods(
+                entity_id, hass, mqtt_mock
+            )
+        ]
+
+        percentiles = statistics.quantiles(latencies_ms, n=100)
+        record(
+            benchmark_results,
+            "write_priority.telemetry_flood",
+            flood_messages=FLOOD_SIZE,
+            writes=WRITES,
+            p50_ms=percentiles[49],
+            p95_ms=percentiles[94],
+            p99_ms=percentiles[98],
+        )
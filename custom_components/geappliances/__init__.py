@@ -11,12 +11,43 @@ from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DISCOVERY, DOMAIN, PLATFORMS, SUBSCRIBE_TOPIC
+from .const import (
+    CONF_COUNTER_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_PAYLOAD_ENCODING,
+    CONF_STALL_THRESHOLD,
+    CONF_WRITE_QOS,
+    CONF_WRITE_RETRIES,
+    CONF_WRITE_TIMEOUT,
+    CONF_WRITE_WINDOW,
+    COUNTER_SENSORS,
+    COUNTERS,
+    DATA_SOURCE,
+    DEFAULT_COUNTER_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PAYLOAD_ENCODING,
+    DEFAULT_STALL_THRESHOLD,
+    DEFAULT_WRITE_QOS,
+    DEFAULT_WRITE_RETRIES,
+    DEFAULT_WRITE_TIMEOUT,
+    DEFAULT_WRITE_WINDOW,
+    DISCOVERY,
+    DOMAIN,
+    MQTT_CLIENT,
+    PLATFORMS,
+    PROFILER,
+    STALL_DETECTOR,
+    SUBSCRIBE_TOPIC,
+)
 from .discovery import GeaDiscovery
+from .ha_compatibility.counters import PerformanceCounters
 from .ha_compatibility.data_source import DataSource
 from .ha_compatibility.meta_erds import MetaErdCoordinator
 from .ha_compatibility.mqtt_client import GeaMQTTClient
 from .ha_compatibility.registry_updater import RegistryUpdater
+from .ha_compatibility.stall_detector import StallDetector
+from .ha_compatibility.write_pipeline import WriteOptions
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,22 +59,68 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("MQTT integration is not available")
         return False
 
-    hass.data[DOMAIN] = {}
+    hass.data[DOMAIN] = {
+        COUNTERS: PerformanceCounters(),
+        STALL_DETECTOR: StallDetector(get_stall_threshold(entry)),
+    }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     hass.data[DOMAIN][DISCOVERY] = await start_discovery(hass, entry)
+    async_setup_services(hass)
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    mqtt_client = hass.data[DOMAIN][MQTT_CLIENT]
+    mqtt_client.qos = entry.options.get(CONF_WRITE_QOS, DEFAULT_WRITE_QOS)
+    mqtt_client.payload_encoding = entry.options.get(
+        CONF_PAYLOAD_ENCODING, DEFAULT_PAYLOAD_ENCODING
+    )
+    await hass.data[DOMAIN][DATA_SOURCE].set_write_options(get_write_options(entry))
+    hass.data[DOMAIN][COUNTER_SENSORS].set_interval(
+        entry.options.get(CONF_COUNTER_INTERVAL, DEFAULT_COUNTER_INTERVAL)
+    )
+    hass.data[DOMAIN][STALL_DETECTOR].threshold = get_stall_threshold(entry)
+
+
+def get_write_options(entry: ConfigEntry) -> WriteOptions:
+    """Return the write options configured for the entry."""
+    return WriteOptions(
+        retries=entry.options.get(CONF_WRITE_RETRIES, DEFAULT_WRITE_RETRIES),
+        timeout=entry.options.get(CONF_WRITE_TIMEOUT, DEFAULT_WRITE_TIMEOUT),
+        optimistic=entry.options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+        window=entry.options.get(CONF_WRITE_WINDOW, DEFAULT_WRITE_WINDOW) / 1000,
+    )
+
+
+def get_stall_threshold(entry: ConfigEntry) -> float | None:
+    """Return the stall detection threshold configured for the entry in seconds, or None if it is off."""
+    threshold = entry.options.get(CONF_STALL_THRESHOLD, DEFAULT_STALL_THRESHOLD)
+    return threshold / 1000 if threshold > 0 else None
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if not ok:
         return False
 
-    hass.data.pop(DOMAIN)
+    # Service handlers look up the data removed below, so they must not outlive the entry
+    for service in hass.services.async_services_for_domain(DOMAIN):
+        hass.services.async_remove(DOMAIN, service)
+
+    data = hass.data.pop(DOMAIN)
+    if (data_source := data.get(DATA_SOURCE)) is not None:
+        await data_source.shutdown()
+    if (mqtt_client := data.get(MQTT_CLIENT)) is not None:
+        mqtt_client.overload.shutdown()
+    if (profiler := data.get(PROFILER)) is not None:
+        await hass.async_add_executor_job(profiler.stop)
 
     return True
 
@@ -77,26 +154,44 @@ async def get_meta_erds_json() -> str:
 async def start_discovery(hass: HomeAssistant, entry: ConfigEntry) -> GeaDiscovery:
     """Create the discovery singleton asynchronously."""
 
-    mqtt_client = GeaMQTTClient(hass)
+    counters = hass.data[DOMAIN][COUNTERS]
+    stall_detector = hass.data[DOMAIN][STALL_DETECTOR]
+    mqtt_client = GeaMQTTClient(
+        hass,
+        entry.options.get(CONF_WRITE_QOS, DEFAULT_WRITE_QOS),
+        entry.options.get(CONF_PAYLOAD_ENCODING, DEFAULT_PAYLOAD_ENCODING),
+        counters,
+        stall_detector,
+    )
+    hass.data[DOMAIN][MQTT_CLIENT] = mqtt_client
 
     data_source = DataSource(
         await get_appliance_api_json(),
         await get_appliance_api_erd_defs_json(),
         mqtt_client,
+        get_write_options(entry),
+        counters,
     )
+    hass.data[DOMAIN][DATA_SOURCE] = data_source
 
     meta_erd_coordinator = MetaErdCoordinator(
-        data_source, json.loads(await get_meta_erds_json()), hass
+        data_source, json.loads(await get_meta_erds_json()), stall_detector
     )
     registry_updater = RegistryUpdater(hass, entry)
 
-    gea_discovery = GeaDiscovery(registry_updater, data_source, meta_erd_coordinator)
+    gea_discovery = GeaDiscovery(
+        registry_updater, data_source, meta_erd_coordinator, mqtt_client.overload
+    )
 
     await mqtt.client.async_subscribe(
         hass,
         SUBSCRIBE_TOPIC,
         mqtt_client.handle_message,
+        # Receive raw bytes so binary payloads are not decoded as text
+        encoding=None,
     )
     await mqtt_client.async_subscribe(gea_discovery.handle_message)
+    await mqtt_client.async_subscribe_batch(gea_discovery.handle_batch)
+    await mqtt_client.async_subscribe_heartbeat(gea_discovery.handle_heartbeat)
 
     return gea_discovery
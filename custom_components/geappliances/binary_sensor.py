@@ -12,7 +12,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import GEA_ENTITY_NEW
-from .entity import GeaEntity
+from .entity import GeaEntity, timed_discover
 from .models import GeaBinarySensorConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,7 +42,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(binary_sensor.DOMAIN),
-        async_discover,
+        timed_discover(hass, binary_sensor.DOMAIN, async_discover),
     )
 
 
@@ -71,16 +71,26 @@ class GeaBinarySensor(BinarySensorEntity, GeaEntity):
 
     async def async_added_to_hass(self) -> None:
         """Set initial state from ERD and set up callback for updates."""
+        if self._bit_mask == 0xFF:
+            await self.locate_field(self._erd)
+        else:
+            # The bit mask is relative to the start of the ERD rather than the field
+            shift = (self._bit_mask & -self._bit_mask).bit_length() - 1
+            await self.locate_field(
+                self._erd, shift - (self._offset * 8), self._bit_mask.bit_count()
+            )
         value = await self._data_source.erd_read(self._device_name, self._erd)
         await self.erd_updated(value)
 
         await self._data_source.erd_subscribe(
             self._device_name, self._erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._erd, self.erd_updated
         )
@@ -91,11 +101,9 @@ class GeaBinarySensor(BinarySensorEntity, GeaEntity):
         if value is None:
             self._attr_is_on = None
         else:
-            self._attr_is_on = (
-                int.from_bytes(await self.get_field_bytes(value)) & self._bit_mask != 0
-            )
+            self._attr_is_on = await self.decode_field(self._erd, value) != 0
 
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     @property
     async def async_is_on(self) -> bool | None:
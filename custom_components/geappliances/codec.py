@@ -0,0 +1,189 @@
+"""Codecs to decode ERD payloads into field values."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from operator import itemgetter
+import struct
+from typing import Any
+
+INTEGER_TYPES = frozenset(
+    ["u8", "u16", "u32", "u64", "i8", "i16", "i32", "i64", "bool", "enum"]
+)
+SIGNED_TYPES = frozenset(["i8", "i16", "i32", "i64"])
+
+_STRUCT_CODES = {1: "b", 2: "h", 4: "i", 8: "q"}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldLayout:
+    """Location and type of a field within an ERD payload."""
+
+    offset: int
+    size: int
+    integer: bool = True
+    signed: bool = False
+    bit_offset: int = 0
+    bit_size: int = 0
+
+    @classmethod
+    def from_field(cls, field: dict[str, Any]) -> "FieldLayout":
+        """Create the layout for an ERD field from the appliance API ERD definitions."""
+        bits = field.get("bits")
+        return cls(
+            field["offset"],
+            field["size"],
+            field["type"] in INTEGER_TYPES,
+            field["type"] in SIGNED_TYPES,
+            bits["offset"] if bits is not None else 0,
+            bits["size"] if bits is not None else 0,
+        )
+
+    def decode(self, payload: bytes | memoryview) -> int | bytes:
+        """Decode the field from the payload without a compiled codec."""
+        field_bytes = payload[self.offset : self.offset + self.size]
+        if not self.integer:
+            return bytes(field_bytes)
+
+        value = int.from_bytes(field_bytes, signed=self.signed)
+        if self.bit_size:
+            value = (value >> self.bit_offset) & ((1 << self.bit_size) - 1)
+
+        return value
+
+    def encode(self, payload: bytes, value: int | bytes) -> bytes:
+        """Return the payload with the field set to the value, raising ValueError if the value does not fit the field."""
+        if not self.integer:
+            if not isinstance(value, bytes) or len(value) > self.size:
+                raise ValueError(f"Value must be at most {self.size} bytes")
+            field_bytes = value.ljust(self.size, b"\0")
+        elif not isinstance(value, int):
+            raise ValueError("Value must be an integer")
+        elif self.bit_size:
+            if not 0 <= value < 1 << self.bit_size:
+                raise ValueError(f"Value must fit in {self.bit_size} bits")
+            mask = ((1 << self.bit_size) - 1) << self.bit_offset
+            current = int.from_bytes(payload[self.offset : self.offset + self.size])
+            field_bytes = ((current & ~mask) | (value << self.bit_offset)).to_bytes(
+                self.size
+            )
+        else:
+            try:
+                field_bytes = value.to_bytes(self.size, signed=self.signed)
+            except OverflowError as err:
+                raise ValueError(f"Value must fit in {self.size} bytes") from err
+
+        payload = payload.ljust(self.offset + self.size, b"\0")
+        return payload[: self.offset] + field_bytes + payload[self.offset + self.size :]
+
+
+def _position(layout: FieldLayout) -> tuple[int, int, int, int]:
+    """Return where the field sits in the payload, leaving out its type."""
+    return (layout.offset, layout.size, layout.bit_offset, layout.bit_size)
+
+
+class ErdCodec:
+    """Decoder compiled once for an ERD definition that decodes every field in one pass."""
+
+    def __init__(self, layouts: Sequence[FieldLayout]) -> None:
+        """Compile the codec for the given field layouts."""
+        self._layouts = tuple(layouts)
+        self._indexes: dict[tuple[int, int, int, int], int] = {}
+        for index, layout in enumerate(self._layouts):
+            self._indexes.setdefault(_position(layout), index)
+
+        self._compile()
+
+    @classmethod
+    def from_erd_def(cls, erd_def: dict[str, Any]) -> "ErdCodec":
+        """Compile the codec for an ERD definition."""
+        return cls([FieldLayout.from_field(field) for field in erd_def["data"]])
+
+    @property
+    def layouts(self) -> tuple[FieldLayout, ...]:
+        """Return the field layouts in definition order."""
+        return self._layouts
+
+    def index(self, layout: FieldLayout) -> int | None:
+        """Return the index in the decoded tuple of the field at the layout's position, whatever its type, or None if the ERD has no such field."""
+        return self._indexes.get(_position(layout))
+
+    def encode(self, payload: bytes, values: dict[int, int | bytes]) -> bytes:
+        """Return the payload with the fields at the given indexes set to the values."""
+        for index, value in values.items():
+            payload = self._layouts[index].encode(payload, value)
+
+        return payload
+
+    def _compile(self) -> None:
+        """Pack every aligned integer slot into a single struct and plan how to pull each field out of it."""
+        slots: dict[tuple[int, int, bool], int] = {}
+        for layout in sorted(self._layouts, key=lambda layout: layout.offset):
+            if not layout.integer or layout.size not in _STRUCT_CODES:
+                continue
+
+            key = (layout.offset, layout.size, layout.signed)
+            if key in slots:
+                continue
+
+            # Fields that partially overlap a slot are left to the memoryview fallback
+            if any(
+                layout.offset < offset + size and offset < layout.offset + layout.size
+                for offset, size, _ in slots
+            ):
+                continue
+
+            slots[key] = len(slots)
+
+        code = ">"
+        position = 0
+        for offset, size, signed in slots:
+            code += "x" * (offset - position)
+            code += _STRUCT_CODES[size] if signed else _STRUCT_CODES[size].upper()
+            position = offset + size
+
+        self._struct = struct.Struct(code)
+
+        selected: list[int] = []
+        bit_steps: list[tuple[int, int, int]] = []
+        fallback_steps: list[tuple[int, FieldLayout]] = []
+        for index, layout in enumerate(self._layouts):
+            slot = (
+                slots.get((layout.offset, layout.size, layout.signed))
+                if layout.integer
+                else None
+            )
+            if slot is None:
+                # Placeholder that is replaced by the fallback decode
+                selected.append(0)
+                fallback_steps.append((index, layout))
+            else:
+                selected.append(slot)
+                if layout.bit_size:
+                    bit_steps.append(
+                        (index, layout.bit_offset, (1 << layout.bit_size) - 1)
+                    )
+
+        self._select = itemgetter(*selected) if slots and len(selected) > 1 else None
+        self._bit_steps = tuple(bit_steps)
+        self._fallback_steps = tuple(fallback_steps)
+
+    def decode(self, payload: bytes) -> tuple[Any, ...]:
+        """Decode the payload into a tuple of field values in definition order."""
+        if self._select is None or len(payload) < self._struct.size:
+            view = memoryview(payload)
+            return tuple(layout.decode(view) for layout in self._layouts)
+
+        values = self._select(self._struct.unpack_from(payload))
+        if not self._bit_steps and not self._fallback_steps:
+            return values
+
+        field_values = list(values)
+        for index, shift, mask in self._bit_steps:
+            field_values[index] = (field_values[index] >> shift) & mask
+
+        if self._fallback_steps:
+            view = memoryview(payload)
+            for index, layout in self._fallback_steps:
+                field_values[index] = layout.decode(view)
+
+        return tuple(field_values)
@@ -3,9 +3,37 @@
 import logging
 from typing import Any
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+import voluptuous as vol
 
-from .const import DOMAIN
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+
+from .const import (
+    CONF_COUNTER_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_PAYLOAD_ENCODING,
+    CONF_STALL_THRESHOLD,
+    CONF_WRITE_QOS,
+    CONF_WRITE_RETRIES,
+    CONF_WRITE_TIMEOUT,
+    CONF_WRITE_WINDOW,
+    DEFAULT_COUNTER_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PAYLOAD_ENCODING,
+    DEFAULT_STALL_THRESHOLD,
+    DEFAULT_WRITE_QOS,
+    DEFAULT_WRITE_RETRIES,
+    DEFAULT_WRITE_TIMEOUT,
+    DEFAULT_WRITE_WINDOW,
+    DOMAIN,
+    PAYLOAD_ENCODING_BINARY,
+    PAYLOAD_ENCODING_HEX,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,6 +45,12 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
 
     data: dict[str, Any] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow for the entry."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -41,3 +75,61 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="confirm",
         )
+
+
+class OptionsFlowHandler(OptionsFlow):
+    """Handle GE Appliances options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure how writes are published to appliances and how often performance counters are refreshed."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_WRITE_QOS,
+                        default=options.get(CONF_WRITE_QOS, DEFAULT_WRITE_QOS),
+                    ): vol.In([0, 1, 2]),
+                    vol.Required(
+                        CONF_WRITE_RETRIES,
+                        default=options.get(CONF_WRITE_RETRIES, DEFAULT_WRITE_RETRIES),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+                    vol.Required(
+                        CONF_WRITE_TIMEOUT,
+                        default=options.get(CONF_WRITE_TIMEOUT, DEFAULT_WRITE_TIMEOUT),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=300)),
+                    vol.Required(
+                        CONF_WRITE_WINDOW,
+                        default=options.get(CONF_WRITE_WINDOW, DEFAULT_WRITE_WINDOW),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+                    ): bool,
+                    vol.Required(
+                        CONF_PAYLOAD_ENCODING,
+                        default=options.get(
+                            CONF_PAYLOAD_ENCODING, DEFAULT_PAYLOAD_ENCODING
+                        ),
+                    ): vol.In([PAYLOAD_ENCODING_HEX, PAYLOAD_ENCODING_BINARY]),
+                    vol.Required(
+                        CONF_COUNTER_INTERVAL,
+                        default=options.get(
+                            CONF_COUNTER_INTERVAL, DEFAULT_COUNTER_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_STALL_THRESHOLD,
+                        default=options.get(
+                            CONF_STALL_THRESHOLD, DEFAULT_STALL_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+                }
+            ),
+        )
@@ -28,7 +28,13 @@ FEATURE_API_ERD_HIGH_END = 0x010D
 
 DOMAIN = "geappliances"
 GEA_ENTITY_NEW = "gea_entity_new_{}"
+GEA_DEVICE_NEW = "gea_device_new"
 DISCOVERY = "discovery"
+DATA_SOURCE = "data_source"
+MQTT_CLIENT = "mqtt_client"
+COUNTERS = "counters"
+COUNTER_SENSORS = "counter_sensors"
+STALL_DETECTOR = "stall_detector"
 APPLIANCE_API = "appliance_api"
 APPLIANCE_API_DEFINITIONS = "appliance_api_definitions"
 
@@ -36,6 +42,43 @@ APPLIANCE_API_DEFINITIONS = "appliance_api_definitions"
 CONF_NAME = "name"
 CONF_DEVICE_ID = "id"
 
+# Options
+CONF_WRITE_QOS = "write_qos"
+CONF_WRITE_RETRIES = "write_retries"
+CONF_WRITE_TIMEOUT = "write_timeout"
+CONF_WRITE_WINDOW = "write_window"
+CONF_OPTIMISTIC = "optimistic"
+CONF_PAYLOAD_ENCODING = "payload_encoding"
+CONF_COUNTER_INTERVAL = "counter_interval"
+CONF_STALL_THRESHOLD = "stall_threshold"
+PAYLOAD_ENCODING_HEX = "hex"
+PAYLOAD_ENCODING_BINARY = "binary"
+DEFAULT_OPTIMISTIC = False
+DEFAULT_PAYLOAD_ENCODING = PAYLOAD_ENCODING_HEX
+DEFAULT_WRITE_QOS = 0
+DEFAULT_WRITE_RETRIES = 2
+DEFAULT_WRITE_RETRY_DELAY = 0.5
+DEFAULT_WRITE_TIMEOUT = 10.0
+DEFAULT_WRITE_WINDOW = 50.0  # ms
+DEFAULT_COUNTER_INTERVAL = 60.0
+DEFAULT_STALL_THRESHOLD = 0.0  # ms, 0 leaves stall detection off
+
+# Seconds without a heartbeat before a device is unavailable, checked in this many slots
+DEFAULT_AVAILABILITY_TIMEOUT = 300.0
+DEFAULT_AVAILABILITY_SLOTS = 30
+
+# Inbound telemetry handled before yielding to writes and service calls
+DEFAULT_INGEST_BATCH_SIZE = 32
+
+# Slowest telemetry handlers kept for diagnostics
+DEFAULT_SLOWEST_OPERATIONS = 10
+
+# Seconds the oldest queued message may wait before shedding more telemetry, and before shedding less
+DEFAULT_OVERLOAD_LAG = 2.0
+DEFAULT_OVERLOAD_RECOVERY_LAG = 0.2
+DEFAULT_OVERLOAD_HOLD = 10.0
+ISSUE_OVERLOADED = "overloaded"
+
 # MQTT constants
 SUBSCRIBE_TOPIC = "geappliances/#"
 
@@ -91,3 +134,72 @@ SERVICE_SET_ALLOWABLES_SCHEMA = SERVICE_BASE_SCHEMA | {
     vol.Required(ATTR_ALLOWABLE): vol.Coerce(str),
     vol.Required(ATTR_ENABLED): vol.Coerce(bool),
 }
+
+
+def erd_id(value: Any) -> int:
+    """Validate ERD ID given as an integer or a hex string."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        erd = value
+    else:
+        try:
+            erd = int(cv.string(value), base=16)
+        except ValueError as err:
+            raise vol.Invalid(f"ERD {value} is an invalid ERD ID") from err
+
+    if 0 <= erd <= 0xFFFF:
+        return erd
+
+    raise vol.Invalid(f"ERD {value} is an invalid ERD ID")
+
+
+# Services that act on a whole device
+ATTR_DEVICE = "device"
+ATTR_ERDS = "erds"
+ATTR_ERD = "erd"
+ATTR_FIELDS = "fields"
+SERVICE_WRITE_ERDS = "write_erds"
+SERVICE_WRITE_ERDS_SCHEMA = {
+    vol.Required(ATTR_DEVICE): cv.string,
+    vol.Required(ATTR_ERDS): vol.All(
+        cv.ensure_list,
+        [
+            {
+                vol.Required(ATTR_ERD): erd_id,
+                vol.Required(ATTR_FIELDS): {
+                    cv.string: vol.Any(bool, int, float, str),
+                },
+            }
+        ],
+    ),
+}
+
+SERVICE_GET_DEVICE_SNAPSHOT = "get_device_snapshot"
+SERVICE_GET_DEVICE_SNAPSHOT_SCHEMA = {
+    vol.Required(ATTR_DEVICE): cv.string,
+}
+
+# Services that profile the integration
+ATTR_INTERVAL = "interval"
+ATTR_PATH = "path"
+ATTR_SAMPLES = "samples"
+ATTR_STACKS = "stacks"
+PROFILER = "profiler"
+DEFAULT_PROFILE_INTERVAL = 5.0  # ms
+SERVICE_START_PROFILE = "start_profile"
+SERVICE_START_PROFILE_SCHEMA = {
+    vol.Optional(ATTR_INTERVAL, default=DEFAULT_PROFILE_INTERVAL): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=1000)
+    ),
+}
+
+SERVICE_STOP_PROFILE = "stop_profile"
+SERVICE_STOP_PROFILE_SCHEMA: dict[str, Any] = {}
+
+# Services that record the inbound MQTT stream
+ATTR_MESSAGES = "messages"
+ATTR_TRUNCATED = "truncated"
+MAX_RECORDING_BYTES = 64 * 1024 * 1024  # Recording stops once this much is held
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_START_RECORDING_SCHEMA: dict[str, Any] = {}
+SERVICE_STOP_RECORDING = "stop_recording"
+SERVICE_STOP_RECORDING_SCHEMA: dict[str, Any] = {}
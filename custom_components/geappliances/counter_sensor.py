@@ -0,0 +1,318 @@
+"""Diagnostic sensors showing the GE Appliances performance counters."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_COUNTER_INTERVAL,
+    COUNTER_SENSORS,
+    COUNTERS,
+    DEFAULT_COUNTER_INTERVAL,
+    DOMAIN,
+    GEA_DEVICE_NEW,
+    MQTT_CLIENT,
+)
+from .ha_compatibility.counters import (
+    LATENCY_BUCKETS,
+    DeviceCounters,
+    PerformanceCounters,
+    latency_histogram,
+    latency_percentile,
+)
+from .ha_compatibility.mqtt_client import GeaMQTTClient
+from .ha_compatibility.overload import OverloadLevel
+
+
+class CounterSensorUpdater:
+    """Class to refresh every counter sensor on a single timer.
+
+    The counters only change in memory as messages are handled, so sensor states are written once per interval rather than per message.
+    Rates and latency percentiles are over the last interval.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, counters: PerformanceCounters, interval: float
+    ) -> None:
+        """Initialize the updater."""
+        self._hass = hass
+        self._counters = counters
+        self._interval = interval
+        self._entities: list[GeaCounterSensor] = []
+        self._unsub: CALLBACK_TYPE | None = None
+        self._last_refresh = time.monotonic()
+        self._last_state_writes: dict[str | None, int] = {}
+        self._last_latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.state_writes_per_second: dict[str | None, float] = {}
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def counters_for(self, device_name: str | None) -> DeviceCounters:
+        """Return the counters of the device, or the totals for the hub."""
+        if device_name is None:
+            return self._counters.total
+
+        return self._counters.device(device_name)
+
+    @property
+    def mqtt_client(self) -> GeaMQTTClient | None:
+        """Return the MQTT client once discovery has started, or None."""
+        return self._hass.data.get(DOMAIN, {}).get(MQTT_CLIENT)
+
+    def add(self, entity: "GeaCounterSensor") -> None:
+        """Refresh the entity with the others."""
+        self._entities.append(entity)
+
+    def remove(self, entity: "GeaCounterSensor") -> None:
+        """Stop refreshing the entity."""
+        self._entities.remove(entity)
+
+    @callback
+    def start(self) -> None:
+        """Start refreshing the sensors every interval."""
+        self._unsub = async_track_time_interval(
+            self._hass,
+            self._refresh,
+            timedelta(seconds=self._interval),
+            name="geappliances counter sensors",
+        )
+
+    @callback
+    def set_interval(self, interval: float) -> None:
+        """Refresh the sensors on a new interval."""
+        if interval == self._interval:
+            return
+
+        self._interval = interval
+        self.shutdown()
+        self.start()
+
+    @callback
+    def shutdown(self) -> None:
+        """Stop refreshing the sensors."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _refresh(self, _now: datetime) -> None:
+        """Work out the rates over the last interval and write the state of every sensor."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_refresh, 1e-9)
+        self._last_refresh = now
+
+        device_names: list[str | None] = [None, *self._counters.devices]
+        for device_name in device_names:
+            state_writes = self.counters_for(device_name).state_writes
+            self.state_writes_per_second[device_name] = (
+                state_writes - self._last_state_writes.get(device_name, state_writes)
+            ) / elapsed
+            self._last_state_writes[device_name] = state_writes
+
+        if (mqtt_client := self.mqtt_client) is not None:
+            counts = mqtt_client.ingest_metrics.latency.counts
+            self.latency_counts = [
+                count - last
+                for count, last in zip(counts, self._last_latency_counts, strict=True)
+            ]
+            self._last_latency_counts = list(counts)
+
+        for entity in self._entities:
+            entity.async_write_ha_state()
+
+
+def _latency_ms(updater: CounterSensorUpdater, percentile: float) -> float | None:
+    """Return the ingest latency percentile over the last interval in milliseconds."""
+    latency = latency_percentile(updater.latency_counts, percentile)
+    return latency * 1000 if latency is not None else None
+
+
+def _latency_histogram(updater: CounterSensorUpdater) -> dict[str, int]:
+    """Return the ingest latency histogram over the last interval, keyed by each bucket's upper bound."""
+    return latency_histogram(updater.latency_counts)
+
+
+def _ingest_queue_max_depth(updater: CounterSensorUpdater) -> int | None:
+    """Return the most telemetry ever waiting in the ingest queue."""
+    mqtt_client = updater.mqtt_client
+    return mqtt_client.ingest_metrics.max_depth if mqtt_client is not None else None
+
+
+def _overload_level(updater: CounterSensorUpdater) -> str | None:
+    """Return how much inbound telemetry is being shed."""
+    mqtt_client = updater.mqtt_client
+    return mqtt_client.overload.level.name.lower() if mqtt_client is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class GeaCounterSensorDescription(SensorEntityDescription):
+    """Description of a counter sensor and how it reads its value."""
+
+    value_fn: Callable[[CounterSensorUpdater, str | None], Any]
+    attributes_fn: Callable[[CounterSensorUpdater], dict[str, Any]] | None = None
+
+
+def _total(key: str, name: str) -> GeaCounterSensorDescription:
+    """Return the description of a sensor showing one of the counters."""
+    return GeaCounterSensorDescription(
+        key=key,
+        name=name,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda updater, device_name: getattr(
+            updater.counters_for(device_name), key
+        ),
+    )
+
+
+DEVICE_COUNTER_SENSORS = (
+    _total("received", "Messages received"),
+    _total("rejected", "Messages rejected"),
+    _total("deduplicated", "Messages deduplicated"),
+    _total("meta_transforms", "Meta ERD transforms"),
+    _total("publish_failures", "MQTT publish failures"),
+    GeaCounterSensorDescription(
+        key="state_writes_per_second",
+        name="State writes per second",
+        native_unit_of_measurement="writes/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda updater, device_name: updater.state_writes_per_second.get(
+            device_name
+        ),
+    ),
+)
+
+HUB_COUNTER_SENSORS = (
+    *DEVICE_COUNTER_SENSORS,
+    GeaCounterSensorDescription(
+        key="ingest_latency_p50",
+        name="Ingest latency p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda updater, _: _latency_ms(updater, 50),
+        attributes_fn=_latency_histogram,
+    ),
+    GeaCounterSensorDescription(
+        key="ingest_latency_p99",
+        name="Ingest latency p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda updater, _: _latency_ms(updater, 99),
+    ),
+    GeaCounterSensorDescription(
+        key="ingest_queue_max_depth",
+        name="Ingest queue max depth",
+        value_fn=lambda updater, _: _ingest_queue_max_depth(updater),
+    ),
+    GeaCounterSensorDescription(
+        key="overload_level",
+        name="Overload level",
+        device_class=SensorDeviceClass.ENUM,
+        options=[level.name.lower() for level in OverloadLevel],
+        value_fn=lambda updater, _: _overload_level(updater),
+    ),
+)
+
+
+class GeaCounterSensor(SensorEntity):
+    """Representation of a GE Appliances performance counter."""
+
+    entity_description: GeaCounterSensorDescription
+
+    def __init__(
+        self,
+        updater: CounterSensorUpdater,
+        description: GeaCounterSensorDescription,
+        unique_id_prefix: str,
+        device_info: DeviceInfo,
+        device_name: str | None = None,
+    ) -> None:
+        """Initialize the counter sensor for the device, or for the hub if no device is given."""
+        self.entity_description = description
+        self._attr_unique_id = f"{unique_id_prefix}_counter_{description.key}"
+        self._attr_has_entity_name = True
+        self._attr_should_poll = False
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_info = device_info
+        self._updater = updater
+        self._device_name = device_name
+
+    @property
+    def native_value(self) -> Any:
+        """Return the counter's value as of the last refresh."""
+        return self.entity_description.value_fn(self._updater, self._device_name)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the latency histogram for the sensors that have one."""
+        if self.entity_description.attributes_fn is None:
+            return None
+
+        return self.entity_description.attributes_fn(self._updater)
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the sensor with the other counter sensors."""
+        self._updater.add(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop refreshing the sensor."""
+        self._updater.remove(self)
+
+
+async def async_setup_counter_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the hub's counter sensors now and each device's counter sensors when the device is discovered."""
+    updater = CounterSensorUpdater(
+        hass,
+        hass.data[DOMAIN][COUNTERS],
+        config_entry.options.get(CONF_COUNTER_INTERVAL, DEFAULT_COUNTER_INTERVAL),
+    )
+    hass.data[DOMAIN][COUNTER_SENSORS] = updater
+    updater.start()
+    config_entry.async_on_unload(updater.shutdown)
+
+    hub_device_info = DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name="GE Appliances",
+        manufacturer="GE Appliances",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+    async_add_entities(
+        GeaCounterSensor(updater, description, config_entry.entry_id, hub_device_info)
+        for description in HUB_COUNTER_SENSORS
+    )
+
+    @callback
+    def async_add_device_counters(device_name: str) -> None:
+        """Add the counter sensors of a discovered device."""
+        device_info = DeviceInfo(identifiers={(DOMAIN, device_name)})
+        async_add_entities(
+            GeaCounterSensor(
+                updater, description, device_name, device_info, device_name
+            )
+            for description in DEVICE_COUNTER_SENSORS
+        )
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, GEA_DEVICE_NEW, async_add_device_counters)
+    )
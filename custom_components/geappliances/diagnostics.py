@@ -0,0 +1,200 @@
+"""Diagnostics support for GE Appliances."""
+
+import asyncio
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import (
+    COMMON_APPLIANCE_API_ERD,
+    COUNTERS,
+    DATA_SOURCE,
+    DISCOVERY,
+    DOMAIN,
+    FEATURE_API_ERD_HIGH_END,
+    FEATURE_API_ERD_HIGH_START,
+    FEATURE_API_ERD_LOW_END,
+    FEATURE_API_ERD_LOW_START,
+    MQTT_CLIENT,
+    Erd,
+)
+from .ha_compatibility.counters import OperationSample, latency_histogram
+from .ha_compatibility.data_source import SUPPORTED_ERDS, UNSUPPORTED_ERDS, DataSource
+
+APPLIANCE_API_ERDS = [
+    COMMON_APPLIANCE_API_ERD,
+    *range(FEATURE_API_ERD_LOW_START, FEATURE_API_ERD_LOW_END + 1),
+    *range(FEATURE_API_ERD_HIGH_START, FEATURE_API_ERD_HIGH_END + 1),
+]
+
+# Field types that can hold serial and model numbers, names and network details
+REDACTED_FIELD_TYPES = {"string", "raw"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the performance counters and the state of every device."""
+    data = hass.data.get(DOMAIN, {})
+    diagnostics: dict[str, Any] = {
+        "options": dict(entry.options),
+        "performance": await _get_performance(data),
+        "devices": {},
+    }
+
+    if (data_source := data.get(DATA_SOURCE)) is not None:
+        redacted: dict[Erd, bool] = {}
+        for device_name in await data_source.get_device_names():
+            diagnostics["devices"][device_name] = await _get_device(
+                data, data_source, device_name, redacted
+            )
+            # Large fleets take a while to dump, so let everything else run between devices
+            await asyncio.sleep(0)
+
+    return diagnostics
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return the state of the device, or the performance counters for the hub device."""
+    data = hass.data.get(DOMAIN, {})
+    data_source: DataSource | None = data.get(DATA_SOURCE)
+    device_name = next(
+        (
+            identifier
+            for domain, identifier in device.identifiers
+            if domain == DOMAIN and identifier != entry.entry_id
+        ),
+        None,
+    )
+    if (
+        data_source is None
+        or device_name is None
+        or not await data_source.device_exists(device_name)
+    ):
+        return {"performance": await _get_performance(data)}
+
+    return {
+        "device": device_name,
+        **await _get_device(data, data_source, device_name, {}),
+    }
+
+
+async def _get_performance(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the integration's counters and the metrics of its ingest and write paths."""
+    performance: dict[str, Any] = {}
+    if (counters := data.get(COUNTERS)) is not None:
+        performance["counters"] = asdict(counters.total)
+
+    if (mqtt_client := data.get(MQTT_CLIENT)) is not None:
+        ingest = mqtt_client.ingest_metrics
+        performance["ingest"] = {
+            "queued": ingest.queued,
+            "handled": ingest.handled,
+            "depth": ingest.depth,
+            "max_depth": ingest.max_depth,
+            "deferred": ingest.deferred,
+            "latency": latency_histogram(ingest.latency.counts),
+            "slowest": [_describe_sample(sample) for sample in ingest.slowest.samples],
+        }
+        overload = asdict(mqtt_client.overload.metrics)
+        overload["level"] = mqtt_client.overload.level.name.lower()
+        performance["overload"] = overload
+
+    if (data_source := data.get(DATA_SOURCE)) is not None:
+        performance["write_buffer"] = asdict(await data_source.get_write_metrics())
+
+    return performance
+
+
+async def _get_device(
+    data: dict[str, Any],
+    data_source: DataSource,
+    device_name: str,
+    redacted: dict[Erd, bool],
+) -> dict[str, Any]:
+    """Return the device's ERDs with sensitive values redacted, its manifests, meta ERD mappings and slowest operations."""
+    device = await data_source.get_device_diagnostics(device_name)
+    for erds in (device[SUPPORTED_ERDS], device[UNSUPPORTED_ERDS]):
+        for erd_id, erd in erds.items():
+            if erd["value"] is not None and await _should_redact(
+                data_source, int(erd_id, base=16), redacted
+            ):
+                erd["value"] = REDACTED
+
+    device["manifests"] = await _get_manifests(data_source, device_name)
+    if (discovery := data.get(DISCOVERY)) is not None:
+        coordinator = discovery.meta_erd_coordinator
+        device["meta_erds"] = await coordinator.get_meta_erd_mappings(
+            device_name, [int(erd_id, base=16) for erd_id in device[SUPPORTED_ERDS]]
+        )
+
+    if (mqtt_client := data.get(MQTT_CLIENT)) is not None:
+        device["slowest"] = [
+            _describe_sample(sample)
+            for sample in mqtt_client.ingest_metrics.slowest.samples
+            if isinstance(sample.subject, tuple) and sample.subject[0] == device_name
+        ]
+
+    return device
+
+
+async def _should_redact(
+    data_source: DataSource, erd: Erd, redacted: dict[Erd, bool]
+) -> bool:
+    """Return true if the ERD has no definition or a field that can identify the appliance or its owner, remembering the answer for the rest of the dump."""
+    if (should_redact := redacted.get(erd)) is None:
+        erd_def = await data_source.get_erd_def(erd)
+        should_redact = redacted[erd] = erd_def is None or any(
+            field["type"] in REDACTED_FIELD_TYPES for field in erd_def["data"]
+        )
+
+    return should_redact
+
+
+async def _get_manifests(
+    data_source: DataSource, device_name: str
+) -> list[dict[str, Any]]:
+    """Return the appliance API manifests the device has published and whether each is in the appliance API."""
+    manifests = []
+    for api_erd in APPLIANCE_API_ERDS:
+        try:
+            value = await data_source.erd_read(device_name, api_erd)
+        except KeyError:
+            continue
+        if value is None or len(value) < 8:
+            continue
+
+        if api_erd == COMMON_APPLIANCE_API_ERD:
+            feature_type = None
+            version = f"{int.from_bytes(value[0:4])}"
+            api = await data_source.get_common_appliance_api_version(version)
+        else:
+            feature_type = f"{int.from_bytes(value[0:2])}"
+            version = f"{int.from_bytes(value[2:4])}"
+            api = await data_source.get_feature_api_version(feature_type, version)
+
+        manifests.append(
+            {
+                "erd": f"{api_erd:#06x}",
+                "feature_type": feature_type,
+                "version": version,
+                "features": f"{int.from_bytes(value[4:8]):#010x}",
+                "known": api is not None,
+            }
+        )
+
+    return manifests
+
+
+def _describe_sample(sample: OperationSample) -> dict[str, Any]:
+    """Return how long the operation took and the device and topic it handled."""
+    device_name, topic = (
+        sample.subject if isinstance(sample.subject, tuple) else (None, None)
+    )
+    return {"seconds": sample.seconds, "device": device_name, "topic": topic}
@@ -1,6 +1,7 @@
 """GE Appliances MQTT device discovery."""
 
 import logging
+from typing import Any
 
 from .const import (
     COMMON_APPLIANCE_API_ERD,
@@ -13,12 +14,35 @@ from .const import (
 from .erd_factory import ERDFactory
 from .ha_compatibility.data_source import DataSource
 from .ha_compatibility.meta_erds import MetaErdCoordinator
-from .ha_compatibility.mqtt_client import GeaMQTTMessage
+from .ha_compatibility.mqtt_client import GeaMQTTBatch, GeaMQTTMessage
+from .ha_compatibility.overload import OverloadController, OverloadLevel
 from .ha_compatibility.registry_updater import RegistryUpdater
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def is_appliance_api_erd(erd: Erd) -> bool:
+    """Return true if the ERD is the common appliance API or a feature appliance API."""
+    return (
+        erd == COMMON_APPLIANCE_API_ERD
+        or (FEATURE_API_ERD_LOW_START <= erd <= FEATURE_API_ERD_LOW_END)
+        or (FEATURE_API_ERD_HIGH_START <= erd <= FEATURE_API_ERD_HIGH_END)
+    )
+
+
+def enabled_erds(api: dict[str, Any], features: int) -> list[dict[str, Any]]:
+    """Return the ERDs an appliance API requires with the given features enabled, listing ERDs shared by several features once."""
+    erds: dict[Erd, dict[str, Any]] = {}
+    for erd in api["required"]:
+        erds.setdefault(int(erd["erd"], base=16), erd)
+    for feature in api["features"]:
+        if int(feature["mask"], base=16) & features:
+            for erd in feature["required"]:
+                erds.setdefault(int(erd["erd"], base=16), erd)
+
+    return list(erds.values())
+
+
 class GeaDiscovery:
     """Class for setting up GE Appliances using MQTT discovery."""
 
@@ -27,6 +51,7 @@ class GeaDiscovery:
         registry_updater: RegistryUpdater,
         data_source: DataSource,
         meta_erd_coordinator: MetaErdCoordinator,
+        overload: OverloadController | None = None,
     ) -> None:
         """Initialize discovery class."""
         self._registry_updater = registry_updater
@@ -35,40 +60,96 @@ class GeaDiscovery:
         )
         self._data_source = data_source
         self._meta_erd_coordinator = meta_erd_coordinator
+        self._overload = overload
+        self._paused_transforms: set[tuple[str, Erd]] = set()
+        if overload is not None:
+            overload.add_listener(self._overload_level_changed)
+
+    @property
+    def meta_erd_coordinator(self) -> MetaErdCoordinator:
+        """Return the coordinator that applies meta ERD transforms."""
+        return self._meta_erd_coordinator
 
     async def handle_message(self, msg: GeaMQTTMessage) -> None:
         """Handle an MQTT message."""
         await self.add_device_if_not_already_exists(msg.device)
+        await self._data_source.device_seen(msg.device)
 
         if msg.erd != "":
-            erd: Erd = int(msg.erd, base=16)
-            if not await self._data_source.erd_is_supported_by_device(msg.device, erd):
+            await self.handle_erd(msg.device, int(msg.erd, base=16), msg.payload)
+
+    async def handle_batch(self, batch: GeaMQTTBatch) -> None:
+        """Handle a batch of ERD values received in a single MQTT message."""
+        await self.add_device_if_not_already_exists(batch.device)
+        await self._data_source.device_seen(batch.device)
+
+        # Appliance APIs decide which ERDs are supported, so handle them before the values they describe
+        for erd, payload in sorted(
+            batch.erds, key=lambda record: not is_appliance_api_erd(record[0])
+        ):
+            await self.handle_erd(batch.device, erd, payload)
+
+    async def handle_heartbeat(self, device_name: str) -> None:
+        """Handle an uptime heartbeat from a device."""
+        await self.add_device_if_not_already_exists(device_name)
+        await self._data_source.device_heartbeat(device_name)
+
+    async def handle_erd(self, device_name: str, erd: Erd, payload: bytes) -> None:
+        """Handle a new value of an ERD."""
+        overload = self._overload
+        level = overload.level if overload is not None else OverloadLevel.NORMAL
+
+        if not await self._data_source.erd_is_supported_by_device(device_name, erd):
+            if is_appliance_api_erd(erd):
+                await self._data_source.add_unsupported_erd_to_device(
+                    device_name, erd, payload
+                )
                 if erd == COMMON_APPLIANCE_API_ERD:
-                    await self._data_source.add_unsupported_erd_to_device(
-                        msg.device, erd, msg.payload
-                    )
-                    await self.process_common_appliance_api(msg.device, msg.payload)
-
-                elif (FEATURE_API_ERD_LOW_START <= erd <= FEATURE_API_ERD_LOW_END) or (
-                    FEATURE_API_ERD_HIGH_START <= erd <= FEATURE_API_ERD_HIGH_END
-                ):
-                    await self._data_source.add_unsupported_erd_to_device(
-                        msg.device, erd, msg.payload
-                    )
-                    await self.process_feature_appliance_api(msg.device, msg.payload)
-
+                    await self.process_common_appliance_api(device_name, payload)
                 else:
-                    await self._data_source.add_unsupported_erd_to_device(
-                        msg.device, erd, None
-                    )
+                    await self.process_feature_appliance_api(device_name, payload)
 
             else:
-                await self._data_source.erd_write(msg.device, erd, msg.payload)
-                if await self._meta_erd_coordinator.is_meta_erd(erd):
+                await self._data_source.add_unsupported_erd_to_device(
+                    device_name, erd, None
+                )
+
+        else:
+            if (
+                overload is not None
+                and level >= OverloadLevel.SKIP_PERIODIC
+                and await self._data_source.is_periodic_erd(erd)
+            ):
+                overload.record_skipped_periodic()
+                return
+
+            await self._data_source.erd_write(device_name, erd, payload)
+            await self._data_source.confirm_write(device_name, erd, payload)
+            if await self._meta_erd_coordinator.is_meta_erd(erd):
+                if (
+                    overload is not None
+                    and level >= OverloadLevel.PAUSE_META_TRANSFORMS
+                ):
+                    self._paused_transforms.add((device_name, erd))
+                    overload.record_paused_transform()
+                else:
                     await self._meta_erd_coordinator.apply_transforms_for_meta_erd(
-                        msg.device, erd
+                        device_name, erd
                     )
 
+    async def _overload_level_changed(self, level: OverloadLevel) -> None:
+        """Resume the meta ERD transforms put off while overloaded once transforms are no longer paused."""
+        if self._paused_transforms and level < OverloadLevel.PAUSE_META_TRANSFORMS:
+            await self._resume_paused_transforms()
+
+    async def _resume_paused_transforms(self) -> None:
+        """Apply the meta ERD transforms put off while overloaded using the latest meta ERD values."""
+        paused, self._paused_transforms = self._paused_transforms, set()
+        for device_name, erd in paused:
+            await self._meta_erd_coordinator.apply_transforms_for_meta_erd(
+                device_name, erd
+            )
+
     async def process_common_appliance_api(self, device_name: str, data: bytes) -> None:
         """Process common appliance API manifest."""
         version = f"{int.from_bytes(data[0:4])}"
@@ -86,13 +167,9 @@ class GeaDiscovery:
         )
 
         await self._erd_factory.set_up_erds(
-            common_appliance_api["required"], device_name
+            enabled_erds(common_appliance_api, features), device_name
         )
 
-        for feature in common_appliance_api["features"]:
-            if int(feature["mask"], base=16) & features:
-                await self._erd_factory.set_up_erds(feature["required"], device_name)
-
     async def process_feature_appliance_api(
         self, device_name: str, data: bytes
     ) -> None:
@@ -117,13 +194,9 @@ class GeaDiscovery:
         )
 
         await self._erd_factory.set_up_erds(
-            feature_appliance_api["required"], device_name
+            enabled_erds(feature_appliance_api, features), device_name
         )
 
-        for feature in feature_appliance_api["features"]:
-            if int(feature["mask"], base=16) & features:
-                await self._erd_factory.set_up_erds(feature["required"], device_name)
-
     async def add_device_if_not_already_exists(self, device_name: str) -> None:
         """Add a device if not in the registry."""
         if not await self._data_source.device_exists(device_name):
@@ -1,29 +1,137 @@
 """GE Appliances Entity."""
 
-from .const import Erd
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+
+from .codec import FieldLayout
+from .const import ATTR_UNIQUE_ID, DATA_SOURCE, DOMAIN, STALL_DETECTOR, Erd
 from .ha_compatibility.data_source import DataSource
+from .ha_compatibility.stall_detector import StallDetector
+from .ha_compatibility.write_buffer import ErdPatch
+from .models import GeaEntityConfig
 
 
 class GeaEntity:
     """Superclass for GE Appliance entities."""
 
+    hass: HomeAssistant
+    entity_id: str
+    unique_id: str | None
     _erd: Erd
+    _status_erd: Erd
     _data_source: DataSource
     _device_name: str
     _offset: int
     _size: int
+    _layout: FieldLayout
+    _field_index: int | None
+    _confirmation_task: asyncio.Task[None] | None = None
+    _attr_available: bool
+    erd_updated: Callable[[bytes | None], Awaitable[None]]
+    async_write_ha_state: Callable[[], None]
 
     async def get_field_bytes(self, value: bytes) -> bytes:
         """Return the bytes slice associated with this entity's field."""
         return value[self._offset : (self._offset + self._size)]
 
-    async def set_field_bytes(self, value: bytes, set_bytes: bytes) -> bytes:
-        """Set the bytes associated with this entity's field and return the new value."""
-        assert len(set_bytes) == self._size
-        return (
-            value[0 : self._offset] + set_bytes + value[(self._offset + self._size) :]
+    def field_patch(self, field_fn: Callable[[bytes], bytes]) -> ErdPatch:
+        """Return a patch that replaces this entity's field with the function of the field's current bytes."""
+        start = self._offset
+        end = self._offset + self._size
+
+        def patch(value: bytes) -> bytes:
+            set_bytes = field_fn(value[start:end])
+            assert len(set_bytes) == self._size
+            return value[:start] + set_bytes + value[end:]
+
+        return patch
+
+    async def write_patch(self, patch: ErdPatch, attr: str, value: Any) -> None:
+        """Write the patch to the entity's ERD and show the written value until it is confirmed if writes are optimistic.
+
+        Raises HomeAssistantError if the write was not published.
+        """
+        if not await self._data_source.erd_patch(self._device_name, self._erd, patch):
+            raise HomeAssistantError(
+                f"Could not write ERD {self._erd:#06x} of {self._device_name}"
+            )
+
+        await self.show_until_confirmed(attr, value)
+
+    async def locate_field(
+        self, erd: Erd, bit_offset: int = 0, bit_size: int = 0
+    ) -> None:
+        """Find this entity's field in the ERD's compiled codec."""
+        self._layout, self._field_index = await self._data_source.locate_field(
+            erd, self._offset, self._size, bit_offset, bit_size
         )
 
+    async def decode_field(self, erd: Erd, value: bytes) -> Any:
+        """Return this entity's field decoded from the ERD value, sharing the decode with every other field of the ERD."""
+        if self._field_index is not None:
+            decoded = await self._data_source.erd_decode(self._device_name, erd, value)
+            if decoded is not None:
+                return decoded[self._field_index]
+
+        return self._layout.decode(value)
+
+    @property
+    def awaiting_confirmation(self) -> bool:
+        """Return true while the entity shows a written value the device has not confirmed."""
+        return self._confirmation_task is not None
+
+    async def show_until_confirmed(self, attr: str, value: Any) -> None:
+        """Show the written value right away if writes are optimistic.
+
+        Once the device confirms the write, or the write times out, the entity shows the value the device reports again.
+        """
+        if not await self._data_source.is_optimistic():
+            return
+
+        confirmation = await self._data_source.get_write_confirmation(
+            self._device_name, self._erd
+        )
+        if confirmation is None:
+            return
+
+        setattr(self, attr, value)
+        self.async_write_ha_state()
+
+        # A later write to the same ERD shares the pending confirmation, so one task waits for both
+        if self._confirmation_task is None:
+            self._confirmation_task = self.hass.async_create_background_task(
+                self._wait_for_confirmation(confirmation),
+                f"geappliances confirm {self.entity_id}",
+            )
+
+    async def _wait_for_confirmation(self, confirmation: asyncio.Future[bool]) -> None:
+        """Show the reported value once the pending write is confirmed or times out."""
+        try:
+            await asyncio.shield(confirmation)
+        finally:
+            self._confirmation_task = None
+
+        if self.unique_id is None or (
+            await self._data_source.get_entity(self.unique_id) is not self
+        ):
+            return
+
+        if await self._data_source.erd_is_supported_by_device(
+            self._device_name, self._status_erd
+        ):
+            await self.erd_updated(
+                await self._data_source.erd_read(self._device_name, self._status_erd)
+            )
+        else:
+            await self.erd_updated(None)
+
     async def enable_or_disable(self, enabled: bool) -> None:
         """Enable or disable the entity."""
         if enabled:
@@ -33,7 +141,72 @@ class GeaEntity:
                 self._device_name, self._erd
             )
 
+    def set_available(self, available: bool) -> None:
+        """Show the entity as unavailable while its device is offline."""
+        self._attr_available = available
+        self.async_write_ha_state()
+
+    @property
+    def device_name(self) -> str:
+        """Return the name of the entity's device."""
+        return self._device_name
+
+    @property
+    def erd(self) -> Erd:
+        """Return the ERD the entity shows."""
+        return self._erd
+
     @property
     def offset(self) -> int:
         """Return the entity's offset."""
         return self._offset
+
+
+def async_register_indexed_service(
+    hass: HomeAssistant,
+    service: str,
+    schema: dict[Any, Any],
+    entity_type: type[GeaEntity],
+    handler: Callable[[Any, ServiceCall], Awaitable[None]],
+) -> None:
+    """Register a service that resolves its target entity through the unique ID index."""
+
+    async def resolve_and_handle(service_call: ServiceCall) -> None:
+        data_source: DataSource | None = hass.data.get(DOMAIN, {}).get(DATA_SOURCE)
+        if data_source is None:
+            return
+
+        entity = await data_source.get_entity(service_call.data[ATTR_UNIQUE_ID])
+        if not isinstance(entity, entity_type):
+            return
+
+        entity_id = service_call.data[ATTR_ENTITY_ID]
+        if entity_id is not None and entity_id != entity.entity_id:
+            return
+
+        stall_detector: StallDetector = hass.data[DOMAIN][STALL_DETECTOR]
+        with stall_detector.measure(
+            f"{service} service", entity.device_name, entity.erd
+        ):
+            await handler(entity, service_call)
+
+    hass.services.async_register(
+        DOMAIN, service, resolve_and_handle, vol.Schema(schema)
+    )
+
+
+def timed_discover[ConfigT: GeaEntityConfig](
+    hass: HomeAssistant,
+    platform: str,
+    async_discover: Callable[[ConfigT], Awaitable[None]],
+) -> Callable[[ConfigT], Awaitable[None]]:
+    """Wrap a platform's discovery callback so the stall detector times each entity it adds."""
+    stall_detector: StallDetector = hass.data[DOMAIN][STALL_DETECTOR]
+
+    async def discover(config: ConfigT) -> None:
+        with stall_detector.measure(
+            f"{platform} discovery", config.device_name, config.erd
+        ):
+            await async_discover(config)
+
+    return discover
@@ -52,13 +52,26 @@ class ERDFactory:
                         field,
                         "write" in erd_def["operations"],
                     )
-                    for field in erd_def["data"]
+                    for field in self._fields_with_unique_names(erd_def["data"])
                 ]
         else:
             _LOGGER.error("Could not find ERD %s", f"{erd:#06x}")
 
         return config_list
 
+    def _fields_with_unique_names(
+        self, fields: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Return the fields, leaving out any that repeat an earlier field's name since their unique IDs would collide."""
+        names = set()
+        unique_fields = []
+        for field in fields:
+            if field["name"] not in names:
+                names.add(field["name"])
+                unique_fields.append(field)
+
+        return unique_fields
+
     async def set_up_erds(
         self, erd_api_list: list[dict[str, Any]], device_name: str
     ) -> None:
@@ -0,0 +1,89 @@
+"""Home Assistant compatibility class for tracking which devices are online."""
+
+import asyncio
+from collections.abc import Callable
+
+from ..const import DEFAULT_AVAILABILITY_SLOTS, DEFAULT_AVAILABILITY_TIMEOUT
+
+
+class AvailabilityTracker:
+    """Class to mark devices offline when their heartbeats stop, using a single timer wheel for every device.
+
+    Only devices that have sent a heartbeat are tracked, so devices that never publish their uptime are always available.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[str, bool], None],
+        timeout: float = DEFAULT_AVAILABILITY_TIMEOUT,
+        slots: int = DEFAULT_AVAILABILITY_SLOTS,
+    ) -> None:
+        """Initialize the tracker.
+
+        A device goes offline between timeout and timeout plus one slot after it was last seen.
+        """
+        self._on_change = on_change
+        self._tick_interval = timeout / slots
+        self._slots = slots
+        self._wheel: list[set[str]] = [set() for _ in range(slots + 1)]
+        self._ticks = 0
+        self._last_seen: dict[str, int] = {}
+        self._offline: set[str] = set()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def heartbeat(self, device_name: str) -> None:
+        """Record that the device is online, starting to track it if it is not tracked yet."""
+        if device_name in self._offline:
+            self._offline.remove(device_name)
+            self._on_change(device_name, True)
+        elif device_name in self._last_seen:
+            self._last_seen[device_name] = self._ticks
+            return
+
+        self._last_seen[device_name] = self._ticks
+        self._wheel[(self._ticks + self._slots) % len(self._wheel)].add(device_name)
+        if self._timer is None:
+            self._schedule()
+
+    def seen(self, device_name: str) -> None:
+        """Record traffic from the device, which keeps a tracked device online."""
+        if device_name in self._last_seen or device_name in self._offline:
+            self.heartbeat(device_name)
+
+    def is_available(self, device_name: str) -> bool:
+        """Return false if the device has stopped sending heartbeats."""
+        return device_name not in self._offline
+
+    def shutdown(self) -> None:
+        """Stop the timer wheel."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule(self) -> None:
+        """Advance the wheel after one tick."""
+        self._timer = asyncio.get_running_loop().call_later(
+            self._tick_interval, self._advance
+        )
+
+    def _advance(self) -> None:
+        """Take the devices due in the current slot offline, moving any that were seen since to the slot they are now due in."""
+        self._ticks += 1
+        slot = self._wheel[self._ticks % len(self._wheel)]
+        due = list(slot)
+        slot.clear()
+
+        for device_name in due:
+            remaining = self._last_seen[device_name] + self._slots - self._ticks
+            if remaining > 0:
+                self._wheel[(self._ticks + remaining) % len(self._wheel)].add(
+                    device_name
+                )
+            else:
+                del self._last_seen[device_name]
+                self._offline.add(device_name)
+                self._on_change(device_name, False)
+
+        self._timer = None
+        if self._last_seen:
+            self._schedule()
@@ -0,0 +1,148 @@
+"""Home Assistant compatibility classes for counting the work the integration does."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import heapq
+from typing import Any
+
+from ..const import DEFAULT_SLOWEST_OPERATIONS
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket holding everything slower
+LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+)
+
+
+class LatencyHistogram:
+    """Class to count latencies in fixed buckets, so recording one is a bisect and an increment."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, latency: float) -> None:
+        """Count a latency in seconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+
+def latency_percentile(counts: list[int], percentile: float) -> float | None:
+    """Return the upper bound in seconds of the bucket holding the percentile of the histogram counts, or None if nothing was counted.
+
+    Latencies slower than the last bucket are reported as the last bucket's upper bound.
+    """
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    rank = total * percentile / 100
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if seen >= rank and count:
+            return LATENCY_BUCKETS[min(bucket, len(LATENCY_BUCKETS) - 1)]
+
+    return LATENCY_BUCKETS[-1]
+
+
+def latency_histogram(counts: list[int]) -> dict[str, int]:
+    """Return the histogram counts keyed by each bucket's upper bound."""
+    labels = [f"le_{bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + ["slower"]
+    return dict(zip(labels, counts, strict=True))
+
+
+@dataclass(order=True, frozen=True, slots=True)
+class OperationSample:
+    """How long one operation took and what it was working on."""
+
+    seconds: float
+    subject: Any = field(compare=False)
+
+
+class SlowestOperations:
+    """Class to keep the slowest operations seen, so recording a fast one is a single comparison."""
+
+    def __init__(self, size: int = DEFAULT_SLOWEST_OPERATIONS) -> None:
+        """Initialize the samples."""
+        self._size = size
+        self._heap: list[OperationSample] = []
+
+    def record(self, seconds: float, subject: Any) -> None:
+        """Keep the operation if it is one of the slowest seen."""
+        if len(self._heap) < self._size:
+            heapq.heappush(self._heap, OperationSample(seconds, subject))
+        elif seconds > self._heap[0].seconds:
+            heapq.heapreplace(self._heap, OperationSample(seconds, subject))
+
+    @property
+    def samples(self) -> list[OperationSample]:
+        """Return the slowest operations seen, slowest first."""
+        return sorted(self._heap, reverse=True)
+
+
+@dataclass(slots=True)
+class DeviceCounters:
+    """Counts of the messages received from a device and the work they caused."""
+
+    received: int = 0
+    rejected: int = 0
+    deduplicated: int = 0
+    state_writes: int = 0
+    meta_transforms: int = 0
+    publish_failures: int = 0
+
+
+@dataclass
+class PerformanceCounters:
+    """Counters for every device and their totals, which also count rejected messages from no known device."""
+
+    total: DeviceCounters = field(default_factory=DeviceCounters)
+    devices: dict[str, DeviceCounters] = field(default_factory=dict)
+
+    def device(self, device_name: str) -> DeviceCounters:
+        """Return the counters of the device, creating them on first use."""
+        if (counters := self.devices.get(device_name)) is None:
+            counters = self.devices[device_name] = DeviceCounters()
+
+        return counters
+
+    def record_received(self, device_name: str) -> None:
+        """Count a message received from the device."""
+        self.device(device_name).received += 1
+        self.total.received += 1
+
+    def record_rejected(self, device_name: str | None) -> None:
+        """Count a message that could not be handled, against the device only if it is already known."""
+        if (counters := self.devices.get(device_name or "")) is not None:
+            counters.rejected += 1
+        self.total.rejected += 1
+
+    def record_deduplicated(self, device_name: str) -> None:
+        """Count a queued message from the device replaced by a newer one for the same ERD."""
+        self.device(device_name).deduplicated += 1
+        self.total.deduplicated += 1
+
+    def record_state_writes(self, device_name: str, count: int) -> None:
+        """Count entity state writes for the device."""
+        self.device(device_name).state_writes += count
+        self.total.state_writes += count
+
+    def record_meta_transform(self, device_name: str) -> None:
+        """Count a meta ERD transform applied to one of the device's entities."""
+        self.device(device_name).meta_transforms += 1
+        self.total.meta_transforms += 1
+
+    def record_publish_failure(self, device_name: str) -> None:
+        """Count a write to the device that could not be published to MQTT."""
+        self.device(device_name).publish_failures += 1
+        self.total.publish_failures += 1
@@ -1,17 +1,28 @@
 """Home Assistant compatibility class for storing and accessing GE Appliances data."""
 
+import asyncio
 from collections.abc import Awaitable, Callable
+from dataclasses import asdict
 import json
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any, cast
 
+from ..codec import ErdCodec, FieldLayout
 from ..const import Erd
+from .availability import AvailabilityTracker
+from .counters import PerformanceCounters
 from .event import Event
 from .mqtt_client import GeaMQTTClient
+from .write_buffer import ErdPatch, WriteBuffer, WriteBufferMetrics
+from .write_pipeline import WriteOptions, WritePipeline, WritePipelineMetrics
+
+if TYPE_CHECKING:
+    from ..entity import GeaEntity
 
 SUPPORTED_ERDS = "supported_erds"
 UNSUPPORTED_ERDS = "unsupported_erds"
 VALUE = "value"
+DECODED = "decoded"
 EVENT = "event"
 
 
@@ -23,6 +34,8 @@ class DataSource:
         appliance_api: str,
         appliance_api_erd_definitions: str,
         mqtt_client: GeaMQTTClient,
+        write_options: WriteOptions | None = None,
+        counters: PerformanceCounters | None = None,
     ) -> None:
         """Initialize data source class."""
         self._data: dict[str, Any] = {}
@@ -31,6 +44,17 @@ class DataSource:
             appliance_api_erd_definitions
         )["erds"]
         self._mqtt_client = mqtt_client
+        self._entities: dict[str, GeaEntity] = {}
+        self._device_entities: dict[str, dict[str, GeaEntity]] = {}
+        self._codecs: dict[Erd, ErdCodec | None] = {}
+        self._periodic_erds: dict[Erd, bool] = {}
+        self._write_options = write_options or WriteOptions()
+        self._write_buffer = WriteBuffer(
+            self.erd_read, self.erd_publish, self._write_options.window
+        )
+        self._write_pipelines: dict[str, WritePipeline] = {}
+        self._availability = AvailabilityTracker(self._set_device_available)
+        self._counters = counters or PerformanceCounters()
 
         self._create_status_pair_dict()
 
@@ -92,10 +116,31 @@ class DataSource:
                 UNSUPPORTED_ERDS: {},
             }
 
+    async def device_heartbeat(self, device_name: str) -> None:
+        """Record a heartbeat from the device so it is marked unavailable if its heartbeats stop."""
+        self._availability.heartbeat(device_name)
+
+    async def device_seen(self, device_name: str) -> None:
+        """Record traffic from the device, which keeps a device that sends heartbeats available."""
+        self._availability.seen(device_name)
+
+    async def is_device_available(self, device_name: str) -> bool:
+        """Return false if the device has stopped sending heartbeats."""
+        return self._availability.is_available(device_name)
+
+    def _set_device_available(self, device_name: str, available: bool) -> None:
+        """Show every entity of the device as available or unavailable."""
+        for entity in self._device_entities.get(device_name, {}).values():
+            entity.set_available(available)
+
     async def get_device(self, device_name: str) -> dict[str, Any]:
         """Return the dict for the requested device or None if it doesn't exist."""
         return self._data[device_name]
 
+    async def get_device_names(self) -> list[str]:
+        """Return the names of every device added to the data source."""
+        return list(self._data)
+
     async def device_exists(self, device_name: str) -> bool:
         """Return true if the device is present in the data."""
         return device_name in self._data
@@ -137,7 +182,9 @@ class DataSource:
             self._data[device_name][UNSUPPORTED_ERDS][erd] = self._data[device_name][
                 SUPPORTED_ERDS
             ].pop(erd)
-            await self._data[device_name][UNSUPPORTED_ERDS][erd][EVENT].publish(None)
+            await self._publish(
+                device_name, self._data[device_name][UNSUPPORTED_ERDS][erd][EVENT], None
+            )
 
     async def move_all_erds_to_unsupported_for_api_erd(
         self, device_name: str, feature_type: str | None, version: str
@@ -179,21 +226,240 @@ class DataSource:
         """Return the value of the specified ERD. Raises if the ERD is not present on the given device."""
         return (await self._get_erd_from_either_list(device_name, erd))[VALUE]
 
+    async def get_codec(self, erd: Erd) -> ErdCodec | None:
+        """Return the codec compiled for the ERD's definition, or None if the ERD has no definition."""
+        if erd not in self._codecs:
+            erd_def = await self.get_erd_def(erd)
+            self._codecs[erd] = (
+                ErdCodec.from_erd_def(erd_def) if erd_def is not None else None
+            )
+
+        return self._codecs[erd]
+
+    async def is_periodic_erd(self, erd: Erd) -> bool:
+        """Return true if the device publishes the ERD on a fixed period rather than when it changes."""
+        if (periodic := self._periodic_erds.get(erd)) is None:
+            erd_def = await self.get_erd_def(erd)
+            periodic = self._periodic_erds[erd] = (
+                erd_def is not None
+                and erd_def.get("updateClass", {}).get("type") == "periodic"
+            )
+
+        return periodic
+
+    async def locate_field(
+        self, erd: Erd, offset: int, size: int, bit_offset: int = 0, bit_size: int = 0
+    ) -> tuple[FieldLayout, int | None]:
+        """Return the layout of the ERD field at the given position and its index in the decoded ERD value.
+
+        The layout defaults to an unsigned integer and the index to None if the ERD has no such field.
+        """
+        layout = FieldLayout(offset, size, bit_offset=bit_offset, bit_size=bit_size)
+        codec = await self.get_codec(erd)
+        if codec is not None and (index := codec.index(layout)) is not None:
+            return (codec.layouts[index], index)
+
+        return (layout, None)
+
+    async def erd_decode(
+        self, device_name: str, erd: Erd, value: bytes
+    ) -> tuple[Any, ...] | None:
+        """Return every field of the ERD value decoded, or None if the ERD has no definition.
+
+        The decoded value is kept with the ERD so it is only decoded once per value, no matter how many entities read it.
+        """
+        codec = await self.get_codec(erd)
+        if codec is None:
+            return None
+
+        erd_val = await self._get_erd_or_none_from_either_list(device_name, erd)
+        if erd_val is None:
+            return codec.decode(value)
+
+        decoded = erd_val.get(DECODED)
+        if decoded is None or decoded[0] is not value:
+            decoded = (value, codec.decode(value))
+            erd_val[DECODED] = decoded
+
+        return decoded[1]
+
+    async def get_device_snapshot(self, device_name: str) -> dict[str, Any]:
+        """Return every supported ERD of the device with its fields decoded using the ERD definitions.
+
+        Enum fields are given by name, strings as text and raw fields as hex. ERDs without a value have no fields.
+        """
+        snapshot: dict[str, Any] = {}
+        for erd, erd_val in self._data[device_name][SUPPORTED_ERDS].items():
+            value: bytes | None = erd_val[VALUE]
+            erd_def = await self.get_erd_def(erd)
+            entry: dict[str, Any] = {
+                "name": erd_def["name"] if erd_def is not None else None,
+                "value": value.hex() if value is not None else None,
+                "fields": {},
+            }
+            if erd_def is not None and value is not None:
+                decoded = await self.erd_decode(device_name, erd, value)
+                assert decoded is not None
+                entry["fields"] = {
+                    field["name"]: _describe_field(field, field_value)
+                    for field, field_value in zip(erd_def["data"], decoded, strict=True)
+                }
+
+            snapshot[f"{erd:#06x}"] = entry
+
+        return snapshot
+
+    async def get_device_diagnostics(self, device_name: str) -> dict[str, Any]:
+        """Return the device's supported and unsupported ERDs with their latest values and subscriber counts, and the counts of its messages and writes.
+
+        Values are given as hex and are not redacted.
+        """
+        device = self._data[device_name]
+        pipeline = self._write_pipelines.get(device_name)
+        return {
+            "available": self._availability.is_available(device_name),
+            SUPPORTED_ERDS: _describe_erds(device[SUPPORTED_ERDS]),
+            UNSUPPORTED_ERDS: _describe_erds(device[UNSUPPORTED_ERDS]),
+            "counters": asdict(self._counters.device(device_name)),
+            "writes": asdict(pipeline.metrics) if pipeline is not None else None,
+        }
+
     async def erd_write(self, device_name: str, erd: Erd, value: bytes) -> None:
         """Write a value to a given ERD on a device."""
         if erd in self._data[device_name][SUPPORTED_ERDS]:
             self._data[device_name][SUPPORTED_ERDS][erd][VALUE] = value
-            await self._data[device_name][SUPPORTED_ERDS][erd][EVENT].publish(value)
+            await self._publish(
+                device_name, self._data[device_name][SUPPORTED_ERDS][erd][EVENT], value
+            )
         else:
             self._data[device_name][UNSUPPORTED_ERDS][erd][VALUE] = value
 
-    async def erd_publish(self, device_name: str, erd: Erd, value: bytes) -> None:
-        """Write a value to a given ERD on a device and publish to MQTT."""
+    async def _publish(
+        self, device_name: str, event: Event, value: bytes | None
+    ) -> None:
+        """Pass the ERD's new value to its entities, counting the state write each of them makes."""
+        self._counters.record_state_writes(device_name, event.subscriber_count)
+        await event.publish(value)
+
+    async def erd_publish(self, device_name: str, erd: Erd, value: bytes) -> bool:
+        """Write a value to a given ERD on a device and publish to MQTT.
+
+        Publishes go through the device's write pipeline, so they are sent in order and tracked until the device confirms them.
+        Return false if the pipeline gave up publishing the value.
+        """
         if erd in self._data[device_name][SUPPORTED_ERDS]:
-            if await self._mqtt_client.publish_erd(device_name, erd, value):
+            if not await (await self._get_write_pipeline(device_name)).publish(
+                erd, value, await self._get_confirm_erd(erd)
+            ):
+                return False
+
+        await self.erd_write(device_name, erd, value)
+        return True
+
+    async def erd_encode(
+        self, device_name: str, erd: Erd, values: dict[int, int | bytes]
+    ) -> bytes:
+        """Return the ERD's latest value with the fields at the given indexes set to the values.
+
+        Raises ValueError if the ERD has no definition or a value does not fit its field.
+        """
+        codec = await self.get_codec(erd)
+        if codec is None:
+            raise ValueError(f"ERD {erd:#06x} has no definition")
+
+        return codec.encode(await self.erd_read(device_name, erd) or b"", values)
+
+    async def erd_publish_batch(
+        self, device_name: str, values: dict[Erd, bytes]
+    ) -> None:
+        """Publish values to several supported ERDs of a device back to back, as a single write to the device's pipeline."""
+        writes = [
+            (erd, value, await self._get_confirm_erd(erd))
+            for erd, value in values.items()
+        ]
+        published = await (await self._get_write_pipeline(device_name)).publish_batch(
+            writes
+        )
+        for (erd, value, _), success in zip(writes, published, strict=True):
+            if success:
                 await self.erd_write(device_name, erd, value)
-        else:
-            await self.erd_write(device_name, erd, value)
+
+    async def confirm_write(self, device_name: str, erd: Erd, value: bytes) -> None:
+        """Confirm any pending write the device has applied, given a value it reported for the ERD."""
+        if (pipeline := self._write_pipelines.get(device_name)) is not None:
+            await pipeline.confirm(erd, value)
+
+    async def get_write_confirmation(
+        self, device_name: str, erd: Erd
+    ) -> asyncio.Future[bool] | None:
+        """Return a future of whether the device confirms the pending write to the ERD, or None if no write is pending."""
+        pipeline = self._write_pipelines.get(device_name)
+        confirm_erd = await self._get_confirm_erd(erd)
+        if pipeline is None or confirm_erd is None:
+            return None
+
+        return await pipeline.get_confirmation(confirm_erd)
+
+    async def is_optimistic(self) -> bool:
+        """Return true if entities should show written values before the device confirms them."""
+        return self._write_options.optimistic
+
+    async def _get_confirm_erd(self, erd: Erd) -> Erd | None:
+        """Return the status ERD that reports whether a write to the given ERD was applied, or None if it has none.
+
+        An ERD without a status pair is not confirmed. The integration stores the written value as soon as it is published,
+        and its own publish comes back on the MQTT subscription, so the ERD would confirm itself right away.
+        """
+        status_pair = await self.get_erd_status_pair(erd)
+        return status_pair["status"] if status_pair else None
+
+    async def _get_write_pipeline(self, device_name: str) -> WritePipeline:
+        """Return the write pipeline for the device, creating it on first use."""
+        if (pipeline := self._write_pipelines.get(device_name)) is None:
+            pipeline = self._write_pipelines[device_name] = WritePipeline(
+                device_name, self._mqtt_client, self._write_options
+            )
+
+        return pipeline
+
+    async def set_write_options(self, write_options: WriteOptions) -> None:
+        """Apply new write options to the write buffer and every device's write pipeline."""
+        self._write_options = write_options
+        self._write_buffer.window = write_options.window
+        for pipeline in self._write_pipelines.values():
+            pipeline.options = write_options
+
+    async def get_write_pipeline_metrics(
+        self, device_name: str
+    ) -> WritePipelineMetrics | None:
+        """Return the counts and latency of the writes published to the device, or None if nothing has been written."""
+        if (pipeline := self._write_pipelines.get(device_name)) is None:
+            return None
+
+        return pipeline.metrics
+
+    async def shutdown(self) -> None:
+        """Stop tracking the availability and pending writes of every device."""
+        self._availability.shutdown()
+        for pipeline in self._write_pipelines.values():
+            await pipeline.shutdown()
+
+    @property
+    def counters(self) -> PerformanceCounters:
+        """Return the counts of the messages received from each device and the work they caused."""
+        return self._counters
+
+    async def erd_patch(self, device_name: str, erd: Erd, patch: ErdPatch) -> bool:
+        """Apply the patch to the latest value of the ERD and publish it.
+
+        Patches to the same ERD made in the same write window are merged into a single publish. Return true if the patched
+        value was published.
+        """
+        return await self._write_buffer.patch(device_name, erd, patch)
+
+    async def get_write_metrics(self) -> WriteBufferMetrics:
+        """Return the counts of ERD patches and how many were merged into another publish."""
+        return self._write_buffer.metrics
 
     async def erd_subscribe(
         self, device_name: str, erd: Erd, callback: Callable[[bytes], Awaitable[None]]
@@ -252,18 +518,45 @@ class DataSource:
 
         return None
 
-    async def get_entity_id_for_unique_id(
-        self, device_name: str, erd: Erd, unique_id: str, unique_id_with_option: str
-    ) -> str | None:
-        """Return the entity ID of the entity associated with the given unique ID."""
-        erd_val = await self._get_erd_or_none_from_either_list(device_name, erd)
-        if erd_val is not None:
-            return await erd_val[EVENT].get_subscriber_with_unique_id(
-                unique_id, unique_id_with_option
-            )
+    async def add_entity(self, unique_id: str, entity: "GeaEntity") -> None:
+        """Add the entity to the unique ID index so it can be looked up directly, and to the entities of its device."""
+        self._entities[unique_id] = entity
+        self._device_entities.setdefault(entity.device_name, {})[unique_id] = entity
 
-        return None
+    async def remove_entity(self, unique_id: str) -> None:
+        """Remove the entity from the unique ID index and from the entities of its device."""
+        if (entity := self._entities.pop(unique_id, None)) is not None:
+            self._device_entities.get(entity.device_name, {}).pop(unique_id, None)
+
+    async def get_entity(self, unique_id: str) -> "GeaEntity | None":
+        """Return the entity with the given unique ID, or None if it has not been added."""
+        return self._entities.get(unique_id)
 
     async def get_erd_status_pair(self, erd: Erd) -> dict[str, Any] | None:
         """Return the status/request pair dict if the given ERD is part of a status/request pair, otherwise None."""
         return self._status_pair_dict.get(f"{erd:#06x}", None)
+
+
+def _describe_erds(erds: dict[Erd, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Return the latest value and subscriber count of each ERD, keyed by ERD ID."""
+    return {
+        f"{erd:#06x}": {
+            "value": erd_val[VALUE].hex() if erd_val[VALUE] is not None else None,
+            "subscribers": erd_val[EVENT].subscriber_count,
+        }
+        for erd, erd_val in erds.items()
+    }
+
+
+def _describe_field(field: dict[str, Any], value: int | bytes) -> int | str:
+    """Return the decoded field value in the form the ERD definition describes it."""
+    if field["type"] == "enum":
+        return field["values"].get(str(value), value)
+
+    if field["type"] == "string":
+        return cast(bytes, value).rstrip(b"\0").decode(errors="replace")
+
+    if isinstance(value, bytes):
+        return value.hex()
+
+    return value
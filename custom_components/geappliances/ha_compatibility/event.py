@@ -24,17 +24,11 @@ class Event:
         for callback in self._callbacks:
             await callback(value)
 
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of callbacks called on each publish."""
+        return len(self._callbacks)
+
     async def has_subscribers(self) -> bool:
         """Return true if the callback set is not empty."""
         return len(self._callbacks) != 0
-
-    async def get_subscriber_with_unique_id(
-        self, unique_id: str, unique_id_with_option: str
-    ) -> str | None:
-        """Return the subscriber with the given unique ID, if it exists."""
-        for callback in self._callbacks:
-            entity = callback.__self__  # type:ignore [attr-defined]
-            if entity.unique_id in (unique_id, unique_id_with_option):
-                return entity.entity_id
-
-        return None
@@ -0,0 +1,159 @@
+"""Home Assistant compatibility class for handling inbound telemetry behind user-initiated work."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from ..const import DEFAULT_INGEST_BATCH_SIZE
+from .counters import LatencyHistogram, SlowestOperations
+from .overload import OverloadController, OverloadLevel
+from .stall_detector import StallDetector
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestQueueMetrics:
+    """Counts of the telemetry handled by an ingest queue."""
+
+    queued: int = 0
+    handled: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    deferred: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    slowest: SlowestOperations = field(default_factory=SlowestOperations)
+
+
+@dataclass(slots=True)
+class _QueuedValue:
+    """A value waiting to be passed to its handler."""
+
+    handler: Callable[[Any], Awaitable[None]]
+    value: Any
+    queued_at: float
+    key: Any
+    label: Any
+
+
+class IngestQueue:
+    """Class to handle inbound telemetry in arrival order on a single worker.
+
+    The worker yields to the event loop after every batch and waits while any prioritized work, such as a user's write, is running.
+    The lag of every batch is reported to the overload controller, and while it is overloaded a queued value is replaced by a newer value with the same key.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        overload: OverloadController | None = None,
+        batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+        stall_detector: StallDetector | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._overload = overload or OverloadController(hass)
+        self._stall_detector = stall_detector or StallDetector()
+        self._batch_size = batch_size
+        self._queue: deque[_QueuedValue] = deque()
+        self._latest: dict[Any, _QueuedValue] = {}
+        self._worker: asyncio.Task[None] | None = None
+        self._prioritized = 0
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._metrics = IngestQueueMetrics()
+
+    def put(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        value: Any,
+        key: Any = None,
+        label: Any = None,
+    ) -> bool:
+        """Queue the value to be passed to the handler once everything queued before it is handled.
+
+        Values with a key replace a queued value with the same key while overloaded. Return false if the value replaced a queued value.
+        The key, or the label of values without one, names the value among the slowest operations.
+        """
+        self._metrics.queued += 1
+        if key is not None and self._overload.level >= OverloadLevel.LATEST_ONLY:
+            if (queued := self._latest.get(key)) is not None:
+                queued.value = value
+                self._overload.record_coalesced()
+                return False
+
+        queued = _QueuedValue(handler, value, self._hass.loop.time(), key, label)
+        self._queue.append(queued)
+        if key is not None:
+            self._latest[key] = queued
+        self._metrics.depth = len(self._queue)
+        self._metrics.max_depth = max(self._metrics.max_depth, self._metrics.depth)
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_task(
+                self._drain(), "geappliances ingest", eager_start=False
+            )
+
+        return True
+
+    @asynccontextmanager
+    async def prioritized(self) -> AsyncIterator[None]:
+        """Hold back telemetry until the work inside the context is done."""
+        self._prioritized += 1
+        self._resume.clear()
+        try:
+            yield
+        finally:
+            self._prioritized -= 1
+            if self._prioritized == 0:
+                self._resume.set()
+
+    async def _drain(self) -> None:
+        """Handle queued telemetry in batches until the queue is empty."""
+        try:
+            while self._queue:
+                if self._prioritized:
+                    self._metrics.deferred += 1
+                    await self._resume.wait()
+
+                now = self._hass.loop.time()
+                self._overload.observe(now - self._queue[0].queued_at, now)
+
+                for _ in range(min(self._batch_size, len(self._queue))):
+                    queued = self._queue.popleft()
+                    if (
+                        queued.key is not None
+                        and self._latest.get(queued.key) is queued
+                    ):
+                        del self._latest[queued.key]
+                    subject = queued.key if queued.key is not None else queued.label
+                    device_name, erd = (
+                        subject if isinstance(subject, tuple) else (None, None)
+                    )
+                    started = self._hass.loop.time()
+                    with self._stall_detector.measure("MQTT handler", device_name, erd):
+                        try:
+                            await queued.handler(queued.value)
+                        except Exception:
+                            _LOGGER.exception("Error handling GE Appliances telemetry")
+                    finished = self._hass.loop.time()
+                    self._metrics.handled += 1
+                    self._metrics.latency.record(finished - queued.queued_at)
+                    self._metrics.slowest.record(finished - started, subject)
+
+                self._metrics.depth = len(self._queue)
+                # Let writes and service calls waiting on the event loop run before the next batch
+                await asyncio.sleep(0)
+        finally:
+            self._worker = None
+
+    @property
+    def metrics(self) -> IngestQueueMetrics:
+        """Return the counts of the telemetry handled by the queue."""
+        return self._metrics
@@ -1,133 +1,95 @@
 """Module to manage meta ERDs."""
 
 import logging
-from typing import TYPE_CHECKING, Any
-
-from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
+from typing import TYPE_CHECKING, Any, cast
 
 from ..const import (
-    ATTR_ALLOWABLE,
-    ATTR_ENABLED,
-    ATTR_MAX_VAL,
-    ATTR_MIN_VAL,
-    ATTR_UNIQUE_ID,
-    ATTR_UNIT,
     COMMON_APPLIANCE_API_ERD,
-    DOMAIN,
     FEATURE_API_ERD_HIGH_END,
     FEATURE_API_ERD_HIGH_START,
     FEATURE_API_ERD_LOW_END,
     FEATURE_API_ERD_LOW_START,
-    SERVICE_ENABLE_OR_DISABLE_BASE,
-    SERVICE_SET_ALLOWABLES,
-    SERVICE_SET_MAX,
-    SERVICE_SET_MIN,
-    SERVICE_SET_UNIT,
     Erd,
 )
 from .data_source import DataSource
+from .stall_detector import StallDetector
+
+if TYPE_CHECKING:
+    from ..entity import GeaEntity
+    from ..number import GeaNumber
+    from ..select import GeaSelect
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def set_min(
-    hass: HomeAssistant,
     _data_source: DataSource,
     _meta_erd: Erd,
     min_val_bytes: bytes,
-    entity_id: str,
-    unique_id: str,
-) -> None:
+    entity: "GeaEntity",
+    _unique_id: str,
+) -> bool:
     """Set the min value for the number entity."""
-    min_val = int.from_bytes(min_val_bytes)
-    await hass.services.async_call(
-        DOMAIN,
-        SERVICE_SET_MIN,
-        {ATTR_ENTITY_ID: entity_id, ATTR_UNIQUE_ID: unique_id, ATTR_MIN_VAL: min_val},
-    )
+    await cast("GeaNumber", entity).apply_min(int.from_bytes(min_val_bytes))
+    return True
 
 
 async def set_max(
-    hass: HomeAssistant,
     _data_source: DataSource,
     _meta_erd: Erd,
     max_val_bytes: bytes,
-    entity_id: str,
-    unique_id: str,
-) -> None:
+    entity: "GeaEntity",
+    _unique_id: str,
+) -> bool:
     """Set the max value for the number entity."""
-    max_val = int.from_bytes(max_val_bytes)
-    await hass.services.async_call(
-        DOMAIN,
-        SERVICE_SET_MAX,
-        {ATTR_ENTITY_ID: entity_id, ATTR_UNIQUE_ID: unique_id, ATTR_MAX_VAL: max_val},
-    )
+    await cast("GeaNumber", entity).apply_max(int.from_bytes(max_val_bytes))
+    return True
 
 
 async def set_unit(
-    hass: HomeAssistant,
     data_source: DataSource,
     meta_erd: Erd,
     unit_selection_bytes: bytes,
-    entity_id: str,
-    unique_id: str,
-) -> None:
+    entity: "GeaEntity",
+    _unique_id: str,
+) -> bool:
     """Set the unit for the number entity."""
     unit_selection = int.from_bytes(unit_selection_bytes)
     unit = await data_source.get_erd_def(meta_erd)
-    if unit is not None:
-        unit = unit["data"][0]["values"][f"{unit_selection}"]
-        await hass.services.async_call(
-            DOMAIN,
-            SERVICE_SET_UNIT,
-            {ATTR_ENTITY_ID: entity_id, ATTR_UNIQUE_ID: unique_id, ATTR_UNIT: unit},
-        )
+    if unit is None:
+        return False
+
+    await cast("GeaNumber", entity).apply_unit(
+        unit["data"][0]["values"][f"{unit_selection}"]
+    )
+    return True
 
 
 async def enable_or_disable(
-    hass: HomeAssistant,
     _data_source: DataSource,
     _meta_erd: Erd,
     enabled_bytes: bytes,
-    entity_id: str,
-    unique_id: str,
-) -> None:
+    entity: "GeaEntity",
+    _unique_id: str,
+) -> bool:
     """Enable or disable the entity."""
-    if entity_id:
-        await hass.services.async_call(
-            DOMAIN,
-            f"{SERVICE_ENABLE_OR_DISABLE_BASE}_{entity_id.split(".")[0]}",
-            {
-                ATTR_ENTITY_ID: entity_id,
-                ATTR_UNIQUE_ID: unique_id,
-                ATTR_ENABLED: enabled_bytes != b"\x00",
-            },
-        )
+    # Moving the ERD between lists notifies the entity through its subscription
+    await entity.enable_or_disable(enabled_bytes != b"\x00")
+    return False
 
 
 async def set_allowables(
-    hass: HomeAssistant,
     _data_source: DataSource,
     _meta_erd: Erd,
     allowables_bytes: bytes,
-    entity_id: str,
+    entity: "GeaEntity",
     unique_id: str,
-) -> None:
+) -> bool:
     """Set the allowable options for the select entity."""
-    split = unique_id.split(".")
-    option = split[1]
-    await hass.services.async_call(
-        DOMAIN,
-        SERVICE_SET_ALLOWABLES,
-        {
-            ATTR_ENTITY_ID: entity_id,
-            ATTR_UNIQUE_ID: split[0],
-            ATTR_ALLOWABLE: option,
-            ATTR_ENABLED: (int.from_bytes(allowables_bytes) & 0xFF) != 0,
-        },
+    await cast("GeaSelect", entity).apply_allowable(
+        unique_id.split(".")[1], (int.from_bytes(allowables_bytes) & 0xFF) != 0
     )
+    return True
 
 
 class MetaErdCoordinator:
@@ -137,12 +99,11 @@ class MetaErdCoordinator:
         self,
         data_source: DataSource,
         meta_erd_json: dict[Any, Any],
-        hass: HomeAssistant,
+        stall_detector: StallDetector | None = None,
     ) -> None:
         """Create the meta ERD coordinator."""
-        self._entity_registry = er.async_get(hass)
-        self._hass = hass
         self._data_source = data_source
+        self._stall_detector = stall_detector or StallDetector()
         self._create_transform_table(meta_erd_json)
         self._create_entities_to_meta_erds_dict()
 
@@ -158,7 +119,7 @@ class MetaErdCoordinator:
                 self._transform_table[ft].setdefault(v, {})
                 for meta_erd, fields in erds.items():
                     meta_erd_int = int(meta_erd, 16)
-                    meta_erd_entry = {}
+                    meta_erd_entry: dict[str, dict[str, Any]] = {}
                     for meta_field, transform in fields.items():
                         meta_erd_entry[meta_field] = {
                             "fields": transform["fields"],
@@ -189,6 +150,40 @@ class MetaErdCoordinator:
 
         return False
 
+    async def get_meta_erd_mappings(
+        self, device_name: str, erds: list[Erd]
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the transforms each of the ERDs applies on the device, by meta ERD ID and meta field, with the unique IDs they target."""
+        mappings: dict[str, dict[str, dict[str, Any]]] = {}
+        for erd in erds:
+            if not await self.is_meta_erd(erd):
+                continue
+
+            feature_type_and_version = (
+                await self._get_meta_erd_feature_type_and_version(device_name, erd)
+            )
+            if feature_type_and_version is None:
+                continue
+
+            transform_rows = (
+                self._transform_table.get(feature_type_and_version[0], {})
+                .get(feature_type_and_version[1], {})
+                .get(erd, {})
+            )
+            if transform_rows:
+                mappings[f"{erd:#06x}"] = {
+                    meta_field: {
+                        "func": transform_row["func"].__name__,
+                        "targets": [
+                            target.format(device_name)
+                            for target in transform_row["fields"]
+                        ],
+                    }
+                    for meta_field, transform_row in transform_rows.items()
+                }
+
+        return mappings
+
     async def _look_for_erd_def_in_appliance_api(
         self, device_name: str, api_erd: Erd, meta_erd: Erd
     ) -> tuple[str, str] | None:
@@ -257,47 +252,67 @@ class MetaErdCoordinator:
     async def apply_transforms_for_meta_erd(
         self, device_name: str, meta_erd: Erd
     ) -> None:
-        """Apply transforms for the given meta ERD. Will raise KeyError if meta_erd is not a meta ERD."""
+        """Apply transforms for the given meta ERD, doing nothing if it is not a meta ERD of the appliance API the device has it in."""
+        updated: set[GeaEntity] = set()
+        await self._apply_transforms_for_meta_erd(device_name, meta_erd, updated)
+        await self._write_states(device_name, updated)
+
+    async def apply_transforms_to_entity(
+        self, device_name: str, entity_id: str
+    ) -> None:
+        """Check if any meta ERDs have transforms for the given entity and apply them."""
+        meta_erds = self._entities_to_meta_erds.get(entity_id)
+
+        if meta_erds is not None:
+            updated: set[GeaEntity] = set()
+            for meta_erd in meta_erds:
+                await self._apply_transforms_for_meta_erd(
+                    device_name, meta_erd, updated
+                )
+            await self._write_states(device_name, updated)
+
+    async def _apply_transforms_for_meta_erd(
+        self, device_name: str, meta_erd: Erd, updated: set["GeaEntity"]
+    ) -> None:
+        """Apply transforms for the meta ERD directly to the target entities and collect the ones that need a state write."""
         feature_type_and_version = await self._get_meta_erd_feature_type_and_version(
             device_name, meta_erd
         )
         if feature_type_and_version is None:
             return
 
-        for meta_field, transform_row in self._transform_table[
-            feature_type_and_version[0]
-        ][feature_type_and_version[1]][meta_erd].items():
+        # The ERD may only be a meta ERD in other appliance APIs than the one this device has it in
+        transform_rows = (
+            self._transform_table.get(feature_type_and_version[0], {})
+            .get(feature_type_and_version[1], {})
+            .get(meta_erd, {})
+        )
+        for meta_field, transform_row in transform_rows.items():
             field_bytes = await self.get_bytes_for_field(
                 device_name, meta_erd, meta_field
             )
             if field_bytes is not None:
                 for target_entity in transform_row["fields"]:
-                    erd_str = target_entity.split("_", 2)[1]
-                    select_option_removed = target_entity.split(".")[0]
-
-                    await transform_row["func"](
-                        self._hass,
-                        self._data_source,
-                        meta_erd,
-                        field_bytes,
-                        await self._data_source.get_entity_id_for_unique_id(
-                            device_name,
-                            int(erd_str, base=16),
-                            select_option_removed.format(device_name),
-                            target_entity.format(device_name),
-                        ),
-                        target_entity.format(device_name),
-                    )
-
-    async def apply_transforms_to_entity(
-        self, device_name: str, entity_id: str
-    ) -> None:
-        """Check if any meta ERDs have transforms for the given entity and apply them."""
-        meta_erds = self._entities_to_meta_erds.get(entity_id)
-
-        if meta_erds is not None:
-            for meta_erd in meta_erds:
-                await self.apply_transforms_for_meta_erd(device_name, meta_erd)
+                    unique_id = target_entity.format(device_name)
+                    entity = await self._data_source.get_entity(unique_id.split(".")[0])
+                    if entity is None:
+                        continue
+
+                    self._data_source.counters.record_meta_transform(device_name)
+                    with self._stall_detector.measure(
+                        "meta ERD transform", device_name, meta_erd
+                    ):
+                        transformed = await transform_row["func"](
+                            self._data_source, meta_erd, field_bytes, entity, unique_id
+                        )
+                    if transformed:
+                        updated.add(entity)
+
+    async def _write_states(self, device_name: str, updated: set["GeaEntity"]) -> None:
+        """Write the state of each updated entity once."""
+        self._data_source.counters.record_state_writes(device_name, len(updated))
+        for entity in updated:
+            entity.async_write_ha_state()
 
     async def get_bytes_for_field(
         self, device_name: str, erd: Erd, field: str
@@ -337,8 +352,8 @@ class MetaErdCoordinator:
         offset = field_def["bits"]["offset"]
         size = field_def["bits"]["size"]
 
-        mask = (1 << size) - 1 # Mask for the lowest `size` bytes
-        mask = mask << offset # Move mask to match offset
+        mask = (1 << size) - 1  # Mask for the lowest `size` bytes
+        mask = mask << offset  # Move mask to match offset
         masked = (int.from_bytes(field_bytes) & mask) >> offset
 
         return masked.to_bytes()
@@ -1,16 +1,28 @@
 """GE Appliances MQTT client."""
 
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 import logging
-from typing import Any, cast
+from typing import Any
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt.models import ReceiveMessage
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
+from ..const import (
+    DEFAULT_PAYLOAD_ENCODING,
+    DEFAULT_WRITE_QOS,
+    PAYLOAD_ENCODING_BINARY,
+    Erd,
+)
+from .counters import PerformanceCounters
 from .event import Event
+from .ingest_queue import IngestQueue, IngestQueueMetrics
+from .overload import OverloadController
+from .recorder import MqttRecorder
+from .stall_detector import StallDetector
 
 _LOGGER = logging.getLogger()
 
@@ -26,13 +38,89 @@ class GeaMQTTMessage:
     payload: bytes
 
 
+@dataclass
+class GeaMQTTBatch:
+    """Batch of ERD values received from MQTT integration in a single message."""
+
+    device: str
+    erds: list[tuple[Erd, bytes]]
+
+
+def encode_erd_batch(erds: Iterable[tuple[Erd, bytes]]) -> bytes:
+    """Pack ERD values into a batch frame of (ERD, length, value) records.
+
+    Each record is a big-endian u16 ERD, a u8 value length and the value.
+    """
+    frame = bytearray()
+    for erd, value in erds:
+        if not 0 <= erd <= 0xFFFF or len(value) > 0xFF:
+            raise ValueError(f"ERD {erd:#06x} does not fit in a batch record")
+        frame += erd.to_bytes(2)
+        frame.append(len(value))
+        frame += value
+
+    return bytes(frame)
+
+
+def decode_erd_batch(frame: bytes) -> list[tuple[Erd, bytes]]:
+    """Unpack the ERD values from a batch frame."""
+    erds = []
+    offset = 0
+    while offset < len(frame):
+        if offset + 3 > len(frame):
+            raise ValueError("Truncated ERD batch record header")
+        erd = int.from_bytes(frame[offset : offset + 2])
+        end = offset + 3 + frame[offset + 2]
+        if end > len(frame):
+            raise ValueError(f"Truncated ERD batch record for ERD {erd:#06x}")
+        erds.append((erd, frame[offset + 3 : end]))
+        offset = end
+
+    return erds
+
+
 class GeaMQTTClient:
     """Class to publish ERDs."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        qos: int = DEFAULT_WRITE_QOS,
+        payload_encoding: str = DEFAULT_PAYLOAD_ENCODING,
+        counters: PerformanceCounters | None = None,
+        stall_detector: StallDetector | None = None,
+    ) -> None:
         """Initialize client."""
         self._hass = hass
+        self._counters = counters or PerformanceCounters()
+        self._stall_detector = stall_detector or StallDetector()
         self._event = Event()
+        self._batch_event = Event()
+        self._heartbeat_event = Event()
+        self._overload = OverloadController(hass)
+        self._ingest = IngestQueue(
+            hass, self._overload, stall_detector=self._stall_detector
+        )
+        self.qos = qos
+        self.payload_encoding = payload_encoding
+        self.recorder: MqttRecorder | None = None
+
+    def encode_payload(self, value: bytes) -> str | bytes:
+        """Return the MQTT payload for an ERD value in the configured encoding."""
+        if self.payload_encoding == PAYLOAD_ENCODING_BINARY:
+            return value
+
+        return value.hex()
+
+    def decode_payload(self, payload: str | bytes) -> bytes:
+        """Return the ERD value carried by an MQTT payload in the configured encoding."""
+        if isinstance(payload, str):
+            return bytes.fromhex(payload)
+
+        if self.payload_encoding == PAYLOAD_ENCODING_BINARY:
+            return payload
+
+        return bytes.fromhex(payload.decode("ascii"))
 
     async def publish_erd(self, device_name: str, erd: int, value: bytes) -> bool:
         """Publish an ERD and return true if successful."""
@@ -40,36 +128,74 @@ class GeaMQTTClient:
             await mqtt.client.async_publish(
                 self._hass,
                 ERD_WRITE_TOPIC.format(device_name, f"{erd:#06x}"),
-                value.hex(),
-                0,
+                self.encode_payload(value),
+                self.qos,
                 False,
             )
         except HomeAssistantError:
             _LOGGER.error("MQTT publish failed for ERD %s", f"{erd:#06x}")
+            self._counters.record_publish_failure(device_name)
             return False
         else:
             return True
 
-    async def handle_message(self, msg: ReceiveMessage):
-        """Convert MQTT message to our message type and pass it on to discovery."""
+    @callback
+    def handle_message(self, msg: ReceiveMessage) -> None:
+        """Convert MQTT message to our message type and queue it for discovery."""
+        if self.recorder is not None:
+            self.recorder.record(msg.topic, msg.payload)
+
         split_topic = msg.topic.split("/")
 
-        if await self._should_log_bad_topic(split_topic):
+        if self._should_log_bad_topic(split_topic):
             _LOGGER.info("Bad GE Appliances MQTT topic: %s", msg.topic)
+            self._counters.record_rejected(
+                split_topic[1] if len(split_topic) > 1 else None
+            )
         else:
             device_name = split_topic[1]
+            self._counters.record_received(device_name)
 
             if len(split_topic) == 5:
                 erd = split_topic[3]
-                await self._event.publish(
-                    GeaMQTTMessage(
-                        device_name, erd, bytes.fromhex(cast(str, msg.payload))
+                try:
+                    payload = self.decode_payload(msg.payload)
+                except ValueError:
+                    _LOGGER.info("Bad GE Appliances ERD value on topic: %s", msg.topic)
+                    self._counters.record_rejected(device_name)
+                    return
+
+                if not self._ingest.put(
+                    self._event.publish,
+                    GeaMQTTMessage(device_name, erd, payload),
+                    (device_name, erd),
+                ):
+                    self._counters.record_deduplicated(device_name)
+
+            elif len(split_topic) == 3 and split_topic[2] == "uptime":
+                if not self._ingest.put(
+                    self._heartbeat_event.publish, device_name, (device_name, "uptime")
+                ):
+                    self._counters.record_deduplicated(device_name)
+
+            elif len(split_topic) == 3 and split_topic[2] == "erds":
+                try:
+                    erds = decode_erd_batch(self.decode_payload(msg.payload))
+                except ValueError:
+                    _LOGGER.info("Bad GE Appliances ERD batch on topic: %s", msg.topic)
+                    self._counters.record_rejected(device_name)
+                else:
+                    self._ingest.put(
+                        self._batch_event.publish,
+                        GeaMQTTBatch(device_name, erds),
+                        label=(device_name, "erds"),
                     )
-                )
 
             else:
-                await self._event.publish(
-                    GeaMQTTMessage(device_name, "", bytes.fromhex(""))
+                self._ingest.put(
+                    self._event.publish,
+                    GeaMQTTMessage(device_name, "", bytes.fromhex("")),
+                    label=(device_name, ""),
                 )
 
     async def async_subscribe(
@@ -78,7 +204,43 @@ class GeaMQTTClient:
         """Add function to handler list."""
         await self._event.subscribe(handler)
 
-    async def _should_log_bad_topic(self, split_topic: list[str]) -> bool:
+    async def async_subscribe_batch(
+        self, handler: Callable[[GeaMQTTBatch], Coroutine[Any, Any, None]]
+    ) -> None:
+        """Add function to batch handler list."""
+        await self._batch_event.subscribe(handler)
+
+    async def async_subscribe_heartbeat(
+        self, handler: Callable[[str], Coroutine[Any, Any, None]]
+    ) -> None:
+        """Add function to heartbeat handler list, which is called with the device name."""
+        await self._heartbeat_event.subscribe(handler)
+
+    def prioritized(self) -> AbstractAsyncContextManager[None]:
+        """Return a context that holds back inbound telemetry until the work inside it is done."""
+        return self._ingest.prioritized()
+
+    @property
+    def overload(self) -> OverloadController:
+        """Return the controller that decides how much inbound telemetry to shed."""
+        return self._overload
+
+    @property
+    def counters(self) -> PerformanceCounters:
+        """Return the counts of the messages received from each device and the work they caused."""
+        return self._counters
+
+    @property
+    def stall_detector(self) -> StallDetector:
+        """Return the detector that logs handlers running longer than the configured threshold."""
+        return self._stall_detector
+
+    @property
+    def ingest_metrics(self) -> IngestQueueMetrics:
+        """Return the counts of the inbound telemetry queued and handled."""
+        return self._ingest.metrics
+
+    def _should_log_bad_topic(self, split_topic: list[str]) -> bool:
         """Return true if the MQTT topic is bad."""
         if len(split_topic) not in [2, 3, 5]:
             return True
@@ -86,7 +248,7 @@ class GeaMQTTClient:
         if len(split_topic) == 5 and split_topic[4] not in ["write", "value"]:
             return True
 
-        if len(split_topic) == 3 and split_topic[2] != "uptime":
+        if len(split_topic) == 3 and split_topic[2] not in ["uptime", "erds"]:
             return True
 
         return False
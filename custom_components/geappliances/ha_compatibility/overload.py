@@ -0,0 +1,182 @@
+"""Home Assistant compatibility class for shedding telemetry when the integration cannot keep up."""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
+
+from ..const import (
+    DEFAULT_OVERLOAD_HOLD,
+    DEFAULT_OVERLOAD_LAG,
+    DEFAULT_OVERLOAD_RECOVERY_LAG,
+    DOMAIN,
+    ISSUE_OVERLOADED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OverloadLevel(IntEnum):
+    """How much inbound telemetry is shed, each level also shedding everything the levels below it do."""
+
+    NORMAL = 0
+    LATEST_ONLY = 1
+    SKIP_PERIODIC = 2
+    PAUSE_META_TRANSFORMS = 3
+
+
+type OverloadListener = Callable[[OverloadLevel], Awaitable[None]]
+
+
+@dataclass
+class OverloadMetrics:
+    """Counts of the telemetry shed while overloaded."""
+
+    level: OverloadLevel = OverloadLevel.NORMAL
+    level_changes: int = 0
+    last_lag: float = 0
+    max_lag: float = 0
+    coalesced: int = 0
+    skipped_periodic: int = 0
+    paused_transforms: int = 0
+
+
+class OverloadController:
+    """Class to step through overload levels as the lag of the ingest path grows and shrinks.
+
+    The level goes up while the oldest queued message has waited longer than the lag limit and comes back down once the lag is below the recovery limit,
+    changing at most once per hold period. A repair issue is shown while the level is above normal.
+
+    The lag is only observed while telemetry is queued, so once a hold period passes without any observation the ingest path has
+    caught up and the level steps down on a timer.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        lag: float = DEFAULT_OVERLOAD_LAG,
+        recovery_lag: float = DEFAULT_OVERLOAD_RECOVERY_LAG,
+        hold: float = DEFAULT_OVERLOAD_HOLD,
+    ) -> None:
+        """Initialize the controller."""
+        self._hass = hass
+        self._lag = lag
+        self._recovery_lag = recovery_lag
+        self._hold = hold
+        self._last_change: float | None = None
+        self._observed_since_check = False
+        self._cancel_recovery_check: CALLBACK_TYPE | None = None
+        self._listeners: list[OverloadListener] = []
+        self._metrics = OverloadMetrics()
+
+    @property
+    def level(self) -> OverloadLevel:
+        """Return the current overload level."""
+        return self._metrics.level
+
+    def add_listener(self, listener: OverloadListener) -> CALLBACK_TYPE:
+        """Call the listener with the new level whenever the level changes, and return a function that removes it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def observe(self, lag: float, now: float) -> None:
+        """Record how long the oldest queued message has waited and change level if needed."""
+        self._metrics.last_lag = lag
+        self._metrics.max_lag = max(self._metrics.max_lag, lag)
+        self._observed_since_check = True
+
+        if self._last_change is not None and now - self._last_change < self._hold:
+            return
+
+        if lag > self._lag and self.level < OverloadLevel.PAUSE_META_TRANSFORMS:
+            self._set_level(OverloadLevel(self.level + 1), lag, now)
+        elif lag < self._recovery_lag and self.level > OverloadLevel.NORMAL:
+            self._set_level(OverloadLevel(self.level - 1), lag, now)
+
+    def _set_level(self, level: OverloadLevel, lag: float, now: float) -> None:
+        """Change level, logging the change and showing or clearing the repair issue."""
+        previous = self.level
+        self._metrics.level = level
+        self._metrics.level_changes += 1
+        self._last_change = now
+
+        log = _LOGGER.warning if level > previous else _LOGGER.info
+        log(
+            "GE Appliances overload level changed from %s to %s with %.2fs lag "
+            "(coalesced: %d, skipped periodic: %d, paused transforms: %d)",
+            previous.name,
+            level.name,
+            lag,
+            self._metrics.coalesced,
+            self._metrics.skipped_periodic,
+            self._metrics.paused_transforms,
+        )
+
+        self._schedule_recovery_check()
+        if level == OverloadLevel.NORMAL:
+            ir.async_delete_issue(self._hass, DOMAIN, ISSUE_OVERLOADED)
+        else:
+            ir.async_create_issue(
+                self._hass,
+                DOMAIN,
+                ISSUE_OVERLOADED,
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=ISSUE_OVERLOADED,
+                translation_placeholders={
+                    "level": level.name.lower(),
+                    "lag": f"{lag:.1f}",
+                },
+            )
+
+        for listener in self._listeners:
+            self._hass.async_create_task(
+                listener(level), "geappliances overload level change"
+            )
+
+    def _schedule_recovery_check(self) -> None:
+        """Check for recovery one hold period from now while the level is above normal."""
+        self.shutdown()
+        self._observed_since_check = False
+        if self.level > OverloadLevel.NORMAL:
+            self._cancel_recovery_check = async_call_later(
+                self._hass, self._hold, self._check_recovery
+            )
+
+    @callback
+    def _check_recovery(self, _now: datetime) -> None:
+        """Step down a level if no lag was observed for a hold period, otherwise check again after another one."""
+        self._cancel_recovery_check = None
+        if self._observed_since_check:
+            self._schedule_recovery_check()
+        else:
+            self._set_level(OverloadLevel(self.level - 1), 0, self._hass.loop.time())
+
+    @callback
+    def shutdown(self) -> None:
+        """Stop checking for recovery."""
+        if self._cancel_recovery_check is not None:
+            self._cancel_recovery_check()
+            self._cancel_recovery_check = None
+
+    def record_coalesced(self) -> None:
+        """Count a queued value replaced by a newer value of the same ERD."""
+        self._metrics.coalesced += 1
+
+    def record_skipped_periodic(self) -> None:
+        """Count a periodic ERD update that was skipped."""
+        self._metrics.skipped_periodic += 1
+
+    def record_paused_transform(self) -> None:
+        """Count meta ERD transforms that were put off until the overload clears."""
+        self._metrics.paused_transforms += 1
+
+    @property
+    def metrics(self) -> OverloadMetrics:
+        """Return the counts of the telemetry shed while overloaded."""
+        return self._metrics
@@ -0,0 +1,91 @@
+"""Home Assistant compatibility classes for profiling the integration's hot paths."""
+
+from collections import Counter
+from pathlib import Path
+import sys
+import threading
+from types import FrameType
+
+# Frames from files under this directory belong to the integration
+PACKAGE_DIR = str(Path(__file__).parent.parent)
+
+
+class SamplingProfiler:
+    """Class to sample the stack of the event loop thread from another thread and count the stacks that pass through the integration.
+
+    Sampling costs the event loop nothing between samples, so it can run in production.
+    Each stack is kept from the outermost integration frame down, which covers MQTT message handling, discovery, entity creation, meta ERD transforms and entity updates along with whatever they call.
+    Stacks are written in the collapsed format read by flame graph tools such as flamegraph.pl and speedscope.
+    """
+
+    def __init__(
+        self, thread_id: int, interval: float, package_dir: str = PACKAGE_DIR
+    ) -> None:
+        """Initialize the profiler to sample the thread every interval in seconds."""
+        self._thread_id = thread_id
+        self._interval = interval
+        self._package_dir = package_dir
+        self._stacks: Counter[str] = Counter()
+        self._labels: dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.samples = 0
+
+    @property
+    def running(self) -> bool:
+        """Return true if the profiler is sampling."""
+        return self._thread is not None
+
+    @property
+    def stacks(self) -> Counter[str]:
+        """Return how many times each collapsed stack was sampled."""
+        return self._stacks
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="geappliances profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread to finish."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def sample(self, frame: FrameType | None) -> None:
+        """Count the stack ending at the frame if it passes through the integration."""
+        self.samples += 1
+        labels: list[str] = []
+        outermost = 0
+        while frame is not None:
+            labels.append(self._label(frame))
+            if frame.f_code.co_filename.startswith(self._package_dir):
+                outermost = len(labels)
+            frame = frame.f_back
+
+        if outermost:
+            self._stacks[";".join(reversed(labels[:outermost]))] += 1
+
+    def collapsed(self) -> str:
+        """Return the sampled stacks in the collapsed format, one stack and its count per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.items())
+
+    def _label(self, frame: FrameType) -> str:
+        """Return the module and qualified name of the frame's function."""
+        code = frame.f_code
+        if (label := self._labels.get(code)) is None:
+            module = frame.f_globals.get("__name__", code.co_filename)
+            label = self._labels[code] = f"{module}:{code.co_qualname}"
+
+        return label
+
+    def _run(self) -> None:
+        """Sample the thread every interval until stopped."""
+        while not self._stop.wait(self._interval):
+            self.sample(sys._current_frames().get(self._thread_id))  # noqa: SLF001
@@ -0,0 +1,98 @@
+"""Home Assistant compatibility classes for recording the inbound MQTT stream."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import gzip
+import struct
+import time
+
+from ..const import MAX_RECORDING_BYTES
+
+RECORDING_MAGIC = b"GEAMQTT1"
+
+# Microseconds since recording started, 1 if the payload was text, topic length and payload length
+_RECORD_HEADER = struct.Struct(">QBHI")
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedMessage:
+    """An MQTT message as it was received and when, in seconds since recording started."""
+
+    seconds: float
+    topic: str
+    payload: str | bytes
+
+
+class MqttRecorder:
+    """Class to record the raw inbound MQTT stream in memory until it is saved.
+
+    Each message is packed as it arrives, so recording costs the event loop a struct pack and an append, and the file is only written when the recording is saved.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = MAX_RECORDING_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the recorder, which stops recording once it holds max bytes."""
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._start = clock()
+        self._buffer = bytearray()
+        self.messages = 0
+        self.truncated = False
+
+    def record(self, topic: str, payload: str | bytes) -> None:
+        """Record the message unless the recording is full."""
+        if self.truncated:
+            return
+
+        is_text = isinstance(payload, str)
+        topic_bytes = topic.encode()
+        payload_bytes = payload.encode() if isinstance(payload, str) else payload
+        size = _RECORD_HEADER.size + len(topic_bytes) + len(payload_bytes)
+        if len(self._buffer) + size > self._max_bytes:
+            self.truncated = True
+            return
+
+        offset = max(round((self._clock() - self._start) * 1_000_000), 0)
+        self._buffer += _RECORD_HEADER.pack(
+            offset, is_text, len(topic_bytes), len(payload_bytes)
+        )
+        self._buffer += topic_bytes
+        self._buffer += payload_bytes
+        self.messages += 1
+
+    def save(self, path: str) -> None:
+        """Write the recording to a gzip compressed file."""
+        with gzip.open(path, "wb") as recording:
+            recording.write(RECORDING_MAGIC)
+            recording.write(self._buffer)
+
+
+def read_recording(path: str) -> list[RecordedMessage]:
+    """Return the messages in a recording, oldest first."""
+    with gzip.open(path, "rb") as recording:
+        data = recording.read()
+
+    if not data.startswith(RECORDING_MAGIC):
+        raise ValueError(f"{path} is not a GE Appliances MQTT recording")
+
+    messages = []
+    position = len(RECORDING_MAGIC)
+    while position < len(data):
+        offset, is_text, topic_length, payload_length = _RECORD_HEADER.unpack_from(
+            data, position
+        )
+        position += _RECORD_HEADER.size
+        topic = data[position : position + topic_length].decode()
+        position += topic_length
+        payload = data[position : position + payload_length]
+        position += payload_length
+        messages.append(
+            RecordedMessage(
+                offset / 1_000_000, topic, payload.decode() if is_text else payload
+            )
+        )
+
+    return messages
@@ -7,7 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from ..const import DOMAIN, GEA_ENTITY_NEW
+from ..const import DOMAIN, GEA_DEVICE_NEW, GEA_ENTITY_NEW
 from ..models import GeaEntityConfig
 
 _LOGGER = logging.getLogger()
@@ -33,9 +33,11 @@ class RegistryUpdater:
             )
 
     async def create_device(self, device_name: str) -> str:
-        """Create a device and add it to the registry."""
-        return self._device_registry.async_get_or_create(
+        """Create a device, add it to the registry and announce it so its counter sensors are added."""
+        device_id = self._device_registry.async_get_or_create(
             config_entry_id=self._entry.entry_id,
             identifiers={(DOMAIN, device_name)},
             name=device_name,
         ).id
+        async_dispatcher_send(self._hass, GEA_DEVICE_NEW, device_name)
+        return device_id
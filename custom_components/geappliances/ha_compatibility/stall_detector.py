@@ -0,0 +1,83 @@
+"""Home Assistant compatibility class for finding integration callbacks that hold up the event loop."""
+
+from contextlib import AbstractContextManager, nullcontext
+import logging
+import time
+from types import TracebackType
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+_NOT_MEASURING = nullcontext()
+
+
+class StallDetector:
+    """Class to time integration callbacks and log those that run longer than a threshold.
+
+    Detection is off until a threshold is set, and while it is off measuring a callback costs a single comparison.
+    Time spent awaiting counts towards the callback, since discovery awaits many coroutines that never actually yield.
+    """
+
+    def __init__(self, threshold: float | None = None) -> None:
+        """Initialize the detector with the threshold in seconds, or None to leave it off."""
+        self.threshold = threshold
+        self.stalls = 0
+
+    def measure(
+        self, stage: str, device_name: str | None = None, erd: Any = None
+    ) -> AbstractContextManager[Any]:
+        """Return a context that logs the callback for the stage if it runs longer than the threshold."""
+        if self.threshold is None:
+            return _NOT_MEASURING
+
+        return _StallTimer(self, stage, device_name, erd)
+
+    def report(
+        self, seconds: float, stage: str, device_name: str | None, erd: Any
+    ) -> None:
+        """Log the callback if it ran longer than the threshold."""
+        if self.threshold is None or seconds <= self.threshold:
+            return
+
+        self.stalls += 1
+        _LOGGER.warning(
+            "GE Appliances %s took %.1f ms (device: %s, ERD: %s)",
+            stage,
+            seconds * 1000,
+            device_name,
+            f"{erd:#06x}" if isinstance(erd, int) else erd,
+        )
+
+
+class _StallTimer:
+    """Context that times a single callback."""
+
+    __slots__ = ("_detector", "_device_name", "_erd", "_stage", "_start")
+
+    def __init__(
+        self, detector: StallDetector, stage: str, device_name: str | None, erd: Any
+    ) -> None:
+        """Initialize the timer."""
+        self._detector = detector
+        self._stage = stage
+        self._device_name = device_name
+        self._erd = erd
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Report the time the callback took."""
+        self._detector.report(
+            time.perf_counter() - self._start,
+            self._stage,
+            self._device_name,
+            self._erd,
+        )
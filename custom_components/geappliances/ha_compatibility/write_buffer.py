@@ -0,0 +1,121 @@
+"""Home Assistant compatibility class for merging writes to the same ERD."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import logging
+
+from ..const import Erd
+
+_LOGGER = logging.getLogger(__name__)
+
+type ErdPatch = Callable[[bytes], bytes]
+
+
+@dataclass
+class WriteBufferMetrics:
+    """Counts of the patches handled by a write buffer."""
+
+    patches: int = 0
+    publishes: int = 0
+    merged: int = 0
+
+
+@dataclass
+class _PendingWrite:
+    """Patches waiting to be applied to an ERD in a single publish."""
+
+    patches: list[ErdPatch]
+    done: asyncio.Future[bool] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class WriteBuffer:
+    """Class to merge patches to the same ERD made within a write window into a single publish.
+
+    A patch made on its own is published right away. The window is only waited for when other patches to the ERD are made
+    alongside it, or while an earlier publish to the ERD is still in progress.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[str, Erd], Awaitable[bytes | None]],
+        publish: Callable[[str, Erd, bytes], Awaitable[bool]],
+        window: float = 0,
+    ) -> None:
+        """Initialize the buffer with the window in seconds.
+
+        A window of 0 merges only the patches made before the event loop next runs.
+        """
+        self._read = read
+        self._publish = publish
+        self.window = window
+        self._pending: dict[tuple[str, Erd], _PendingWrite] = {}
+        self._locks: dict[tuple[str, Erd], asyncio.Lock] = {}
+        self._metrics = WriteBufferMetrics()
+
+    async def patch(self, device_name: str, erd: Erd, patch: ErdPatch) -> bool:
+        """Apply the patch to the latest value of the ERD and publish it, returning once the publish is done.
+
+        Return true if the patched value was published.
+        """
+        self._metrics.patches += 1
+        key = (device_name, erd)
+
+        if (pending := self._pending.get(key)) is not None:
+            pending.patches.append(patch)
+            return await asyncio.shield(pending.done)
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        pending = self._pending[key] = _PendingWrite([patch])
+        try:
+            # Let patches made alongside this one join it before deciding whether to wait for more
+            await asyncio.sleep(0)
+            if lock.locked() or len(pending.patches) > 1:
+                await asyncio.sleep(self.window)
+            async with lock:
+                # Close the batch before reading so later patches start a new one against the published value
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+                published = await self._flush(device_name, erd, pending.patches)
+        except BaseException as err:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            if isinstance(err, Exception):
+                pending.done.set_exception(err)
+                # The leader raises the error itself, so don't log it if there is no one else waiting
+                pending.done.exception()
+            else:
+                pending.done.cancel()
+            raise
+
+        pending.done.set_result(published)
+        return published
+
+    async def _flush(self, device_name: str, erd: Erd, patches: list[ErdPatch]) -> bool:
+        """Apply every patch to the latest value of the ERD in order and publish the result once.
+
+        Return true if the result was published.
+        """
+        value = await self._read(device_name, erd)
+        if value is None:
+            _LOGGER.warning(
+                "Dropping %d writes to ERD %s of %s because its value is unknown",
+                len(patches),
+                f"{erd:#06x}",
+                device_name,
+            )
+            return False
+
+        for patch in patches:
+            value = patch(value)
+
+        self._metrics.publishes += 1
+        self._metrics.merged += len(patches) - 1
+        return await self._publish(device_name, erd, value)
+
+    @property
+    def metrics(self) -> WriteBufferMetrics:
+        """Return the counts of the patches handled by the buffer."""
+        return self._metrics
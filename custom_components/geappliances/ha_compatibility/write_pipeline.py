@@ -0,0 +1,196 @@
+"""Home Assistant compatibility class for publishing ERD writes to a device in order."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+
+from ..const import (
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_WRITE_RETRIES,
+    DEFAULT_WRITE_RETRY_DELAY,
+    DEFAULT_WRITE_TIMEOUT,
+    DEFAULT_WRITE_WINDOW,
+    Erd,
+)
+from .mqtt_client import GeaMQTTClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WriteOptions:
+    """Options for how writes are published and confirmed."""
+
+    retries: int = DEFAULT_WRITE_RETRIES
+    retry_delay: float = DEFAULT_WRITE_RETRY_DELAY
+    timeout: float = DEFAULT_WRITE_TIMEOUT
+    window: float = DEFAULT_WRITE_WINDOW / 1000
+    optimistic: bool = DEFAULT_OPTIMISTIC
+
+
+@dataclass
+class WritePipelineMetrics:
+    """Counts and round-trip latency of the writes published to a device."""
+
+    published: int = 0
+    retried: int = 0
+    failed: int = 0
+    pending: int = 0
+    confirmed: int = 0
+    timed_out: int = 0
+    last_latency: float | None = None
+    max_latency: float = 0
+    total_latency: float = 0
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average time in seconds for a write to be confirmed."""
+        if self.confirmed == 0:
+            return None
+
+        return self.total_latency / self.confirmed
+
+
+@dataclass
+class _PendingConfirmation:
+    """A published write waiting for the device to report the written value."""
+
+    value: bytes
+    sent: float
+    timeout: asyncio.TimerHandle
+    done: asyncio.Future[bool]
+
+
+class WritePipeline:
+    """Class to publish a device's writes one at a time and track whether the device applied them."""
+
+    def __init__(
+        self, device_name: str, mqtt_client: GeaMQTTClient, options: WriteOptions
+    ) -> None:
+        """Initialize the pipeline."""
+        self._device_name = device_name
+        self._mqtt_client = mqtt_client
+        self.options = options
+        self._lock = asyncio.Lock()
+        self._pending: dict[Erd, _PendingConfirmation] = {}
+        self._metrics = WritePipelineMetrics()
+
+    async def publish(self, erd: Erd, value: bytes, confirm_erd: Erd | None) -> bool:
+        """Publish the write once every earlier write has been published, retrying with backoff.
+
+        The write is confirmed when the confirmation ERD reports the written value. A write without a confirmation ERD is not
+        tracked. Return true if the publish succeeded.
+        """
+        async with self._lock:
+            return await self._publish_with_retries(erd, value, confirm_erd)
+
+    async def publish_batch(
+        self, writes: list[tuple[Erd, bytes, Erd | None]]
+    ) -> list[bool]:
+        """Publish the (ERD, value, confirmation ERD) writes back to back without any other write in between.
+
+        Return whether each publish succeeded.
+        """
+        async with self._lock:
+            return [
+                await self._publish_with_retries(erd, value, confirm_erd)
+                for erd, value, confirm_erd in writes
+            ]
+
+    async def _publish_with_retries(
+        self, erd: Erd, value: bytes, confirm_erd: Erd | None
+    ) -> bool:
+        """Publish the write, retrying with backoff, and start tracking its confirmation if it has a confirmation ERD."""
+        for attempt in range(self.options.retries + 1):
+            if attempt > 0:
+                self._metrics.retried += 1
+                await asyncio.sleep(self.options.retry_delay * 2 ** (attempt - 1))
+
+            # Telemetry is held back only while publishing, not during the backoff
+            async with self._mqtt_client.prioritized():
+                published = await self._mqtt_client.publish_erd(
+                    self._device_name, erd, value
+                )
+
+            if published:
+                self._metrics.published += 1
+                if confirm_erd is not None:
+                    self._track(confirm_erd, value)
+                return True
+
+        self._metrics.failed += 1
+        _LOGGER.error(
+            "Giving up on write to ERD %s after %d attempts",
+            f"{erd:#06x}",
+            self.options.retries + 1,
+        )
+        return False
+
+    def _track(self, confirm_erd: Erd, value: bytes) -> None:
+        """Wait for the confirmation ERD to report the value, replacing any older write to the same ERD."""
+        loop = asyncio.get_running_loop()
+        if (superseded := self._pending.pop(confirm_erd, None)) is not None:
+            superseded.timeout.cancel()
+            # Anyone waiting on the older write learns the outcome of the write that replaced it
+            done = superseded.done
+        else:
+            done = loop.create_future()
+
+        self._pending[confirm_erd] = _PendingConfirmation(
+            value,
+            time.monotonic(),
+            loop.call_later(self.options.timeout, self._time_out, confirm_erd),
+            done,
+        )
+        self._metrics.pending = len(self._pending)
+
+    def _time_out(self, confirm_erd: Erd) -> None:
+        """Give up waiting for the write to be confirmed."""
+        if (pending := self._pending.pop(confirm_erd, None)) is not None:
+            pending.done.set_result(False)
+            self._metrics.timed_out += 1
+            self._metrics.pending = len(self._pending)
+            _LOGGER.debug(
+                "Write to ERD %s was not confirmed within %ss",
+                f"{confirm_erd:#06x}",
+                self.options.timeout,
+            )
+
+    async def confirm(self, erd: Erd, value: bytes) -> None:
+        """Confirm the pending write to the ERD if the device reported the written value."""
+        pending = self._pending.get(erd)
+        if pending is None or pending.value != value:
+            return
+
+        del self._pending[erd]
+        pending.timeout.cancel()
+        pending.done.set_result(True)
+
+        latency = time.monotonic() - pending.sent
+        self._metrics.confirmed += 1
+        self._metrics.pending = len(self._pending)
+        self._metrics.last_latency = latency
+        self._metrics.max_latency = max(self._metrics.max_latency, latency)
+        self._metrics.total_latency += latency
+
+    async def get_confirmation(self, confirm_erd: Erd) -> asyncio.Future[bool] | None:
+        """Return a future of whether the pending write to the ERD is confirmed, or None if no write is pending."""
+        if (pending := self._pending.get(confirm_erd)) is None:
+            return None
+
+        return pending.done
+
+    async def shutdown(self) -> None:
+        """Stop waiting for any pending confirmations."""
+        for pending in self._pending.values():
+            pending.timeout.cancel()
+            pending.done.cancel()
+
+        self._pending.clear()
+        self._metrics.pending = 0
+
+    @property
+    def metrics(self) -> WritePipelineMetrics:
+        """Return the counts and latency of the writes published to the device."""
+        return self._metrics
@@ -10,7 +10,7 @@ from homeassistant.components.number import NumberEntity
 from homeassistant.components.number.const import NumberDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -18,7 +18,6 @@ from .const import (
     ATTR_ENABLED,
     ATTR_MAX_VAL,
     ATTR_MIN_VAL,
-    ATTR_UNIQUE_ID,
     ATTR_UNIT,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
@@ -30,7 +29,7 @@ from .const import (
     SERVICE_SET_UNIT,
     SERVICE_SET_UNIT_SCHEMA,
 )
-from .entity import GeaEntity
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
 from .models import GeaNumberConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -129,41 +128,47 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances number input dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_number"
 
     async def handle_service_call(entity: GeaNumber, service_call: ServiceCall):
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
-            elif service_call.service == SERVICE_SET_MIN:
-                await entity.set_min(service_call.data[ATTR_MIN_VAL])
-            elif service_call.service == SERVICE_SET_MAX:
-                await entity.set_max(service_call.data[ATTR_MAX_VAL])
-            elif service_call.service == SERVICE_SET_UNIT:
-                await entity.set_unit(service_call.data[ATTR_UNIT])
-
-    platform.async_register_entity_service(
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        elif service_call.service == SERVICE_SET_MIN:
+            await entity.set_min(service_call.data[ATTR_MIN_VAL])
+        elif service_call.service == SERVICE_SET_MAX:
+            await entity.set_max(service_call.data[ATTR_MAX_VAL])
+        elif service_call.service == SERVICE_SET_UNIT:
+            await entity.set_unit(service_call.data[ATTR_UNIT])
+
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaNumber,
         handle_service_call,
     )
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_SET_MIN,
         SERVICE_SET_MIN_SCHEMA,
+        GeaNumber,
         handle_service_call,
     )
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_SET_MAX,
         SERVICE_SET_MAX_SCHEMA,
+        GeaNumber,
         handle_service_call,
     )
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_SET_UNIT,
         SERVICE_SET_UNIT_SCHEMA,
+        GeaNumber,
         handle_service_call,
     )
 
@@ -185,7 +190,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(number.const.DOMAIN),
-        async_discover,
+        timed_discover(hass, number.const.DOMAIN, async_discover),
     )
 
 
@@ -199,7 +204,7 @@ class GeaNumber(NumberEntity, GeaEntity):
         self._attr_name = config.name
         self._attr_should_poll = False
         self._attr_device_class = config.device_class
-        self._field_bytes: bytes | None = None
+        self._attr_native_value = None
         self._attr_native_unit_of_measurement = config.unit
         self._attr_suggested_unit_of_measurement = config.unit
         self._attr_native_min_value = config.min
@@ -212,7 +217,6 @@ class GeaNumber(NumberEntity, GeaEntity):
         self._data_source = config.data_source
         self._offset = config.offset
         self._size = config.size
-        self._value_fn = config.value_func
         self._bit_mask = config.bit_mask
         self._bit_size = config.bit_size
         self._bit_offset = config.bit_offset
@@ -227,16 +231,19 @@ class GeaNumber(NumberEntity, GeaEntity):
 
     async def async_added_to_hass(self) -> None:
         """Set initial state from ERD and set up callback for updates."""
+        await self.locate_field(self._status_erd, self._bit_offset, self._bit_size)
         value = await self._data_source.erd_read(self._device_name, self._status_erd)
         await self.erd_updated(value)
 
         await self._data_source.erd_subscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
@@ -244,12 +251,16 @@ class GeaNumber(NumberEntity, GeaEntity):
     @callback
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
+        if self.awaiting_confirmation and value is not None:
+            return
+
         if value is None:
-            self._field_bytes = None
+            self._attr_native_value = None
         else:
-            self._field_bytes = await self.get_field_bytes(value)
+            val = await self.decode_field(self._status_erd, value)
+            self._attr_native_value = (val / self._scale) if self._scale > 1 else val
 
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     async def _get_bytes_from_value(self, value: float) -> bytes:
         """Cast the value to bytes depending on whether the number is signed or unsigned."""
@@ -259,48 +270,42 @@ class GeaNumber(NumberEntity, GeaEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the value."""
-        erd_value = await self._data_source.erd_read(self._device_name, self._erd)
-        if erd_value is not None:
-            value_bytes = await self._get_bytes_from_value(value * (self._scale or 1))
-
-            if self._bit_mask is not None:
-                cur_field_bytes = await self.get_field_bytes(erd_value)
-                value_bytes = (
+        if self._bit_mask is not None:
+            patch = self.field_patch(
+                lambda cur_field_bytes: (
                     int.from_bytes(cur_field_bytes) | (int(value) << (self._bit_offset))
                 ).to_bytes()
-
-            await self._data_source.erd_publish(
-                self._device_name,
-                self._erd,
-                await self.set_field_bytes(erd_value, value_bytes),
             )
+        else:
+            value_bytes = await self._get_bytes_from_value(value * (self._scale or 1))
+            patch = self.field_patch(lambda _: value_bytes)
 
-    @property
-    def native_value(self) -> int | None:
-        """Return value of the number."""
-        if self._field_bytes is None:
-            return None
+        await self.write_patch(patch, "_attr_native_value", value)
 
-        val = self._value_fn(self._field_bytes)
+    async def apply_min(self, min_val: float) -> None:
+        """Apply the minimum value without writing state."""
+        self._attr_native_min_value = min_val / self._scale
 
-        if self._bit_mask is not None:
-            shift = (self._offset * 8) + self._bit_offset
-            val = (val & self._bit_mask) >> shift
+    async def apply_max(self, max_val: float) -> None:
+        """Apply the maximum value without writing state."""
+        self._attr_native_max_value = max_val / self._scale
 
-        return (val / self._scale) if self._scale > 1 else val
+    async def apply_unit(self, unit: str) -> None:
+        """Apply the unit without writing state."""
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_unit_of_measurement = unit
 
     async def set_min(self, min_val: float) -> None:
         """Set the minimum value."""
-        self._attr_native_min_value = min_val / self._scale
+        await self.apply_min(min_val)
         self.async_schedule_update_ha_state(True)
 
     async def set_max(self, max_val: float) -> None:
         """Set the minimum value."""
-        self._attr_native_max_value = max_val / self._scale
+        await self.apply_max(max_val)
         self.async_schedule_update_ha_state(True)
 
     async def set_unit(self, unit: str) -> None:
         "Set the unit."
-        self._attr_native_unit_of_measurement = unit
-        self._attr_suggested_unit_of_measurement = unit
+        await self.apply_unit(unit)
         self.async_schedule_update_ha_state(True)
@@ -8,21 +8,20 @@ from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_ALLOWABLE,
     ATTR_ENABLED,
-    ATTR_UNIQUE_ID,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
     SERVICE_ENABLE_OR_DISABLE_SCHEMA,
     SERVICE_SET_ALLOWABLES,
     SERVICE_SET_ALLOWABLES_SCHEMA,
 )
-from .entity import GeaEntity
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
 from .models import GeaSelectConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,26 +46,30 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances select dropdown dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_select"
 
     async def handle_service_call(entity: GeaSelect, service_call: ServiceCall) -> None:
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
-            elif service_call.service == SERVICE_SET_ALLOWABLES:
-                await entity.set_allowables(
-                    service_call.data[ATTR_ALLOWABLE], service_call.data[ATTR_ENABLED]
-                )
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        elif service_call.service == SERVICE_SET_ALLOWABLES:
+            await entity.set_allowables(
+                service_call.data[ATTR_ALLOWABLE], service_call.data[ATTR_ENABLED]
+            )
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaSelect,
         handle_service_call,
     )
 
-    platform.async_register_entity_service(
-        SERVICE_SET_ALLOWABLES, SERVICE_SET_ALLOWABLES_SCHEMA, handle_service_call
+    async_register_indexed_service(
+        hass,
+        SERVICE_SET_ALLOWABLES,
+        SERVICE_SET_ALLOWABLES_SCHEMA,
+        GeaSelect,
+        handle_service_call,
     )
 
     entity_registry = er.async_get(hass)
@@ -87,7 +90,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(select.const.DOMAIN),
-        async_discover,
+        timed_discover(hass, select.const.DOMAIN, async_discover),
     )
 
 
@@ -100,7 +103,7 @@ class GeaSelect(SelectEntity, GeaEntity):
         self._attr_has_entity_name = True
         self._attr_name = config.name
         self._attr_should_poll = False
-        self._field_bytes: bytes | None = None
+        self._attr_current_option = None
         self._enum_vals = config.enum_vals
         self._attr_options = list(config.enum_vals.values())
         self._erd = config.erd
@@ -119,16 +122,19 @@ class GeaSelect(SelectEntity, GeaEntity):
 
     async def async_added_to_hass(self) -> None:
         """Set initial state from ERD and set up callback for updates."""
+        await self.locate_field(self._status_erd)
         value = await self._data_source.erd_read(self._device_name, self._status_erd)
         await self.erd_updated(value)
 
         await self._data_source.erd_subscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
@@ -136,12 +142,20 @@ class GeaSelect(SelectEntity, GeaEntity):
     @callback
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
+        if self.awaiting_confirmation and value is not None:
+            return
+
         if value is None:
-            self._field_bytes = None
+            self._attr_current_option = None
         else:
-            self._field_bytes = await self.get_field_bytes(value)
+            field_value = await self.decode_field(self._status_erd, value)
+            self._attr_current_option = self._enum_vals.get(field_value)
+            if self._attr_current_option is None:
+                _LOGGER.warning(
+                    "%s has no option for value %s", self.entity_id, field_value
+                )
 
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     async def _get_bytes_from_option(self, value: str) -> bytes:
         """Get the correct enum value for the selected option."""
@@ -153,28 +167,23 @@ class GeaSelect(SelectEntity, GeaEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        erd_value = await self._data_source.erd_read(self._device_name, self._erd)
-        if erd_value is not None:
-            option_bytes = await self._get_bytes_from_option(option)
-            await self._data_source.erd_publish(
-                self._device_name,
-                self._erd,
-                await self.set_field_bytes(erd_value, option_bytes),
-            )
-
-    @property
-    def current_option(self) -> str | None:
-        """Return value of the select."""
-        if self._field_bytes is None:
-            return None
-
-        return self._enum_vals[int.from_bytes(self._field_bytes)]
+        option_bytes = await self._get_bytes_from_option(option)
+        await self.write_patch(
+            self.field_patch(lambda _: option_bytes), "_attr_current_option", option
+        )
 
-    async def set_allowables(self, allowable: str, enabled: bool) -> None:
-        """Update the allowable list of options."""
+    async def apply_allowable(self, allowable: str, enabled: bool) -> None:
+        """Add or remove the option from the allowable list without writing state."""
+        # Replace the list rather than mutating it so the previous state's options are left intact
         if enabled:
             if allowable not in self._attr_options:
-                self._attr_options.append(allowable)
+                self._attr_options = [*self._attr_options, allowable]
         elif allowable in self._attr_options:
-            self._attr_options.remove(allowable)
+            self._attr_options = [
+                option for option in self._attr_options if option != allowable
+            ]
+
+    async def set_allowables(self, allowable: str, enabled: bool) -> None:
+        """Update the allowable list of options."""
+        await self.apply_allowable(allowable, enabled)
         self.async_schedule_update_ha_state(True)
@@ -13,18 +13,18 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_ENABLED,
-    ATTR_UNIQUE_ID,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
     SERVICE_ENABLE_OR_DISABLE_SCHEMA,
 )
-from .entity import GeaEntity
+from .counter_sensor import async_setup_counter_sensors
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
 from .models import GeaSensorConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -97,7 +97,7 @@ class SensorConfigAttributes:
             return lambda value: int.from_bytes(value, signed=True)
 
         if field["type"] == "string":
-            return lambda value: value.decode("utf-8")
+            return lambda value: value.decode("utf-8", errors="replace")
 
         if field["type"] == "raw":
             return lambda value: value.hex()
@@ -111,17 +111,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances sensor dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_sensor"
 
     async def handle_service_call(entity: GeaSensor, service_call: ServiceCall) -> None:
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaSensor,
         handle_service_call,
     )
 
@@ -143,9 +143,11 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(sensor.const.DOMAIN),
-        async_discover,
+        timed_discover(hass, sensor.const.DOMAIN, async_discover),
     )
 
+    await async_setup_counter_sensors(hass, config_entry, async_add_entities)
+
 
 class GeaSensor(SensorEntity, GeaEntity):
     """Representation of a GE Appliances binary sensor."""
@@ -158,7 +160,7 @@ class GeaSensor(SensorEntity, GeaEntity):
         self._attr_should_poll = False
         self._attr_device_class = config.device_class
         self._attr_state_class = config.state_class
-        self._field_bytes: bytes | None = None
+        self._attr_native_value = None
         self._attr_native_unit_of_measurement = config.unit
         if config.device_class not in [
             SensorDeviceClass.BATTERY,
@@ -204,16 +206,19 @@ class GeaSensor(SensorEntity, GeaEntity):
 
     async def async_added_to_hass(self) -> None:
         """Set initial state from ERD and set up callback for updates."""
+        await self.locate_field(self._erd, self._bit_offset, self._bit_size)
         value = await self._data_source.erd_read(self._device_name, self._erd)
         await self.erd_updated(value)
 
         await self._data_source.erd_subscribe(
             self._device_name, self._erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._erd, self.erd_updated
         )
@@ -222,30 +227,24 @@ class GeaSensor(SensorEntity, GeaEntity):
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
         if value is None:
-            self._field_bytes = None
+            self._attr_native_value = None
         else:
-            self._field_bytes = await self.get_field_bytes(value)
-
-        self.async_schedule_update_ha_state(True)
+            self._attr_native_value = await self._get_native_value(
+                await self.decode_field(self._erd, value)
+            )
 
-    @property
-    def native_value(self) -> str | int | float | date | datetime | Decimal | None:
-        """Return value of the sensor."""
-        if self._field_bytes is None:
-            return None
+        self.async_write_ha_state()
 
+    async def _get_native_value(
+        self, field_value: Any
+    ) -> str | int | float | date | datetime | Decimal | None:
+        """Convert the decoded field to the value shown by the sensor."""
         if self._attr_device_class == SensorDeviceClass.ENUM:
             if TYPE_CHECKING:
                 assert self._enum_vals is not None
-            return self._enum_vals.get(self._value_fn(self._field_bytes))
-
-        val = self._value_fn(self._field_bytes)
-
-        if self._bit_mask is not None:
-            shift = (self._offset * 8) + self._bit_offset
-            val = (val & self._bit_mask) >> shift
+            return self._enum_vals.get(field_value)
 
-        if self._type not in ("string", "raw", "enum"):
-            return (val / self._scale) if self._scale > 1 else val
+        if self._type in ("string", "raw"):
+            return self._value_fn(field_value)
 
-        return val
+        return (field_value / self._scale) if self._scale > 1 else field_value
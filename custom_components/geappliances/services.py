@@ -0,0 +1,300 @@
+"""Services for GE Appliances that act on a whole device, profile the integration or record its MQTT stream."""
+
+from collections.abc import Awaitable, Callable
+import threading
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_DEVICE,
+    ATTR_ERD,
+    ATTR_ERDS,
+    ATTR_FIELDS,
+    ATTR_INTERVAL,
+    ATTR_MESSAGES,
+    ATTR_PATH,
+    ATTR_SAMPLES,
+    ATTR_STACKS,
+    ATTR_TRUNCATED,
+    DATA_SOURCE,
+    DOMAIN,
+    MQTT_CLIENT,
+    PROFILER,
+    SERVICE_GET_DEVICE_SNAPSHOT,
+    SERVICE_GET_DEVICE_SNAPSHOT_SCHEMA,
+    SERVICE_START_PROFILE,
+    SERVICE_START_PROFILE_SCHEMA,
+    SERVICE_START_RECORDING,
+    SERVICE_START_RECORDING_SCHEMA,
+    SERVICE_STOP_PROFILE,
+    SERVICE_STOP_PROFILE_SCHEMA,
+    SERVICE_STOP_RECORDING,
+    SERVICE_STOP_RECORDING_SCHEMA,
+    SERVICE_WRITE_ERDS,
+    SERVICE_WRITE_ERDS_SCHEMA,
+    STALL_DETECTOR,
+    Erd,
+)
+from .ha_compatibility.data_source import DataSource
+from .ha_compatibility.mqtt_client import GeaMQTTClient
+from .ha_compatibility.profiler import SamplingProfiler
+from .ha_compatibility.recorder import MqttRecorder
+from .ha_compatibility.stall_detector import StallDetector
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services that act on a whole device, profile the integration or record its MQTT stream."""
+
+    async def handle_write_erds(service_call: ServiceCall) -> None:
+        device_name = service_call.data[ATTR_DEVICE]
+        data_source = await get_data_source(hass, device_name)
+
+        fields_by_erd: dict[Erd, dict[str, Any]] = {}
+        for assignment in service_call.data[ATTR_ERDS]:
+            fields_by_erd.setdefault(assignment[ATTR_ERD], {}).update(
+                assignment[ATTR_FIELDS]
+            )
+
+        # Encode every ERD before publishing any so a bad assignment doesn't leave a partial write
+        values = {
+            erd: await encode_assignment(data_source, device_name, erd, fields)
+            for erd, fields in fields_by_erd.items()
+        }
+
+        await data_source.erd_publish_batch(device_name, values)
+
+    async def handle_get_device_snapshot(service_call: ServiceCall) -> ServiceResponse:
+        device_name = service_call.data[ATTR_DEVICE]
+        data_source = await get_data_source(hass, device_name)
+
+        return {
+            ATTR_DEVICE: device_name,
+            ATTR_ERDS: await data_source.get_device_snapshot(device_name),
+        }
+
+    async def handle_start_profile(service_call: ServiceCall) -> None:
+        data = hass.data.get(DOMAIN, {})
+        if PROFILER in data:
+            raise ServiceValidationError("GE Appliances profiler is already running")
+
+        # Service handlers run on the event loop, so this is the thread to sample
+        profiler = SamplingProfiler(
+            threading.get_ident(), service_call.data[ATTR_INTERVAL] / 1000
+        )
+        profiler.start()
+        data[PROFILER] = profiler
+
+    async def handle_stop_profile(service_call: ServiceCall) -> ServiceResponse:
+        profiler: SamplingProfiler | None = hass.data.get(DOMAIN, {}).pop(
+            PROFILER, None
+        )
+        if profiler is None:
+            raise ServiceValidationError("GE Appliances profiler is not running")
+
+        await hass.async_add_executor_job(profiler.stop)
+        path = hass.config.path(
+            f"geappliances_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.collapsed"
+        )
+        await hass.async_add_executor_job(write_profile, path, profiler.collapsed())
+
+        return {
+            ATTR_PATH: path,
+            ATTR_SAMPLES: profiler.samples,
+            ATTR_STACKS: len(profiler.stacks),
+        }
+
+    async def handle_start_recording(service_call: ServiceCall) -> None:
+        mqtt_client = get_mqtt_client(hass)
+        if mqtt_client.recorder is not None:
+            raise ServiceValidationError(
+                "GE Appliances MQTT recording is already running"
+            )
+
+        mqtt_client.recorder = MqttRecorder()
+
+    async def handle_stop_recording(service_call: ServiceCall) -> ServiceResponse:
+        mqtt_client = get_mqtt_client(hass)
+        if (recorder := mqtt_client.recorder) is None:
+            raise ServiceValidationError("GE Appliances MQTT recording is not running")
+
+        mqtt_client.recorder = None
+        path = hass.config.path(
+            f"geappliances_recording_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.mqtt.gz"
+        )
+        await hass.async_add_executor_job(recorder.save, path)
+
+        return {
+            ATTR_PATH: path,
+            ATTR_MESSAGES: recorder.messages,
+            ATTR_TRUNCATED: recorder.truncated,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_ERDS,
+        timed_service(hass, SERVICE_WRITE_ERDS, handle_write_erds),
+        vol.Schema(SERVICE_WRITE_ERDS_SCHEMA),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DEVICE_SNAPSHOT,
+        timed_service(hass, SERVICE_GET_DEVICE_SNAPSHOT, handle_get_device_snapshot),
+        vol.Schema(SERVICE_GET_DEVICE_SNAPSHOT_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILE,
+        handle_start_profile,
+        vol.Schema(SERVICE_START_PROFILE_SCHEMA),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILE,
+        handle_stop_profile,
+        vol.Schema(SERVICE_STOP_PROFILE_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        handle_start_recording,
+        vol.Schema(SERVICE_START_RECORDING_SCHEMA),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        handle_stop_recording,
+        vol.Schema(SERVICE_STOP_RECORDING_SCHEMA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def get_data_source(hass: HomeAssistant, device_name: str) -> DataSource:
+    """Return the data source, raising if the device has not been discovered."""
+    data_source: DataSource | None = hass.data.get(DOMAIN, {}).get(DATA_SOURCE)
+    if data_source is None or not await data_source.device_exists(device_name):
+        raise ServiceValidationError(f"Unknown GE Appliances device {device_name}")
+
+    return data_source
+
+
+def timed_service[ResponseT: ServiceResponse](
+    hass: HomeAssistant,
+    service: str,
+    handler: Callable[[ServiceCall], Awaitable[ResponseT]],
+) -> Callable[[ServiceCall], Awaitable[ResponseT]]:
+    """Wrap a device service handler so the stall detector times each call."""
+
+    async def handle(service_call: ServiceCall) -> ResponseT:
+        stall_detector: StallDetector | None = hass.data.get(DOMAIN, {}).get(
+            STALL_DETECTOR
+        )
+        if stall_detector is None:
+            return await handler(service_call)
+
+        with stall_detector.measure(
+            f"{service} service", service_call.data.get(ATTR_DEVICE)
+        ):
+            return await handler(service_call)
+
+    return handle
+
+
+def get_mqtt_client(hass: HomeAssistant) -> GeaMQTTClient:
+    """Return the MQTT client, raising if the integration has not started."""
+    mqtt_client: GeaMQTTClient | None = hass.data.get(DOMAIN, {}).get(MQTT_CLIENT)
+    if mqtt_client is None:
+        raise ServiceValidationError("GE Appliances has not started")
+
+    return mqtt_client
+
+
+async def encode_assignment(
+    data_source: DataSource,
+    device_name: str,
+    erd: Erd,
+    fields: dict[str, Any],
+) -> bytes:
+    """Validate the field assignments against the ERD's definition and return the encoded ERD value."""
+    erd_def = await data_source.get_erd_def(erd)
+    if erd_def is None:
+        raise ServiceValidationError(f"ERD {erd:#06x} is not in the appliance API")
+
+    if "write" not in erd_def["operations"]:
+        raise ServiceValidationError(f"ERD {erd:#06x} is not writable")
+
+    if not await data_source.erd_is_supported_by_device(device_name, erd):
+        raise ServiceValidationError(
+            f"ERD {erd:#06x} is not supported by device {device_name}"
+        )
+
+    field_indexes = {
+        field["name"]: index for index, field in enumerate(erd_def["data"])
+    }
+    values: dict[int, int | bytes] = {}
+    for name, value in fields.items():
+        if (index := field_indexes.get(name)) is None:
+            raise ServiceValidationError(f"ERD {erd:#06x} has no field named {name}")
+
+        values[index] = await convert_field_value(erd, erd_def["data"][index], value)
+
+    try:
+        return await data_source.erd_encode(device_name, erd, values)
+    except ValueError as err:
+        raise ServiceValidationError(f"ERD {erd:#06x}: {err}") from err
+
+
+async def convert_field_value(
+    erd: Erd, field: dict[str, Any], value: Any
+) -> int | bytes:
+    """Convert a service value to the integer or bytes the field holds."""
+    try:
+        if field["type"] == "enum":
+            if isinstance(value, str) and value in field["values"].values():
+                return next(
+                    int(key) for key, name in field["values"].items() if name == value
+                )
+            if str(int(value)) not in field["values"]:
+                raise ValueError(
+                    f"{value} is not one of {list(field['values'].values())}"
+                )
+            return int(value)
+
+        if field["type"] == "string":
+            return str(value).encode()
+
+        if field["type"] == "raw":
+            return bytes.fromhex(str(value))
+
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{value} is not a whole number")
+
+        return int(value)
+    except ValueError as err:
+        raise ServiceValidationError(
+            f"ERD {erd:#06x} field {field['name']}: {err}"
+        ) from err
+
+
+def write_profile(path: str, collapsed: str) -> None:
+    """Write the collapsed stacks to the file."""
+    with open(path, "w", encoding="utf-8") as profile:
+        profile.write(collapsed)
@@ -7,18 +7,18 @@ from homeassistant.components import switch
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_ENABLED,
-    ATTR_UNIQUE_ID,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
     SERVICE_ENABLE_OR_DISABLE_SCHEMA,
 )
-from .entity import GeaEntity
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
+from .ha_compatibility.write_buffer import ErdPatch
 from .models import GeaSwitchConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,17 +30,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances switch dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_switch"
 
     async def handle_service_call(entity: GeaSwitch, service_call: ServiceCall) -> None:
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaSwitch,
         handle_service_call,
     )
 
@@ -62,7 +62,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(switch.const.DOMAIN),
-        async_discover,
+        timed_discover(hass, switch.const.DOMAIN, async_discover),
     )
 
 
@@ -92,16 +92,26 @@ class GeaSwitch(SwitchEntity, GeaEntity):
 
     async def async_added_to_hass(self) -> None:
         """Set initial state from ERD and set up callback for updates."""
+        if self._bit_mask == 0xFF:
+            await self.locate_field(self._status_erd)
+        else:
+            # The bit mask is relative to the start of the ERD rather than the field
+            shift = (self._bit_mask & -self._bit_mask).bit_length() - 1
+            await self.locate_field(
+                self._status_erd, shift - (self._offset * 8), self._bit_mask.bit_count()
+            )
         value = await self._data_source.erd_read(self._device_name, self._status_erd)
         await self.erd_updated(value)
 
         await self._data_source.erd_subscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
@@ -109,43 +119,42 @@ class GeaSwitch(SwitchEntity, GeaEntity):
     @callback
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
+        if self.awaiting_confirmation and value is not None:
+            return
+
         if value is None:
             self._attr_is_on = None
         else:
-            self._attr_is_on = (
-                int.from_bytes(await self.get_field_bytes(value)) & self._bit_mask != 0
-            )
+            self._attr_is_on = await self.decode_field(self._status_erd, value) != 0
 
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     @property
     async def async_is_on(self) -> bool | None:
         """Return true if the switch is on."""
         return self._attr_is_on
 
+    def switch_patch(self, on: bool) -> ErdPatch:
+        """Return a patch that turns the switch's field, or its bit of the field, on or off."""
+        if self._bit_mask == 0xFF:
+            return self.field_patch(lambda _: bytes.fromhex("01" if on else "00"))
+
+        # The bit mask is relative to the start of the ERD rather than the field
+        mask = self._bit_mask >> (self._offset * 8)
+
+        def set_bit(field_bytes: bytes) -> bytes:
+            field = int.from_bytes(field_bytes)
+            return (field | mask if on else field & ~mask).to_bytes(len(field_bytes))
+
+        return self.field_patch(set_bit)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        value = await self._data_source.erd_read(self._device_name, self._erd)
-        if value is not None:
-            if self._bit_mask == 0xFF:
-                value = await self.set_field_bytes(value, bytes.fromhex("01"))
-            else:
-                value = await self.set_field_bytes(
-                    value,
-                    (value[self._offset] | self._bit_mask).to_bytes(),
-                )
-
-            await self._data_source.erd_publish(self._device_name, self._erd, value)
+        await self.write_patch(self.switch_patch(True), "_attr_is_on", True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        value = await self._data_source.erd_read(self._device_name, self._erd)
-        if value is not None:
-            value = await self.set_field_bytes(
-                value,
-                (value[self._offset] & ~self._bit_mask).to_bytes(),
-            )
-            await self._data_source.erd_publish(self._device_name, self._erd, value)
+        await self.write_patch(self.switch_patch(False), "_attr_is_on", False)
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the switch."""
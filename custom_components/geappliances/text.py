@@ -7,18 +7,17 @@ from homeassistant.components import text
 from homeassistant.components.text import TextEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_ENABLED,
-    ATTR_UNIQUE_ID,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
     SERVICE_ENABLE_OR_DISABLE_SCHEMA,
 )
-from .entity import GeaEntity
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
 from .models import GeaTextConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,17 +29,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances text input dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_text"
 
     async def handle_service_call(entity: GeaText, service_call: ServiceCall) -> None:
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaText,
         handle_service_call,
     )
 
@@ -62,7 +61,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(text.const.DOMAIN),
-        async_discover,
+        timed_discover(hass, text.const.DOMAIN, async_discover),
     )
 
 
@@ -75,7 +74,7 @@ class GeaText(TextEntity, GeaEntity):
         self._attr_has_entity_name = True
         self._attr_name = config.name
         self._attr_should_poll = False
-        self._field_bytes: bytes | None = None
+        self._attr_native_value = None
         self._attr_native_max = config.size * 2 if config.is_raw_bytes else config.size
         self._erd = config.erd
         self._status_erd = config.status_erd or config.erd
@@ -100,10 +99,12 @@ class GeaText(TextEntity, GeaEntity):
         await self._data_source.erd_subscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
@@ -111,12 +112,20 @@ class GeaText(TextEntity, GeaEntity):
     @callback
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
+        if self.awaiting_confirmation and value is not None:
+            return
+
         if value is None:
-            self._field_bytes = None
+            self._attr_native_value = None
         else:
-            self._field_bytes = await self.get_field_bytes(value)
+            field_bytes = await self.get_field_bytes(value)
+            self._attr_native_value = (
+                field_bytes.hex()
+                if self._is_raw_bytes
+                else field_bytes.decode(errors="replace")
+            )
 
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
 
     async def _get_bytes_from_value(self, value: str) -> bytes:
         """Convert the string value to bytes."""
@@ -124,25 +133,11 @@ class GeaText(TextEntity, GeaEntity):
 
     async def async_set_value(self, value: str) -> None:
         """Set the text value."""
-        erd_value = await self._data_source.erd_read(self._device_name, self._erd)
-        if erd_value is not None:
-            if self._is_raw_bytes:
-                value_bytes = bytes.fromhex(value)
-            else:
-                value_bytes = await self._get_bytes_from_value(value)
-
-            await self._data_source.erd_publish(
-                self._device_name,
-                self._erd,
-                await self.set_field_bytes(erd_value, value_bytes),
-            )
-
-    @property
-    def native_value(self) -> str | None:
-        """Return value of the text."""
-        if self._field_bytes is None:
-            return None
         if self._is_raw_bytes:
-            return self._field_bytes.hex()
+            value_bytes = bytes.fromhex(value)
+        else:
+            value_bytes = await self._get_bytes_from_value(value)
 
-        return self._field_bytes.decode()
+        await self.write_patch(
+            self.field_patch(lambda _: value_bytes), "_attr_native_value", value
+        )
@@ -7,18 +7,17 @@ from typing import Any
 from homeassistant.components.time import TimeEntity, const as time_const
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     ATTR_ENABLED,
-    ATTR_UNIQUE_ID,
     GEA_ENTITY_NEW,
     SERVICE_ENABLE_OR_DISABLE_BASE,
     SERVICE_ENABLE_OR_DISABLE_SCHEMA,
 )
-from .entity import GeaEntity
+from .entity import GeaEntity, async_register_indexed_service, timed_discover
 from .models import GeaTimeConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,17 +29,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up GE Appliances time input dynamically through discovery."""
-    platform = entity_platform.async_get_current_platform()
     SERVICE_ENABLE_OR_DISABLE = SERVICE_ENABLE_OR_DISABLE_BASE + "_time"
 
     async def handle_service_call(entity: GeaTime, service_call: ServiceCall) -> None:
-        if entity.unique_id == service_call.data[ATTR_UNIQUE_ID]:
-            if service_call.service == SERVICE_ENABLE_OR_DISABLE:
-                await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
+        if service_call.service == SERVICE_ENABLE_OR_DISABLE:
+            await entity.enable_or_disable(service_call.data[ATTR_ENABLED])
 
-    platform.async_register_entity_service(
+    async_register_indexed_service(
+        hass,
         SERVICE_ENABLE_OR_DISABLE,
         SERVICE_ENABLE_OR_DISABLE_SCHEMA,
+        GeaTime,
         handle_service_call,
     )
 
@@ -62,7 +61,7 @@ async def async_setup_entry(
     async_dispatcher_connect(
         hass,
         GEA_ENTITY_NEW.format(time_const.DOMAIN),
-        async_discover,
+        timed_discover(hass, time_const.DOMAIN, async_discover),
     )
 
 
@@ -75,7 +74,6 @@ class GeaTime(TimeEntity, GeaEntity):
         self._attr_has_entity_name = True
         self._attr_name = config.name
         self._attr_should_poll = False
-        self._field_bytes: bytes | None = None
         self._erd = config.erd
         self._status_erd = config.status_erd or config.erd
         self._device_name = config.device_name
@@ -102,10 +100,12 @@ class GeaTime(TimeEntity, GeaEntity):
         await self._data_source.erd_subscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
+        await self._data_source.add_entity(self._attr_unique_id, self)
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from the ERD."""
+        """Unsubscribe from the ERD and remove the entity from the unique ID index."""
+        await self._data_source.remove_entity(self._attr_unique_id)
         await self._data_source.erd_unsubscribe(
             self._device_name, self._status_erd, self.erd_updated
         )
@@ -113,12 +113,24 @@ class GeaTime(TimeEntity, GeaEntity):
     @callback
     async def erd_updated(self, value: bytes | None) -> None:
         """Update state from ERD."""
+        if self.awaiting_confirmation and value is not None:
+            return
+
         if value is None:
-            self._field_bytes = None
+            self._attr_native_value = None
         else:
-            self._field_bytes = await self.get_field_bytes(value)
-
-        self.async_schedule_update_ha_state(True)
+            field_bytes = await self.get_field_bytes(value)
+            try:
+                self._attr_native_value = time(
+                    field_bytes[0], field_bytes[1], field_bytes[2]
+                )
+            except ValueError:
+                _LOGGER.warning(
+                    "%s has an invalid time %s", self.entity_id, field_bytes.hex()
+                )
+                self._attr_native_value = None
+
+        self.async_write_ha_state()
 
     async def _get_bytes_from_value(self, value: time) -> bytes:
         """Cast the time to bytes."""
@@ -132,23 +144,7 @@ class GeaTime(TimeEntity, GeaEntity):
             )  # Force update to wipe out user input
             return
 
-        erd_value = await self._data_source.erd_read(self._device_name, self._erd)
-        if erd_value is not None:
-            value_bytes = await self._get_bytes_from_value(value)
-            await self._data_source.erd_publish(
-                self._device_name,
-                self._erd,
-                await self.set_field_bytes(erd_value, value_bytes),
-            )
-
-    @property
-    def native_value(self) -> time | None:
-        """Return value of the time."""
-        if self._field_bytes is None:
-            return None
-
-        hour = int.from_bytes(self._field_bytes[0:1])
-        minute = int.from_bytes(self._field_bytes[1:2])
-        second = int.from_bytes(self._field_bytes[2:3])
-
-        return time(hour, minute, second)
+        value_bytes = await self._get_bytes_from_value(value)
+        await self.write_patch(
+            self.field_patch(lambda _: value_bytes), "_attr_native_value", value
+        )
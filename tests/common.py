@@ -3,7 +3,15 @@
 import json
 from unittest.mock import patch
 
-from custom_components.geappliances.const import DISCOVERY, DOMAIN, Erd
+from custom_components.geappliances.const import (
+    CONF_OPTIMISTIC,
+    CONF_PAYLOAD_ENCODING,
+    CONF_WRITE_TIMEOUT,
+    DISCOVERY,
+    DOMAIN,
+    PAYLOAD_ENCODING_BINARY,
+    Erd,
+)
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
     async_fire_mqtt_message,
@@ -56,6 +64,24 @@ async def given_integration_is_initialized(
         given_the_special_erd_map_is({}, hass)
 
 
+async def given_writes_are_optimistic(timeout: float, hass: HomeAssistant) -> None:
+    """Show written values until the device confirms them or the timeout passes."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_OPTIMISTIC: True, CONF_WRITE_TIMEOUT: timeout}
+    )
+    await hass.async_block_till_done()
+
+
+async def given_payloads_are_binary(hass: HomeAssistant) -> None:
+    """Carry ERD values as raw bytes instead of hex strings."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_PAYLOAD_ENCODING: PAYLOAD_ENCODING_BINARY}
+    )
+    await hass.async_block_till_done()
+
+
 def given_the_appliance_api_is(appliance_api: str, hass: HomeAssistant) -> None:
     """Set the appliance API for the integration."""
     hass.data[DOMAIN][DISCOVERY]._data_source._appliance_api = json.loads(appliance_api)
@@ -93,6 +119,14 @@ async def when_the_erd_is_set_to(erd: Erd, state: str, hass: HomeAssistant) -> N
     await given_the_erd_is_set_to(erd, state, hass)
 
 
+async def when_the_erd_is_set_to_bytes(
+    erd: Erd, value: bytes, hass: HomeAssistant
+) -> None:
+    """Fire MQTT message with a raw binary payload."""
+    async_fire_mqtt_message(hass, ERD_VALUE_TOPIC.format(f"{erd:#06x}"), value)
+    await hass.async_block_till_done()
+
+
 def the_mqtt_topic_value_should_be(
     erd: Erd, state: str, mqtt_mock: MqttMockHAClient
 ) -> None:
@@ -102,6 +136,15 @@ def the_mqtt_topic_value_should_be(
     )
 
 
+def the_mqtt_topic_bytes_should_be(
+    erd: Erd, value: bytes, mqtt_mock: MqttMockHAClient
+) -> None:
+    """Check the ERD was published to MQTT as a raw binary payload."""
+    mqtt_mock.async_publish.assert_called_with(
+        ERD_WRITE_TOPIC.format(f"{erd:#06x}"), value, 0, False
+    )
+
+
 def mqtt_client_should_not_publish(mqtt_client_mock: MqttMockHAClient) -> None:
     """Assert MQTT has not published anything."""
     mqtt_client_mock.async_publish.assert_not_called()
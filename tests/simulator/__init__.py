@@ -0,0 +1 @@
+"""Simulator for fleets of GE Appliances built from the integration's appliance API catalog."""
@@ -0,0 +1,177 @@
+"""Virtual appliance publishing the ERDs of a randomly chosen appliance API."""
+
+import random
+import string
+
+from custom_components.geappliances.codec import FieldLayout
+from custom_components.geappliances.const import (
+    COMMON_APPLIANCE_API_ERD,
+    FEATURE_API_ERD_HIGH_END,
+    FEATURE_API_ERD_HIGH_START,
+    FEATURE_API_ERD_LOW_END,
+    FEATURE_API_ERD_LOW_START,
+    Erd,
+)
+
+from .catalog import PERIODIC, STATIC, Catalog
+
+FEATURE_API_ERDS = [
+    *range(FEATURE_API_ERD_LOW_START, FEATURE_API_ERD_LOW_END + 1),
+    *range(FEATURE_API_ERD_HIGH_START, FEATURE_API_ERD_HIGH_END + 1),
+]
+DEFAULT_EVENT_PERIOD = 300.0
+# Small enough to be a valid hour, minute or second
+MAX_NUMBER = 24
+
+
+def api_erds(api: dict) -> set[Erd]:
+    """Return every ERD an appliance API version can require, whichever features are enabled."""
+    return {
+        int(erd["erd"], base=16)
+        for erds in [
+            api["required"],
+            *(feature["required"] for feature in api["features"]),
+        ]
+        for erd in erds
+    }
+
+
+class VirtualAppliance:
+    """Class to stand in for an appliance built from the catalog.
+
+    The appliance picks a common appliance API version, up to three feature appliance APIs and a random set of features from each,
+    then publishes a value for every ERD those APIs require. The feature appliance APIs can be given as (type, version) pairs instead,
+    and every feature can be enabled.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        catalog: Catalog,
+        rng: random.Random,
+        max_feature_apis: int = 3,
+        event_period: float = DEFAULT_EVENT_PERIOD,
+        feature_apis: list[tuple[str, str]] | None = None,
+        all_features: bool = False,
+    ) -> None:
+        """Initialize the appliance, choosing its APIs and initial values."""
+        self.name = name
+        self._catalog = catalog
+        self._rng = rng
+        self._event_period = event_period
+        self._all_features = all_features
+        self.manifest: dict[Erd, bytes] = {}
+        self.values: dict[Erd, bytes] = {}
+        self._lengths: dict[Erd, int] = {}
+
+        common_versions = catalog.appliance_api["common"]["versions"]
+        version = rng.choice(list(common_versions))
+        self._add_api(COMMON_APPLIANCE_API_ERD, None, version, common_versions[version])
+
+        catalog_feature_apis = catalog.appliance_api["featureApis"]
+        if feature_apis is None:
+            feature_apis = self._choose_feature_apis(
+                max_feature_apis, api_erds(common_versions[version])
+            )
+        for erd, (feature_type, version) in zip(
+            FEATURE_API_ERDS, feature_apis, strict=False
+        ):
+            self._add_api(
+                erd,
+                feature_type,
+                version,
+                catalog_feature_apis[feature_type]["versions"][version],
+            )
+
+        for erd in self._lengths:
+            self.values[erd] = self.random_value(erd)
+
+    def _choose_feature_apis(
+        self, max_feature_apis: int, used: set[Erd]
+    ) -> list[tuple[str, str]]:
+        """Pick feature appliance API versions that share no ERDs with each other or the given ERDs, as a real appliance's would not."""
+        catalog_feature_apis = self._catalog.appliance_api["featureApis"]
+        count = self._rng.randint(1, min(max_feature_apis, len(FEATURE_API_ERDS)))
+        chosen: list[tuple[str, str]] = []
+        for feature_type in self._rng.sample(
+            list(catalog_feature_apis), k=len(catalog_feature_apis)
+        ):
+            versions = catalog_feature_apis[feature_type]["versions"]
+            version = self._rng.choice(list(versions))
+            if not (erds := api_erds(versions[version])) & used:
+                used = used | erds
+                chosen.append((feature_type, version))
+                if len(chosen) == count:
+                    break
+
+        return chosen
+
+    def _add_api(
+        self, erd: Erd, feature_type: str | None, version: str, api: dict
+    ) -> None:
+        """Enable a random set of the API's features and record its manifest and ERDs."""
+        mask = 0
+        erds = list(api["required"])
+        for feature in api["features"]:
+            if self._all_features or mask == 0 or self._rng.random() < 0.5:
+                mask |= int(feature["mask"], base=16)
+                erds.extend(feature["required"])
+
+        if feature_type is None:
+            self.manifest[erd] = int(version).to_bytes(4) + mask.to_bytes(4)
+        else:
+            self.manifest[erd] = (
+                int(feature_type).to_bytes(2)
+                + int(version).to_bytes(2)
+                + mask.to_bytes(4)
+            )
+
+        for api_erd in erds:
+            self._lengths[int(api_erd["erd"], base=16)] = api_erd["length"]
+
+    def random_value(self, erd: Erd) -> bytes:
+        """Return a value for the ERD with every field set to something its definition allows."""
+        payload = bytes(self._lengths[erd])
+        for erd_field in self._catalog.fields.get(erd, []):
+            layout = FieldLayout.from_field(erd_field)
+            payload = layout.encode(payload, self._random_field(erd_field, layout))
+
+        return payload[: self._lengths[erd]].ljust(self._lengths[erd], b"\0")
+
+    def _random_field(self, erd_field: dict, layout: FieldLayout) -> int | bytes:
+        """Return a random value for a field, keeping numbers small so they stay plausible."""
+        if erd_field["type"] == "enum":
+            return int(self._rng.choice(list(erd_field["values"])))
+        if erd_field["type"] == "string":
+            return "".join(
+                self._rng.choices(string.ascii_uppercase, k=layout.size)
+            ).encode()
+        if not layout.integer:
+            return self._rng.randbytes(layout.size)
+        if erd_field["type"] == "bool" or layout.bit_size == 1:
+            return self._rng.randrange(2)
+        if layout.bit_size:
+            return self._rng.randrange(min(MAX_NUMBER, 1 << layout.bit_size))
+        return self._rng.randrange(MAX_NUMBER)
+
+    def next_update(self, erd: Erd) -> float | None:
+        """Return the seconds until the ERD next changes, or None if it never changes."""
+        update_class = self._catalog.update_class(erd)
+        if update_class.type == STATIC:
+            return None
+        if update_class.type == PERIODIC and update_class.period:
+            return update_class.period
+        return self._rng.expovariate(1 / self._event_period)
+
+    def update(self, erd: Erd) -> bytes:
+        """Change the ERD to a new value and return it."""
+        self.values[erd] = self.random_value(erd)
+        return self.values[erd]
+
+    def write(self, erd: Erd, value: bytes) -> bool:
+        """Store a value written to the ERD, returning false if the appliance does not have the ERD."""
+        if erd not in self.values:
+            return False
+
+        self.values[erd] = value
+        return True
@@ -0,0 +1,79 @@
+"""Appliance API catalog the simulated appliances are built from."""
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+
+from custom_components.geappliances.const import Erd
+
+APPLIANCE_API_DIR = (
+    Path(__file__).parent.parent.parent
+    / "custom_components"
+    / "geappliances"
+    / "appliance_api"
+)
+
+STATIC = "static"
+PERIODIC = "periodic"
+EVENT = "event"
+
+
+@dataclass(frozen=True)
+class UpdateClass:
+    """How often a device publishes an ERD."""
+
+    type: str
+    period: float | None = None
+
+
+@dataclass
+class Catalog:
+    """The appliance API and ERD definitions shipped with the integration."""
+
+    appliance_api: dict[str, Any]
+    erd_defs: list[dict[str, Any]]
+    update_classes: dict[Erd, UpdateClass] = field(init=False)
+    fields: dict[Erd, list[dict[str, Any]]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Index the fields of each defined ERD and how often it is published."""
+        self.update_classes = {}
+        self.fields = {}
+        for erd_def in self.erd_defs:
+            erd = int(erd_def["id"], base=16)
+            self.fields[erd] = erd_def["data"]
+            update_class = erd_def.get("updateClass", {})
+            period = update_class.get("periodInMsec")
+            self.update_classes[erd] = UpdateClass(
+                update_class.get("type", EVENT),
+                period / 1000 if period is not None else None,
+            )
+
+    @classmethod
+    def load(cls) -> "Catalog":
+        """Load the catalog shipped with the integration."""
+        with (APPLIANCE_API_DIR / "appliance_api.json").open(
+            encoding="utf-8"
+        ) as appliance_api:
+            api = json.load(appliance_api)
+        with (APPLIANCE_API_DIR / "appliance_api_erd_definitions.json").open(
+            encoding="utf-8"
+        ) as erd_defs:
+            defs = json.load(erd_defs)["erds"]
+
+        return cls(api, defs)
+
+    @property
+    def appliance_api_json(self) -> str:
+        """Return the appliance API as the integration reads it."""
+        return json.dumps(self.appliance_api)
+
+    @property
+    def erd_defs_json(self) -> str:
+        """Return the ERD definitions as the integration reads them."""
+        return json.dumps({"erds": self.erd_defs})
+
+    def update_class(self, erd: Erd) -> UpdateClass:
+        """Return how often a device publishes the ERD, treating ERDs without a definition as changing on events."""
+        return self.update_classes.get(erd, UpdateClass(EVENT))
@@ -0,0 +1,128 @@
+"""Fleet of virtual appliances publishing over MQTT."""
+
+from collections import defaultdict
+from collections.abc import Callable
+import heapq
+import random
+
+from custom_components.geappliances.const import Erd
+from custom_components.geappliances.ha_compatibility.mqtt_client import encode_erd_batch
+
+from .appliance import DEFAULT_EVENT_PERIOD, VirtualAppliance
+from .catalog import Catalog
+
+TOPIC_PREFIX = "geappliances"
+WRITE_TOPIC = f"{TOPIC_PREFIX}/+/erd/+/write"
+DEFAULT_HEARTBEAT_PERIOD = 60.0
+# Scheduled in place of an ERD so heartbeats sort alongside ERD changes
+HEARTBEAT = -1
+
+type Publish = Callable[[str, str | bytes], None]
+
+
+class Fleet:
+    """Class to run many virtual appliances on a shared simulated clock.
+
+    Every ERD change and heartbeat is kept in a single schedule, so advancing the clock only touches the appliances with something due.
+    """
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        count: int,
+        publish: Publish,
+        seed: int = 0,
+        binary: bool = False,
+        batch: bool = False,
+        event_period: float = DEFAULT_EVENT_PERIOD,
+        heartbeat_period: float | None = DEFAULT_HEARTBEAT_PERIOD,
+    ) -> None:
+        """Initialize the fleet.
+
+        Values are published as hex strings unless binary is set, and each appliance's changes are published together on its erds topic if batch is set.
+        """
+        rng = random.Random(seed)
+        self.appliances = {
+            name: VirtualAppliance(name, catalog, rng, event_period=event_period)
+            for name in (f"sim-{index:04d}" for index in range(count))
+        }
+        self.time = 0.0
+        self.published = 0
+        self._publish = publish
+        self._binary = binary
+        self._batch = batch
+        self._heartbeat_period = heartbeat_period
+        self._schedule: list[tuple[float, str, Erd]] = []
+
+    def start(self) -> None:
+        """Bring every appliance online."""
+        for name in self.appliances:
+            self.start_appliance(name)
+
+    def start_appliance(self, name: str) -> None:
+        """Publish the appliance's manifests and then its initial values, and schedule its updates."""
+        appliance = self.appliances[name]
+        self._publish_erds(name, list(appliance.manifest.items()))
+        self._publish_erds(name, list(appliance.values.items()))
+
+        for erd in appliance.values:
+            self._schedule_update(appliance, erd)
+        if self._heartbeat_period is not None:
+            self._publish_heartbeat(name)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward, publishing every change and heartbeat that comes due."""
+        end = self.time + seconds
+        changes: dict[str, list[tuple[Erd, bytes]]] = defaultdict(list)
+
+        while self._schedule and self._schedule[0][0] <= end:
+            self.time, name, erd = heapq.heappop(self._schedule)
+            if erd == HEARTBEAT:
+                self._publish_heartbeat(name)
+                continue
+
+            appliance = self.appliances[name]
+            changes[name].append((erd, appliance.update(erd)))
+            self._schedule_update(appliance, erd)
+
+        self.time = end
+        for name, erds in changes.items():
+            self._publish_erds(name, erds)
+
+    def handle_write(self, topic: str, payload: str | bytes) -> None:
+        """Store a value written by the integration and echo it back as the ERD's new value."""
+        _, name, _, erd, _ = topic.split("/")
+        if isinstance(payload, str):
+            payload = bytes.fromhex(payload)
+
+        if (appliance := self.appliances.get(name)) is not None and appliance.write(
+            int(erd, base=16), payload
+        ):
+            self._publish_erds(name, [(int(erd, base=16), payload)])
+
+    def _schedule_update(self, appliance: VirtualAppliance, erd: Erd) -> None:
+        """Add the ERD's next change to the schedule if it changes at all."""
+        if (delay := appliance.next_update(erd)) is not None:
+            heapq.heappush(self._schedule, (self.time + delay, appliance.name, erd))
+
+    def _publish_heartbeat(self, name: str) -> None:
+        """Publish the appliance's uptime and schedule its next heartbeat."""
+        self._send(f"{TOPIC_PREFIX}/{name}/uptime", int(self.time).to_bytes(4))
+        if self._heartbeat_period is not None:
+            heapq.heappush(
+                self._schedule, (self.time + self._heartbeat_period, name, HEARTBEAT)
+            )
+
+    def _publish_erds(self, name: str, erds: list[tuple[Erd, bytes]]) -> None:
+        """Publish ERD values one topic at a time or as a single batch."""
+        if self._batch and erds:
+            self._send(f"{TOPIC_PREFIX}/{name}/erds", encode_erd_batch(erds))
+            return
+
+        for erd, value in erds:
+            self._send(f"{TOPIC_PREFIX}/{name}/erd/{erd:#06x}/value", value)
+
+    def _send(self, topic: str, value: bytes) -> None:
+        """Publish a payload in the fleet's encoding."""
+        self.published += 1
+        self._publish(topic, value if self._binary else value.hex())
@@ -0,0 +1,43 @@
+"""Replay of recorded MQTT sessions into Home Assistant's MQTT test harness."""
+
+import asyncio
+from itertools import groupby
+import time
+
+from custom_components.geappliances.const import DOMAIN
+from custom_components.geappliances.ha_compatibility.recorder import RecordedMessage
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+
+async def async_replay(
+    hass: HomeAssistant, messages: list[RecordedMessage], realtime: bool = False
+) -> float:
+    """Fire the recorded messages into the harness and return the seconds until the integration has handled them all.
+
+    Messages recorded at the same moment are fired together and handled before the next moment is replayed, so replays are deterministic.
+    If realtime is set each moment is replayed at its recorded time, otherwise as soon as the last one has been handled.
+    """
+    start = time.perf_counter()
+    for seconds, moment in groupby(messages, key=lambda message: message.seconds):
+        if realtime and (delay := seconds - (time.perf_counter() - start)) > 0:
+            await asyncio.sleep(delay)
+
+        for message in moment:
+            async_fire_mqtt_message(hass, message.topic, message.payload)
+        await hass.async_block_till_done()
+
+    return time.perf_counter() - start
+
+
+def entity_states(hass: HomeAssistant) -> dict[str, str]:
+    """Return the state of every entity the integration created for an appliance, leaving out its diagnostic counters."""
+    return {
+        entry.entity_id: state.state
+        for entry in er.async_get(hass).entities.values()
+        if entry.platform == DOMAIN
+        and entry.entity_category is None
+        and (state := hass.states.get(entry.entity_id)) is not None
+    }
@@ -0,0 +1,71 @@
+"""Transports connecting a simulated fleet to the integration."""
+
+from collections.abc import Callable
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from .fleet import Fleet
+
+type Subscriber = Callable[[str, str | bytes], None]
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Return true if the topic matches an MQTT subscription pattern with + and # wildcards."""
+    pattern_levels = pattern.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(pattern_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels) or level not in ("+", topic_levels[index]):
+            return False
+
+    return len(pattern_levels) == len(topic_levels)
+
+
+class LocalBroker:
+    """Class to stand in for an MQTT broker, delivering each message to matching subscribers as it is published."""
+
+    def __init__(self) -> None:
+        """Initialize the broker."""
+        self._subscribers: list[tuple[str, Subscriber]] = []
+        self.delivered = 0
+
+    def subscribe(self, pattern: str, subscriber: Subscriber) -> None:
+        """Deliver messages on topics matching the pattern to the subscriber."""
+        self._subscribers.append((pattern, subscriber))
+
+    def publish(self, topic: str, payload: str | bytes) -> None:
+        """Deliver the message to every matching subscriber."""
+        for pattern, subscriber in self._subscribers:
+            if topic_matches(pattern, topic):
+                self.delivered += 1
+                subscriber(topic, payload)
+
+
+class HassTransport:
+    """Class to connect a fleet to Home Assistant's MQTT test harness.
+
+    Messages from the fleet are fired into the harness and the integration's writes are passed to the fleet, which echoes them back.
+    """
+
+    def __init__(self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+        """Initialize the transport."""
+        self._hass = hass
+        self._mqtt_mock = mqtt_mock
+
+    def publish(self, topic: str, payload: str | bytes) -> None:
+        """Fire a message from the fleet into the harness."""
+        async_fire_mqtt_message(self._hass, topic, payload)
+
+    def connect(self, fleet: Fleet) -> None:
+        """Pass every write the integration publishes to the fleet."""
+
+        async def handle_publish(topic: str, payload: Any, *args: Any) -> None:
+            if topic.endswith("/write"):
+                fleet.handle_write(topic, payload)
+
+        self._mqtt_mock.async_publish.side_effect = handle_publish
@@ -43,7 +43,8 @@ APPLIANCE_API_JSON = """
                 "1": {
                     "required": [
                         { "erd": "0x0002", "name": "Multi Field Test", "length": 2 },
-                        { "erd": "0x0004", "name": "Bitfield Test", "length": 1 }
+                        { "erd": "0x0004", "name": "Bitfield Test", "length": 1 },
+                        { "erd": "0x0005", "name": "Offset Bitfield Test", "length": 2 }
                     ],
                     "features": []
                 }
@@ -136,6 +137,29 @@ APPLIANCE_API_DEFINTION_JSON = """
                     "size": 1
                 }
             ]
+        },
+        {
+            "name": "Offset Bitfield Test",
+            "id": "0x0005",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Count",
+                    "type": "u8",
+                    "offset": 0,
+                    "size": 1
+                },
+                {
+                    "name": "Flag",
+                    "type": "bool",
+                    "bits": {
+                        "offset": 2,
+                        "size": 1
+                    },
+                    "offset": 1,
+                    "size": 1
+                }
+            ]
         }
     ]
 }"""
@@ -207,6 +231,20 @@ class TestBinarySensor:
             "binary_sensor.bitfield_test_bit_two", STATE_OFF, hass
         )
 
+    async def test_works_with_bitfields_after_the_first_byte(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test binary sensor reads bits relative to their field rather than the start of the ERD."""
+        await when_the_erd_is_set_to(0x0005, "0004", hass)
+        the_binary_sensor_state_should_be(
+            "binary_sensor.offset_bitfield_test_flag", STATE_ON, hass
+        )
+
+        await when_the_erd_is_set_to(0x0005, "FF00", hass)
+        the_binary_sensor_state_should_be(
+            "binary_sensor.offset_bitfield_test_flag", STATE_OFF, hass
+        )
+
     async def test_shows_unknown_when_unsupported(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None:
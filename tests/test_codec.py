@@ -0,0 +1,128 @@
+"""Test GE Appliances ERD codecs."""
+
+from typing import Any
+
+from custom_components.geappliances.codec import ErdCodec, FieldLayout
+import pytest
+
+MULTI_FIELD_ERD_DEF: dict[str, Any] = {
+    "name": "Multi Field Test",
+    "id": "0x0001",
+    "operations": ["read"],
+    "data": [
+        {"name": "Unsigned", "type": "u16", "offset": 0, "size": 2},
+        {"name": "Signed", "type": "i16", "offset": 2, "size": 2},
+        {"name": "Enum", "type": "enum", "offset": 4, "size": 1, "values": {}},
+        {
+            "name": "Low Bits",
+            "type": "u8",
+            "bits": {"offset": 0, "size": 4},
+            "offset": 5,
+            "size": 1,
+        },
+        {
+            "name": "High Bits",
+            "type": "u8",
+            "bits": {"offset": 4, "size": 4},
+            "offset": 5,
+            "size": 1,
+        },
+        {"name": "Odd Size", "type": "u32", "offset": 6, "size": 3},
+        {"name": "Text", "type": "string", "offset": 9, "size": 2},
+    ],
+}
+
+
+def given_a_codec_for(erd_def: dict[str, Any]) -> ErdCodec:
+    """Compile a codec for the ERD definition."""
+    return ErdCodec.from_erd_def(erd_def)
+
+
+def the_decoded_values_should_be(
+    payload: str, expected: tuple[Any, ...], codec: ErdCodec
+) -> None:
+    """Assert the payload decodes to the expected values."""
+    assert codec.decode(bytes.fromhex(payload)) == expected
+
+
+def the_field_should_be_at_index(
+    layout: FieldLayout, index: int | None, codec: ErdCodec
+) -> None:
+    """Assert the layout is found at the given index of the decoded tuple."""
+    assert codec.index(layout) == index
+
+
+def the_encoded_value_should_be(
+    payload: str, values: dict[int, Any], expected: str, codec: ErdCodec
+) -> None:
+    """Assert setting the fields of the payload gives the expected payload."""
+    assert codec.encode(bytes.fromhex(payload), values) == bytes.fromhex(expected)
+
+
+class TestErdCodec:
+    """Hold ERD codec tests."""
+
+    def test_decodes_all_fields_in_one_pass(self) -> None:
+        """Test the codec decodes every field of the ERD in definition order."""
+        codec = given_a_codec_for(MULTI_FIELD_ERD_DEF)
+
+        the_decoded_values_should_be(
+            "0102 FFFE 03 A5 010203 6869",
+            (0x0102, -2, 3, 0x5, 0xA, 0x010203, b"hi"),
+            codec,
+        )
+
+    def test_reads_bits_relative_to_their_field(self) -> None:
+        """Test bitfields after the first byte are read relative to the field rather than the ERD."""
+        codec = given_a_codec_for(MULTI_FIELD_ERD_DEF)
+
+        the_decoded_values_should_be(
+            "0000 0000 00 F0 000000 0000",
+            (0, 0, 0, 0, 0xF, 0, b"\x00\x00"),
+            codec,
+        )
+
+    def test_decodes_short_payloads(self) -> None:
+        """Test the codec decodes what is present when the payload is shorter than the definition."""
+        codec = given_a_codec_for(MULTI_FIELD_ERD_DEF)
+
+        the_decoded_values_should_be("0102 FFFE", (0x0102, -2, 0, 0, 0, 0, b""), codec)
+
+    def test_locates_fields_by_position(self) -> None:
+        """Test the codec finds the index of a field from its position in the payload, whatever its type."""
+        codec = given_a_codec_for(MULTI_FIELD_ERD_DEF)
+
+        the_field_should_be_at_index(FieldLayout(2, 2, signed=True), 1, codec)
+        the_field_should_be_at_index(FieldLayout(2, 2), 1, codec)
+        the_field_should_be_at_index(
+            FieldLayout(5, 1, bit_offset=4, bit_size=4), 4, codec
+        )
+        the_field_should_be_at_index(
+            FieldLayout(5, 1, bit_offset=2, bit_size=4), None, codec
+        )
+        the_field_should_be_at_index(FieldLayout(3, 1), None, codec)
+
+    def test_decodes_without_compiled_codec(self) -> None:
+        """Test a layout decodes its own field from a payload."""
+        assert FieldLayout(1, 1, bit_offset=1, bit_size=2).decode(b"\x00\x06") == 3
+        assert FieldLayout(0, 2, integer=False).decode(b"ab") == b"ab"
+
+    def test_encodes_fields_into_payload(self) -> None:
+        """Test the codec sets fields, including bits, without touching the rest of the payload."""
+        codec = given_a_codec_for(MULTI_FIELD_ERD_DEF)
+
+        the_encoded_value_should_be(
+            "0000 0000 00 A5 000000 0000",
+            {1: -2, 4: 0x3, 6: b"h"},
+            "0000 FFFE 00 35 000000 6800",
+            codec,
+        )
+
+    def test_rejects_values_that_do_not_fit(self) -> None:
+        """Test a layout refuses to encode a value that does not fit its field."""
+        with pytest.raises(ValueError):
+            FieldLayout(0, 1).encode(b"\x00", 256)
+        with pytest.raises(ValueError):
+            FieldLayout(0, 1, bit_offset=4, bit_size=4).encode(b"\x00", 16)
+        with pytest.raises(ValueError):
+            FieldLayout(0, 1, integer=False).encode(b"\x00", b"ab")
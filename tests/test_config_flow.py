@@ -1,10 +1,25 @@
 """Test GE Appliances configuration flow."""
 
+from typing import Any
+
+from custom_components.geappliances.const import (
+    CONF_COUNTER_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_PAYLOAD_ENCODING,
+    CONF_STALL_THRESHOLD,
+    CONF_WRITE_QOS,
+    CONF_WRITE_RETRIES,
+    CONF_WRITE_TIMEOUT,
+    CONF_WRITE_WINDOW,
+)
+
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from .common import config_entry_stub
+
 
 async def when_the_user_starts_config_flow(
     hass: HomeAssistant,
@@ -43,6 +58,27 @@ def the_entry_should_be_created(result: ConfigFlowResult) -> None:
         assert data["type"] == "user"
 
 
+async def when_the_user_sets_the_options(
+    hass: HomeAssistant, entry: ConfigEntry, options: dict[str, Any]
+) -> ConfigFlowResult:
+    """Open the options flow and submit the given options."""
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("step_id") == "init"
+
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=options
+    )
+
+
+def the_options_should_be(
+    entry: ConfigEntry, options: dict[str, Any], result: ConfigFlowResult
+) -> None:
+    """Assert the options were saved to the entry."""
+    assert result.get("type") is FlowResultType.CREATE_ENTRY
+    assert dict(entry.options) == options
+
+
 class TestConfigFlow:
     """Hold config flow tests."""
 
@@ -53,3 +89,21 @@ class TestConfigFlow:
 
         result = await when_the_user_confirms(hass, result)
         the_entry_should_be_created(result)
+
+    async def test_sets_write_options(self, hass: HomeAssistant) -> None:
+        """Test the options flow saves the write options."""
+        entry = config_entry_stub()
+        entry.add_to_hass(hass)
+        options = {
+            CONF_WRITE_QOS: 1,
+            CONF_WRITE_RETRIES: 3,
+            CONF_WRITE_TIMEOUT: 5.0,
+            CONF_WRITE_WINDOW: 100.0,
+            CONF_OPTIMISTIC: True,
+            CONF_PAYLOAD_ENCODING: "binary",
+            CONF_COUNTER_INTERVAL: 30.0,
+            CONF_STALL_THRESHOLD: 50.0,
+        }
+
+        result = await when_the_user_sets_the_options(hass, entry, options)
+        the_options_should_be(entry, options, result)
@@ -0,0 +1,208 @@
+"""Test GE Appliances performance counter sensors."""
+
+from datetime import timedelta
+
+from custom_components.geappliances.const import (
+    CONF_COUNTER_INTERVAL,
+    DEFAULT_COUNTER_INTERVAL,
+    DOMAIN,
+    MQTT_CLIENT,
+)
+from custom_components.geappliances.ha_compatibility.counters import (
+    LatencyHistogram,
+    latency_percentile,
+)
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+    when_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Test", "length": 1 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Test",
+            "id": "0x0001",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Test",
+                    "type": "u8",
+                    "offset": 0,
+                    "size": 1
+                }
+            ]
+        }
+    ]
+}"""
+
+
+@pytest.fixture(autouse=True)
+async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Set up for all tests."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0001, "07", hass)
+
+
+async def given_the_counter_interval_is(seconds: float, hass: HomeAssistant) -> None:
+    """Refresh the counter sensors on the given interval."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_COUNTER_INTERVAL: seconds}
+    )
+    await hass.async_block_till_done()
+
+
+async def when_a_bad_value_is_received(hass: HomeAssistant) -> None:
+    """Fire an ERD value that is not hex."""
+    async_fire_mqtt_message(hass, "geappliances/test/erd/0x0001/value", "zz")
+    await hass.async_block_till_done()
+
+
+async def when_a_publish_fails(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+) -> None:
+    """Publish a write to the device while the MQTT integration cannot publish."""
+    mqtt_mock.async_publish.side_effect = HomeAssistantError
+    await hass.data[DOMAIN][MQTT_CLIENT].publish_erd("test", 0x0001, b"\x01")
+
+
+async def when_the_interval_passes(seconds: float, hass: HomeAssistant) -> None:
+    """Move time forward by the interval."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+def the_counter_should_be(name: str, state: str, hass: HomeAssistant) -> None:
+    """Assert the state of the counter sensor."""
+    if (entity := hass.states.get(name)) is not None:
+        assert entity.state == state
+    else:
+        pytest.fail(f"Could not find sensor {name}")
+
+
+def the_counter_should_be_positive(name: str, hass: HomeAssistant) -> None:
+    """Assert the counter sensor shows a value above zero."""
+    if (entity := hass.states.get(name)) is not None:
+        assert float(entity.state) > 0
+    else:
+        pytest.fail(f"Could not find sensor {name}")
+
+
+def the_counter_should_be_diagnostic(name: str, hass: HomeAssistant) -> None:
+    """Assert the counter sensor is a diagnostic entity."""
+    entry = er.async_get(hass).async_get(name)
+    assert entry is not None
+    assert entry.entity_category is EntityCategory.DIAGNOSTIC
+
+
+class TestCounterSensor:
+    """Hold performance counter sensor tests."""
+
+    async def test_counts_messages_for_the_device_and_the_hub(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test the received messages are shown on the device and the hub once the interval passes."""
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+        the_counter_should_be("sensor.test_messages_received", "1", hass)
+
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+
+        the_counter_should_be("sensor.test_messages_received", "3", hass)
+        the_counter_should_be("sensor.ge_appliances_messages_received", "3", hass)
+        the_counter_should_be_diagnostic("sensor.test_messages_received", hass)
+        the_counter_should_be_diagnostic("sensor.ge_appliances_messages_received", hass)
+
+    async def test_counts_rejected_messages(self, hass: HomeAssistant) -> None:
+        """Test a value that cannot be decoded is counted as rejected and not received."""
+        await when_a_bad_value_is_received(hass)
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+
+        the_counter_should_be("sensor.test_messages_rejected", "1", hass)
+        the_counter_should_be("sensor.test_messages_received", "3", hass)
+
+    async def test_counts_publish_failures(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test a write the MQTT integration cannot publish is counted."""
+        await when_a_publish_fails(hass, mqtt_mock)
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+
+        the_counter_should_be("sensor.test_mqtt_publish_failures", "1", hass)
+        the_counter_should_be("sensor.ge_appliances_mqtt_publish_failures", "1", hass)
+
+    async def test_shows_state_writes_and_latency_over_the_interval(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test the rate of state writes and the ingest latency are worked out over the last interval."""
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+
+        the_counter_should_be_positive("sensor.test_state_writes_per_second", hass)
+        the_counter_should_be_positive("sensor.ge_appliances_ingest_latency_p99", hass)
+        the_counter_should_be("sensor.ge_appliances_overload_level", "normal", hass)
+
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+
+        the_counter_should_be("sensor.test_state_writes_per_second", "0.0", hass)
+
+    async def test_refreshes_on_the_configured_interval(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test the sensors are refreshed on the interval set in the options and not before."""
+        await given_the_counter_interval_is(300, hass)
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+
+        await when_the_interval_passes(DEFAULT_COUNTER_INTERVAL, hass)
+        the_counter_should_be("sensor.test_messages_received", "1", hass)
+
+        await when_the_interval_passes(300, hass)
+        the_counter_should_be("sensor.test_messages_received", "3", hass)
+
+    def test_latency_percentile_is_the_bucket_bound(self) -> None:
+        """Test percentiles are read from the histogram as the upper bound of their bucket."""
+        histogram = LatencyHistogram()
+        for latency in [0.0005] * 98 + [0.03, 10.0]:
+            histogram.record(latency)
+
+        assert latency_percentile(histogram.counts, 50) == 0.001
+        assert latency_percentile(histogram.counts, 99) == 0.05
+        assert latency_percentile(histogram.counts, 100) == 5.0
+        assert latency_percentile([0] * len(histogram.counts), 50) is None
@@ -1,9 +1,11 @@
 """Tests for GE Appliances data source."""
 
-from collections.abc import Callable, Generator
+import asyncio
+from collections.abc import AsyncIterator, Callable, Generator
+from contextlib import asynccontextmanager
 import json
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.geappliances.const import Erd
 from custom_components.geappliances.ha_compatibility.data_source import (
@@ -11,6 +13,11 @@ from custom_components.geappliances.ha_compatibility.data_source import (
     DataSource,
 )
 from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTClient
+from custom_components.geappliances.ha_compatibility.write_buffer import (
+    ErdPatch,
+    WriteBufferMetrics,
+)
+from custom_components.geappliances.ha_compatibility.write_pipeline import WriteOptions
 import pytest
 
 from .doubles import MqttClientMock
@@ -349,6 +356,29 @@ def must_be_called_mock() -> Generator[MagicMock]:
         called_mock.assert_called()
 
 
+def given_publishes_fail_once_and_are_recorded(
+    mqtt_client_mock: MqttClientMock,
+) -> list[str]:
+    """Fail the first publish and return the list the client's priority, publishes and retry sleeps are recorded in."""
+    events: list[str] = []
+
+    @asynccontextmanager
+    async def prioritized() -> AsyncIterator[None]:
+        events.append("hold")
+        try:
+            yield
+        finally:
+            events.append("release")
+
+    async def publish_erd(*args: Any) -> bool:
+        events.append("publish")
+        return events.count("publish") > 1
+
+    mqtt_client_mock.prioritized.side_effect = prioritized
+    mqtt_client_mock.publish_erd.side_effect = publish_erd
+    return events
+
+
 async def given_a_device_is_added(device_name: str, data_source: DataSource) -> None:
     """Add a device to the data source."""
     await data_source.add_device(device_name, f"{device_name}_01")
@@ -389,6 +419,20 @@ async def given_function_is_unsubscribed_from_erd(
     await data_source.erd_unsubscribe(device_name, erd, fn)
 
 
+async def given_entity_is_indexed(
+    unique_id: str, entity: Any, data_source: DataSource
+) -> None:
+    """Add the entity to the unique ID index."""
+    await data_source.add_entity(unique_id, entity)
+
+
+async def when_entity_is_removed_from_index(
+    unique_id: str, data_source: DataSource
+) -> None:
+    """Remove the entity from the unique ID index."""
+    await data_source.remove_entity(unique_id)
+
+
 async def when_a_device_is_added(device_name: str, data_source: DataSource) -> None:
     """Add a device to the data source."""
     await given_a_device_is_added(device_name, data_source)
@@ -565,6 +609,91 @@ def must_be_called_should_have_been_called(must_be_called_mock: MagicMock) -> No
     must_be_called_mock.assert_called()
 
 
+async def the_erd_should_decode_once_per_value(
+    erd: Erd, value: bytes, device_name: str, data_source: DataSource
+) -> None:
+    """Assert that decoding the same ERD value twice returns the same decoded tuple."""
+    decoded = await data_source.erd_decode(device_name, erd, value)
+    assert decoded is not None
+    assert await data_source.erd_decode(device_name, erd, value) is decoded
+    assert (
+        await data_source.erd_decode(device_name, erd, bytes.fromhex(value.hex()))
+        is not decoded
+    )
+
+
+async def the_indexed_entity_should_be(
+    unique_id: str, entity: Any, data_source: DataSource
+) -> None:
+    """Assert the unique ID resolves to the given entity."""
+    assert await data_source.get_entity(unique_id) is entity
+
+
+def set_byte(index: int, value: int) -> ErdPatch:
+    """Return a patch that sets a single byte of the ERD value."""
+    return lambda erd_value: (
+        erd_value[:index] + value.to_bytes() + erd_value[index + 1 :]
+    )
+
+
+async def when_the_erd_is_patched_concurrently(
+    erd: Erd, patches: list[ErdPatch], device_name: str, data_source: DataSource
+) -> None:
+    """Apply the patches to the ERD at the same time."""
+    await asyncio.gather(
+        *(data_source.erd_patch(device_name, erd, erd_patch) for erd_patch in patches)
+    )
+
+
+async def when_the_erd_is_patched_in_sequence(
+    erd: Erd, patches: list[ErdPatch], device_name: str, data_source: DataSource
+) -> None:
+    """Apply the patches to the ERD one after another."""
+    for erd_patch in patches:
+        await data_source.erd_patch(device_name, erd, erd_patch)
+
+
+def mqtt_should_publish_times(count: int, mqtt_client_mock: MqttClientMock) -> None:
+    """Assert MQTT published the given number of times."""
+    assert mqtt_client_mock.publish_erd.call_count == count
+
+
+async def the_write_metrics_should_be(
+    metrics: WriteBufferMetrics, data_source: DataSource
+) -> None:
+    """Assert the write buffer metrics match."""
+    assert await data_source.get_write_metrics() == metrics
+
+
+async def when_the_device_reports(
+    erd: Erd, value: bytes, device_name: str, data_source: DataSource
+) -> None:
+    """Receive a value for the ERD from the device."""
+    await data_source.erd_write(device_name, erd, value)
+    await data_source.confirm_write(device_name, erd, value)
+
+
+async def the_write_counts_should_be(
+    device_name: str,
+    data_source: DataSource,
+    **counts: int,
+) -> None:
+    """Assert the device's write pipeline metrics have the given counts."""
+    metrics = await data_source.get_write_pipeline_metrics(device_name)
+    assert metrics is not None
+    assert {name: getattr(metrics, name) for name in counts} == counts
+
+
+async def the_write_latency_should_be_recorded(
+    device_name: str, data_source: DataSource
+) -> None:
+    """Assert the round-trip latency of a confirmed write was recorded."""
+    metrics = await data_source.get_write_pipeline_metrics(device_name)
+    assert metrics is not None
+    assert metrics.last_latency is not None
+    assert metrics.average_latency is not None
+
+
 def fail_when_called(*args: Any, **kwargs: Any) -> None:
     """Fail the test when called."""
     pytest.fail("fail_when_called was called")
@@ -795,6 +924,175 @@ class TestDataSource:
         mqtt_should_not_publish(mqtt_client_mock)
         await the_erd_should_be(0x0001, bytes.fromhex("01"), "test", data_source)
 
+    async def test_merges_concurrent_patches_into_one_publish(
+        self, mqtt_client_mock
+    ) -> None:
+        """Test data source publishes patches to the same ERD made together as a single write."""
+        data_source = DataSource(
+            APPLIANCE_API_JSON, APPLIANCE_API_DEFINTION_JSON, mqtt_client_mock
+        )
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+        await given_erd_is_set_to(0x0001, bytes.fromhex("000000"), "test", data_source)
+        mqtt_client_mock.publish_erd.reset_mock()
+
+        await when_the_erd_is_patched_concurrently(
+            0x0001,
+            [set_byte(0, 1), set_byte(1, 2), set_byte(2, 3)],
+            "test",
+            data_source,
+        )
+        mqtt_should_publish_times(1, mqtt_client_mock)
+        mqtt_should_publish(0x0001, bytes.fromhex("010203"), "test", mqtt_client_mock)
+        await the_erd_should_be(0x0001, bytes.fromhex("010203"), "test", data_source)
+        await the_write_metrics_should_be(
+            WriteBufferMetrics(patches=3, publishes=1, merged=2), data_source
+        )
+
+    async def test_applies_sequential_patches_to_latest_value(
+        self, mqtt_client_mock
+    ) -> None:
+        """Test data source applies each patch made after the previous publish to the published value."""
+        data_source = DataSource(
+            APPLIANCE_API_JSON, APPLIANCE_API_DEFINTION_JSON, mqtt_client_mock
+        )
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+        await given_erd_is_set_to(0x0001, bytes.fromhex("0000"), "test", data_source)
+        mqtt_client_mock.publish_erd.reset_mock()
+
+        await when_the_erd_is_patched_in_sequence(
+            0x0001, [set_byte(0, 1), set_byte(1, 2)], "test", data_source
+        )
+        mqtt_should_publish_times(2, mqtt_client_mock)
+        mqtt_should_publish(0x0001, bytes.fromhex("0102"), "test", mqtt_client_mock)
+        await the_write_metrics_should_be(
+            WriteBufferMetrics(patches=2, publishes=2, merged=0), data_source
+        )
+
+    async def test_logs_patches_dropped_for_unknown_value(
+        self, data_source, mqtt_client_mock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test data source logs patches it cannot apply because the ERD has no value yet."""
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+
+        await when_the_erd_is_patched_in_sequence(
+            0x0001, [set_byte(0, 1)], "test", data_source
+        )
+        mqtt_should_publish_times(0, mqtt_client_mock)
+        assert "Dropping 1 writes to ERD 0x0001 of test" in caplog.text
+
+    async def test_confirms_write_when_status_erd_reports_value(
+        self, data_source
+    ) -> None:
+        """Test data source confirms a write once the paired status ERD reports the written value."""
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0006, "test", data_source)
+        await given_a_supported_erd_is_added(0x0007, "test", data_source)
+
+        await when_erd_is_published_with_value(
+            0x0006, bytes.fromhex("01"), "test", data_source
+        )
+        await the_write_counts_should_be("test", data_source, pending=1, confirmed=0)
+
+        await when_the_device_reports(0x0007, bytes.fromhex("00"), "test", data_source)
+        await the_write_counts_should_be("test", data_source, pending=1, confirmed=0)
+
+        await when_the_device_reports(0x0007, bytes.fromhex("01"), "test", data_source)
+        await the_write_counts_should_be("test", data_source, pending=0, confirmed=1)
+        await the_write_latency_should_be_recorded("test", data_source)
+
+    async def test_times_out_unconfirmed_write(self, mqtt_client_mock) -> None:
+        """Test data source counts a write as timed out when the device never confirms it."""
+        data_source = DataSource(
+            APPLIANCE_API_JSON,
+            APPLIANCE_API_DEFINTION_JSON,
+            mqtt_client_mock,
+            WriteOptions(timeout=0.01),
+        )
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0006, "test", data_source)
+        await given_a_supported_erd_is_added(0x0007, "test", data_source)
+
+        await when_erd_is_published_with_value(
+            0x0006, bytes.fromhex("01"), "test", data_source
+        )
+        await asyncio.sleep(0.05)
+        await the_write_counts_should_be("test", data_source, pending=0, timed_out=1)
+
+    async def test_does_not_track_writes_to_unpaired_erds(self, data_source) -> None:
+        """Test data source doesn't wait for confirmation of a write to an ERD without a status pair, since its own publish would confirm it."""
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+
+        await when_erd_is_published_with_value(
+            0x0001, bytes.fromhex("01"), "test", data_source
+        )
+        await the_write_counts_should_be("test", data_source, pending=0, confirmed=0)
+        assert await data_source.get_write_confirmation("test", 0x0001) is None
+
+    async def test_retries_failed_publish(self, mqtt_client_mock) -> None:
+        """Test data source retries a publish that fails and only writes the value once it succeeds."""
+        data_source = DataSource(
+            APPLIANCE_API_JSON,
+            APPLIANCE_API_DEFINTION_JSON,
+            mqtt_client_mock,
+            WriteOptions(retries=1, retry_delay=0),
+        )
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+
+        mqtt_client_mock.publish_erd.side_effect = [False, True]
+        await when_erd_is_published_with_value(
+            0x0001, bytes.fromhex("01"), "test", data_source
+        )
+        mqtt_should_publish_times(2, mqtt_client_mock)
+        await the_write_counts_should_be(
+            "test", data_source, published=1, retried=1, failed=0
+        )
+        await the_erd_should_be(0x0001, bytes.fromhex("01"), "test", data_source)
+
+        mqtt_client_mock.publish_erd.side_effect = None
+        mqtt_client_mock.publish_erd.return_value = False
+        await when_erd_is_published_with_value(
+            0x0001, bytes.fromhex("02"), "test", data_source
+        )
+        await the_write_counts_should_be(
+            "test", data_source, published=1, retried=2, failed=1
+        )
+        await the_erd_should_be(0x0001, bytes.fromhex("01"), "test", data_source)
+
+    async def test_holds_priority_only_while_publishing(self, mqtt_client_mock) -> None:
+        """Test data source lets telemetry through while waiting to retry a failed publish."""
+        data_source = DataSource(
+            APPLIANCE_API_JSON,
+            APPLIANCE_API_DEFINTION_JSON,
+            mqtt_client_mock,
+            WriteOptions(retries=1, retry_delay=0),
+        )
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+        events = given_publishes_fail_once_and_are_recorded(mqtt_client_mock)
+
+        with patch(
+            "custom_components.geappliances.ha_compatibility.write_pipeline.asyncio.sleep",
+            AsyncMock(side_effect=lambda delay: events.append("sleep")),
+        ):
+            await when_erd_is_published_with_value(
+                0x0001, bytes.fromhex("01"), "test", data_source
+            )
+
+        assert events == [
+            "hold",
+            "publish",
+            "release",
+            "sleep",
+            "hold",
+            "publish",
+            "release",
+        ]
+
     async def test_raises_when_publishing_nonexistent_erd(self, data_source) -> None:
         """Test data source raises error when trying to publish a nonexistent ERD."""
         await given_a_device_is_added("test", data_source)
@@ -835,6 +1133,33 @@ class TestDataSource:
         await when_erd_is_set_to(0x0001, bytes.fromhex("01"), "test", data_source)
         nothing_should_happen()
 
+    async def test_shares_decoded_erd_value(self, data_source) -> None:
+        """Test data source decodes an ERD value once and shares the result until the value changes."""
+        await given_a_device_is_added("test", data_source)
+        await given_a_supported_erd_is_added(0x0001, "test", data_source)
+        await given_erd_is_set_to(0x0001, bytes.fromhex("0100"), "test", data_source)
+
+        await the_erd_should_decode_once_per_value(
+            0x0001, await data_source.erd_read("test", 0x0001), "test", data_source
+        )
+
+    async def test_resolves_indexed_entity(self, data_source) -> None:
+        """Test data source resolves an entity from its unique ID."""
+        entity = MagicMock(device_name="test")
+        await given_entity_is_indexed("test_0001_Test", entity, data_source)
+
+        await the_indexed_entity_should_be("test_0001_Test", entity, data_source)
+        await the_indexed_entity_should_be("test_0002_Test", None, data_source)
+
+    async def test_removes_indexed_entity(self, data_source) -> None:
+        """Test data source no longer resolves an entity after it is removed."""
+        await given_entity_is_indexed(
+            "test_0001_Test", MagicMock(device_name="test"), data_source
+        )
+
+        await when_entity_is_removed_from_index("test_0001_Test", data_source)
+        await the_indexed_entity_should_be("test_0001_Test", None, data_source)
+
     async def test_get_common_appliance_api_version(self, data_source) -> None:
         """Test data source returns correct JSON for given common appliance API version."""
         await the_common_appliance_api_version_should_be(
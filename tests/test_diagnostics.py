@@ -0,0 +1,180 @@
+"""Test GE Appliances diagnostics."""
+
+import json
+from typing import Any
+
+from custom_components.geappliances.const import DOMAIN
+from custom_components.geappliances.diagnostics import (
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+)
+from .test_meta_erds import given_the_meta_erds_are_set_to
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Test", "length": 1 },
+                    { "erd": "0x0002", "name": "Serial Number", "length": 4 },
+                    { "erd": "0x0003", "name": "Test Min", "length": 1 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Test",
+            "id": "0x0001",
+            "operations": ["read"],
+            "data": [
+                { "name": "Test", "type": "u8", "offset": 0, "size": 1 }
+            ]
+        },
+        {
+            "name": "Serial Number",
+            "id": "0x0002",
+            "operations": ["read"],
+            "data": [
+                { "name": "Serial Number", "type": "string", "offset": 0, "size": 4 }
+            ]
+        },
+        {
+            "name": "Test Min",
+            "id": "0x0003",
+            "operations": ["read"],
+            "data": [
+                { "name": "Test Min", "type": "u8", "offset": 0, "size": 1 }
+            ]
+        }
+    ]
+}"""
+
+META_TABLE = """
+{
+    "common": {
+        "1": {
+            "0x0003": {
+                "Test Min": {
+                    "fields": ["{}_0004_Missing"],
+                    "func": "set_min"
+                }
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Set up for all tests."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+    given_the_meta_erds_are_set_to(META_TABLE, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0001, "07", hass)
+    await given_the_erd_is_set_to(0x0002, "41424344", hass)
+    await given_the_erd_is_set_to(0x0003, "10", hass)
+
+
+def the_entry(hass: HomeAssistant) -> ConfigEntry:
+    """Return the integration's config entry."""
+    return hass.config_entries.async_entries(DOMAIN)[0]
+
+
+def the_device(identifier: str, hass: HomeAssistant) -> dr.DeviceEntry:
+    """Return the registered device with the identifier."""
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, identifier)})
+    assert device is not None
+    return device
+
+
+def the_device_dump_should_describe_the_test_device(device: dict[str, Any]) -> None:
+    """Assert the dump has the device's ERDs, manifests and meta ERD mappings."""
+    assert device["available"]
+    assert device["supported_erds"]["0x0001"] == {"value": "07", "subscribers": 1}
+    assert device["supported_erds"]["0x0002"]["value"] == REDACTED
+    assert device["unsupported_erds"]["0x0092"]["value"] == REDACTED
+    assert device["manifests"] == [
+        {
+            "erd": "0x0092",
+            "feature_type": None,
+            "version": "1",
+            "features": "0x00000000",
+            "known": True,
+        }
+    ]
+    assert device["meta_erds"] == {
+        "0x0003": {"Test Min": {"func": "set_min", "targets": ["test_0004_Missing"]}}
+    }
+    assert device["counters"]["received"] == 4
+    assert device["slowest"]
+    assert all(sample["device"] == "test" for sample in device["slowest"])
+
+
+def the_dump_should_be_json(diagnostics: dict[str, Any]) -> None:
+    """Assert the dump can be downloaded as JSON."""
+    json.dumps(diagnostics)
+
+
+class TestDiagnostics:
+    """Hold diagnostics tests."""
+
+    async def test_dumps_every_device_and_the_counters(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test the config entry diagnostics describe each device and include the performance counters."""
+        diagnostics = await async_get_config_entry_diagnostics(hass, the_entry(hass))
+
+        the_device_dump_should_describe_the_test_device(diagnostics["devices"]["test"])
+        assert diagnostics["performance"]["counters"]["received"] == 4
+        assert diagnostics["performance"]["ingest"]["handled"] == 4
+        assert len(diagnostics["performance"]["ingest"]["slowest"]) == 4
+        assert diagnostics["performance"]["overload"]["level"] == "normal"
+        the_dump_should_be_json(diagnostics)
+
+    async def test_dumps_a_device(self, hass: HomeAssistant) -> None:
+        """Test the device diagnostics describe the device."""
+        diagnostics = await async_get_device_diagnostics(
+            hass, the_entry(hass), the_device("test", hass)
+        )
+
+        assert diagnostics["device"] == "test"
+        the_device_dump_should_describe_the_test_device(diagnostics)
+        the_dump_should_be_json(diagnostics)
+
+    async def test_dumps_the_counters_for_the_hub(self, hass: HomeAssistant) -> None:
+        """Test the hub device's diagnostics are the performance counters."""
+        entry = the_entry(hass)
+
+        diagnostics = await async_get_device_diagnostics(
+            hass, entry, the_device(entry.entry_id, hass)
+        )
+
+        assert list(diagnostics) == ["performance"]
+        assert diagnostics["performance"]["counters"]["received"] == 4
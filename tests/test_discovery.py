@@ -1,5 +1,6 @@
 """Test GE Appliances MQTT discovery."""
 
+from datetime import timedelta
 import logging
 from unittest.mock import MagicMock
 
@@ -7,11 +8,22 @@ from custom_components.geappliances.const import Erd
 from custom_components.geappliances.discovery import GeaDiscovery
 from custom_components.geappliances.ha_compatibility.data_source import DataSource
 from custom_components.geappliances.ha_compatibility.meta_erds import MetaErdCoordinator
-from custom_components.geappliances.ha_compatibility.mqtt_client import GeaMQTTMessage
+from custom_components.geappliances.ha_compatibility.mqtt_client import (
+    GeaMQTTBatch,
+    GeaMQTTMessage,
+)
+from custom_components.geappliances.ha_compatibility.overload import (
+    OverloadController,
+    OverloadLevel,
+)
 from custom_components.geappliances.ha_compatibility.registry_updater import (
     RegistryUpdater,
 )
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .doubles import (
     AnyConfigWithName,
@@ -94,6 +106,7 @@ APPLIANCE_API_DEFINTION_JSON = """
             "name": "Another Test",
             "id": "0x0002",
             "operations": ["read"],
+            "updateClass": { "type": "periodic", "periodInMsec": 1000 },
             "data": [
                 {
                     "name": "Another Test",
@@ -182,12 +195,20 @@ def meta_erd_coordinator_mock() -> MetaErdCoordinatorMock:
     return meta_erd_coordinator_mock
 
 
+@pytest.fixture
+def overload(hass: HomeAssistant) -> OverloadController:
+    """Return an overload controller that changes level on every observation."""
+    return OverloadController(hass, lag=1, recovery_lag=0.1, hold=0)
+
+
 @pytest.fixture
 def discovery(
-    registry_updater_mock, data_source, meta_erd_coordinator_mock
+    registry_updater_mock, data_source, meta_erd_coordinator_mock, overload
 ) -> GeaDiscovery:
     """Return an instance of GeaDiscovery."""
-    return GeaDiscovery(registry_updater_mock, data_source, meta_erd_coordinator_mock)
+    return GeaDiscovery(
+        registry_updater_mock, data_source, meta_erd_coordinator_mock, overload
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -233,6 +254,32 @@ async def when_an_mqtt_message_is_received_on_topic(
     await discovery.handle_message(GeaMQTTMessage(device_name, erd, payload))
 
 
+async def when_a_batch_is_received(
+    erds: list[tuple[Erd, bytes]], discovery: GeaDiscovery
+) -> None:
+    """Fake an ERD batch MQTT message."""
+    await discovery.handle_batch(GeaMQTTBatch("test", erds))
+
+
+def given_the_overload_level_is(
+    level: OverloadLevel, overload: OverloadController
+) -> None:
+    """Observe enough lag to step the overload controller to the level."""
+    while overload.level < level:
+        overload.observe(2, 0)
+    while overload.level > level:
+        overload.observe(0, 0)
+
+
+async def when_the_overload_recovers_without_messages(
+    overload: OverloadController, hass: HomeAssistant
+) -> None:
+    """Move time forward until the overload controller has stepped down to normal on its own."""
+    while overload.level > OverloadLevel.NORMAL:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+
 def the_device_should_exist(registry_updater_mock: RegistryUpdaterMock) -> None:
     """Check the device has been registered."""
     registry_updater_mock.create_device.assert_called_with("test")
@@ -405,3 +452,73 @@ class TestDiscovery:
         the_error_log_should_be(
             "Invalid feature appliance API: (type: 0 version: 2)", capture_errors
         )
+
+    async def test_handles_appliance_api_first_in_a_batch(
+        self, registry_updater_mock, data_source, discovery
+    ) -> None:
+        """Test a batch registers the device once and handles the appliance API before the ERD values it describes."""
+        await when_a_batch_is_received(
+            [
+                (0x0001, bytes.fromhex("07")),
+                (0x0092, bytes.fromhex("0000 0001 0000 0000")),
+                (0x0002, bytes.fromhex("01")),
+            ],
+            discovery,
+        )
+
+        registry_updater_mock.create_device.assert_called_once_with("test")
+        the_entity_should_be_added_to_the_device("Test: Test", registry_updater_mock)
+        assert await data_source.erd_read("test", 0x0001) == bytes.fromhex("07")
+        the_erd_should_be_unsupported(0x0002, data_source)
+
+    async def test_skips_periodic_erds_while_overloaded(
+        self, data_source, discovery, overload
+    ) -> None:
+        """Test updates to periodic ERDs are skipped once the overload level reaches skipping them."""
+        await given_the_erd_is_set_to(
+            0x0092, bytes.fromhex("0000 0001 0000 0001"), discovery
+        )
+        given_the_overload_level_is(OverloadLevel.SKIP_PERIODIC, overload)
+
+        await when_the_erd_is_set_to(0x0001, bytes.fromhex("01"), discovery)
+        await when_the_erd_is_set_to(0x0002, bytes.fromhex("01"), discovery)
+
+        assert await data_source.erd_read("test", 0x0001) == bytes.fromhex("01")
+        assert await data_source.erd_read("test", 0x0002) != bytes.fromhex("01")
+        assert overload.metrics.skipped_periodic == 1
+
+    async def test_pauses_meta_erd_transforms_while_overloaded(
+        self, hass, meta_erd_coordinator_mock, discovery, overload
+    ) -> None:
+        """Test meta ERD transforms are put off at the highest overload level and applied once it clears."""
+        await given_the_erd_is_set_to(
+            0x0092, bytes.fromhex("0000 0001 0000 0001"), discovery
+        )
+        meta_erd_coordinator_mock.is_meta_erd.return_value = True
+        given_the_overload_level_is(OverloadLevel.PAUSE_META_TRANSFORMS, overload)
+
+        await when_the_erd_is_set_to(0x0001, bytes.fromhex("01"), discovery)
+        meta_erd_coordinator_mock.apply_transforms_for_meta_erd.assert_not_called()
+        assert overload.metrics.paused_transforms == 1
+
+        given_the_overload_level_is(OverloadLevel.SKIP_PERIODIC, overload)
+        await hass.async_block_till_done()
+        meta_erd_coordinator_mock.apply_transforms_for_meta_erd.assert_called_once_with(
+            "test", 0x0001
+        )
+
+    async def test_resumes_meta_erd_transforms_when_the_overload_times_out(
+        self, hass, meta_erd_coordinator_mock, discovery, overload
+    ) -> None:
+        """Test meta ERD transforms put off while overloaded are applied when the level steps down with no further messages."""
+        await given_the_erd_is_set_to(
+            0x0092, bytes.fromhex("0000 0001 0000 0001"), discovery
+        )
+        meta_erd_coordinator_mock.is_meta_erd.return_value = True
+        given_the_overload_level_is(OverloadLevel.PAUSE_META_TRANSFORMS, overload)
+        await given_the_erd_is_set_to(0x0001, bytes.fromhex("01"), discovery)
+
+        await when_the_overload_recovers_without_messages(overload, hass)
+        meta_erd_coordinator_mock.apply_transforms_for_meta_erd.assert_called_once_with(
+            "test", 0x0001
+        )
@@ -135,6 +135,25 @@ APPLIANCE_API_DEFINTION_JSON = """
                 }
             ]
         },
+        {
+            "name": "Repeated Field Test",
+            "id": "0x0007",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Reserved",
+                    "type": "bool",
+                    "offset": 0,
+                    "size": 1
+                },
+                {
+                    "name": "Reserved",
+                    "type": "bool",
+                    "offset": 1,
+                    "size": 1
+                }
+            ]
+        },
         {
             "name": "Test Pair Status",
             "id": "0x0006",
@@ -399,3 +418,11 @@ class TestERDFactory:
         empty_list = await when_configs_are_created_for_erd(0x0006, erd_factory)
         await the_configs_should_be_correct_for_erd(0x0005, config_list, data_source)
         await the_configs_should_be_correct_for_erd(0x0006, empty_list, data_source)
+
+    async def test_skips_fields_with_repeated_names(self, erd_factory) -> None:
+        """Test factory creates one config for fields sharing a name so their unique IDs do not collide."""
+
+        config_list = await when_configs_are_created_for_erd(0x0007, erd_factory)
+        assert [config.unique_identifier for config in config_list] == [
+            "test_0007_Reserved"
+        ]
@@ -0,0 +1,149 @@
+"""Test GE Appliances ingest queue."""
+
+import asyncio
+
+from custom_components.geappliances.ha_compatibility.ingest_queue import IngestQueue
+from custom_components.geappliances.ha_compatibility.overload import (
+    OverloadController,
+    OverloadLevel,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture
+def handled() -> list[int]:
+    """Return the list the handler records values in."""
+    return []
+
+
+@pytest.fixture
+def overload(hass: HomeAssistant) -> OverloadController:
+    """Return an overload controller that changes level on every observation."""
+    return OverloadController(hass, lag=1, recovery_lag=0.1, hold=0)
+
+
+@pytest.fixture
+def ingest_queue(hass: HomeAssistant, overload) -> IngestQueue:
+    """Return an ingest queue that handles two values per batch."""
+    return IngestQueue(hass, overload, batch_size=2)
+
+
+def given_values_are_queued(
+    values: list[int],
+    handled: list[int],
+    ingest_queue: IngestQueue,
+    key: str | None = None,
+) -> None:
+    """Queue the values with a handler that records them."""
+
+    async def handle(value: int) -> None:
+        if value < 0:
+            raise ValueError(value)
+        handled.append(value)
+
+    for value in values:
+        ingest_queue.put(handle, value, key)
+
+
+def given_the_queue_is_overloaded(overload: OverloadController) -> None:
+    """Observe enough lag to keep only the latest value of each key."""
+    overload.observe(2, 0)
+    assert overload.level == OverloadLevel.LATEST_ONLY
+
+
+async def when_another_task_records(
+    value: int, handled: list[int], hass: HomeAssistant
+) -> None:
+    """Start a task that records the value as soon as it runs and wait for everything to finish."""
+
+    async def record() -> None:
+        handled.append(value)
+
+    hass.async_create_task(record(), eager_start=False)
+    await hass.async_block_till_done()
+
+
+async def when_the_loop_runs(times: int) -> None:
+    """Let other tasks run."""
+    for _ in range(times):
+        await asyncio.sleep(0)
+
+
+class TestIngestQueue:
+    """Hold ingest queue tests."""
+
+    async def test_handles_values_in_order(
+        self, hass: HomeAssistant, handled, ingest_queue
+    ) -> None:
+        """Test the queue handles every value in the order it was queued."""
+        given_values_are_queued([1, 2, 3, 4, 5], handled, ingest_queue)
+
+        await hass.async_block_till_done()
+
+        assert handled == [1, 2, 3, 4, 5]
+        assert ingest_queue.metrics.handled == 5
+        assert ingest_queue.metrics.max_depth == 5
+        assert ingest_queue.metrics.depth == 0
+        assert sum(ingest_queue.metrics.latency.counts) == 5
+
+    async def test_yields_between_batches(
+        self, hass: HomeAssistant, handled, ingest_queue
+    ) -> None:
+        """Test the queue lets other tasks run after each batch."""
+        given_values_are_queued([1, 2, 3, 4], handled, ingest_queue)
+
+        await when_another_task_records(0, handled, hass)
+
+        assert handled == [1, 2, 0, 3, 4]
+
+    async def test_holds_back_values_while_prioritized(
+        self, hass: HomeAssistant, handled, ingest_queue
+    ) -> None:
+        """Test the queue handles nothing while prioritized work runs and resumes once it is done."""
+        async with ingest_queue.prioritized():
+            given_values_are_queued([1, 2, 3], handled, ingest_queue)
+            await when_the_loop_runs(5)
+            assert handled == []
+
+        await hass.async_block_till_done()
+        assert handled == [1, 2, 3]
+        assert ingest_queue.metrics.deferred == 1
+
+    async def test_keeps_handling_after_an_error(
+        self, hass: HomeAssistant, handled, ingest_queue, caplog
+    ) -> None:
+        """Test a value whose handler raises is logged and later values are still handled."""
+        given_values_are_queued([1, -1, 2], handled, ingest_queue)
+
+        await hass.async_block_till_done()
+
+        assert handled == [1, 2]
+        assert "Error handling GE Appliances telemetry" in caplog.text
+
+    async def test_keeps_only_the_latest_value_per_key_while_overloaded(
+        self, hass: HomeAssistant, handled, ingest_queue, overload
+    ) -> None:
+        """Test a queued value is replaced in place by a newer value with the same key while overloaded."""
+        given_the_queue_is_overloaded(overload)
+
+        given_values_are_queued([1], handled, ingest_queue, "a")
+        given_values_are_queued([2], handled, ingest_queue, "b")
+        given_values_are_queued([3, 4], handled, ingest_queue, "a")
+        given_values_are_queued([5, 6], handled, ingest_queue)
+
+        await hass.async_block_till_done()
+
+        assert handled == [4, 2, 5, 6]
+        assert overload.metrics.coalesced == 2
+
+    async def test_keeps_every_value_when_not_overloaded(
+        self, hass: HomeAssistant, handled, ingest_queue
+    ) -> None:
+        """Test values with the same key are all handled while not overloaded."""
+        given_values_are_queued([1, 2, 3], handled, ingest_queue, "a")
+
+        await hass.async_block_till_done()
+
+        assert handled == [1, 2, 3]
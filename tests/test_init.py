@@ -27,6 +27,17 @@ async def setup_should_return(
     assert await hass.config_entries.async_setup(entry.entry_id) is val
 
 
+async def when_the_entry_is_unloaded(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Unload the config entry."""
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def services_should_be_registered(registered: bool, hass: HomeAssistant) -> None:
+    """Assert whether the integration's services are registered."""
+    assert bool(hass.services.async_services_for_domain(DOMAIN)) is registered
+
+
 def discovery_should_be_created(hass: HomeAssistant) -> None:
     """Assert that the GEADiscovery singleton is created."""
     assert type(hass.data[DOMAIN][DISCOVERY]) is GeaDiscovery
@@ -50,3 +61,16 @@ class TestInit:
         await hass.async_block_till_done(wait_background_tasks=True)
         discovery_should_be_created(hass)
         await hass.async_block_till_done(wait_background_tasks=True)
+
+    async def test_services_are_removed_on_unload(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test no service outlives the entry whose data its handler looks up."""
+        entry = given_the_entry_is_created(hass)
+        await setup_should_return(True, hass, entry)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        services_should_be_registered(True, hass)
+
+        await when_the_entry_is_unloaded(hass, entry)
+
+        services_should_be_registered(False, hass)
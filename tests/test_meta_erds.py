@@ -1,13 +1,15 @@
 """Test 'Meta' ERDs that provide info about other ERDs."""
 
 import json
+import logging
 
 from custom_components.geappliances.const import DISCOVERY, DOMAIN
 import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
 from pytest_homeassistant_custom_component.typing import MqttMockHAClient
 
-from homeassistant.const import STATE_UNKNOWN
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_CALL_SERVICE, EVENT_STATE_CHANGED, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 
 from .common import (
@@ -292,6 +294,21 @@ META_TABLE = """
 }
 """
 
+OTHER_API_META_TABLE = """
+{
+    "5": {
+        "1": {
+            "0x0002": {
+                "Test Sensor": {
+                    "fields": ["{}_0001_Test_Number"],
+                    "func": "set_min"
+                }
+            }
+        }
+    }
+}
+"""
+
 
 @pytest.fixture(autouse=True)
 async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
@@ -335,6 +352,34 @@ async def setting_the_select_should_raise_error(
         await when_the_select_is_set_to(name, option, hass)
 
 
+def no_errors_should_have_been_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Assert that nothing was logged at error level."""
+    assert [
+        record for record in caplog.records if record.levelno >= logging.ERROR
+    ] == []
+
+
+def no_services_should_have_been_called(service_calls: list[Event]) -> None:
+    """Assert that no service calls were made."""
+    assert service_calls == []
+
+
+def the_entity_state_should_have_been_written_once(
+    name: str, state_changes: list[Event]
+) -> None:
+    """Assert that exactly one state change was recorded for the entity."""
+    assert (
+        len(
+            [
+                state_change
+                for state_change in state_changes
+                if state_change.data["entity_id"] == name
+            ]
+        )
+        == 1
+    )
+
+
 class TestMetaErds:
     """Hold the meta ERD tests."""
 
@@ -440,3 +485,32 @@ class TestMetaErds:
         the_entity_value_should_be(
             "number.test_reverse_test_reverse", STATE_UNKNOWN, hass
         )
+
+    async def test_applies_transforms_without_service_calls(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test transforms are applied directly and every field of one meta ERD update results in a single state write."""
+        await given_the_erd_is_set_to(0x0003, "00", hass)
+        service_calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+        state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+        await when_the_erd_is_set_to(0x0009, "01", hass)
+
+        no_services_should_have_been_called(service_calls)
+        the_entity_state_should_have_been_written_once(
+            "select.test_select_test_select", state_changes
+        )
+
+    async def test_ignores_erd_that_is_a_meta_erd_in_another_api(
+        self,
+        hass: HomeAssistant,
+        mqtt_mock: MqttMockHAClient,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test an ERD that is only a meta ERD in an appliance API the device does not have it in is handled like any other ERD."""
+        given_the_meta_erds_are_set_to(OTHER_API_META_TABLE, hass)
+
+        await when_the_erd_is_set_to(0x0002, "07", hass)
+
+        the_entity_value_should_be("sensor.test_sensor_test_sensor", "7", hass)
+        no_errors_should_have_been_logged(caplog)
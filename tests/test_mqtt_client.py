@@ -0,0 +1,230 @@
+"""Test GE Appliances MQTT client."""
+
+from datetime import timedelta
+
+from custom_components.geappliances.const import (
+    DEFAULT_AVAILABILITY_SLOTS,
+    DEFAULT_AVAILABILITY_TIMEOUT,
+    Erd,
+)
+from custom_components.geappliances.ha_compatibility.mqtt_client import (
+    decode_erd_batch,
+    encode_erd_batch,
+)
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import (
+    given_integration_is_initialized,
+    given_payloads_are_binary,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+    when_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+ERD_BATCH_TOPIC = "geappliances/test/erds"
+UPTIME_TOPIC = "geappliances/test/uptime"
+AVAILABILITY_TICK = DEFAULT_AVAILABILITY_TIMEOUT / DEFAULT_AVAILABILITY_SLOTS
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Test", "length": 1 },
+                    { "erd": "0x0002", "name": "Another Test", "length": 2 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Test",
+            "id": "0x0001",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Test",
+                    "type": "u8",
+                    "offset": 0,
+                    "size": 1
+                }
+            ]
+        },
+        {
+            "name": "Another Test",
+            "id": "0x0002",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Another Test",
+                    "type": "u16",
+                    "offset": 0,
+                    "size": 2
+                }
+            ]
+        }
+    ]
+}"""
+
+APPLIANCE_API_ERDS = [(0x0092, bytes.fromhex("0000 0001 0000 0000"))]
+
+
+@pytest.fixture(autouse=True)
+async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Set up for all tests."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+
+
+async def when_a_batch_is_received(payload: str | bytes, hass: HomeAssistant) -> None:
+    """Fire an ERD batch MQTT message."""
+    async_fire_mqtt_message(hass, ERD_BATCH_TOPIC, payload)
+    await hass.async_block_till_done()
+
+
+async def given_the_device_sends_a_heartbeat(hass: HomeAssistant) -> None:
+    """Fire an uptime MQTT message."""
+    async_fire_mqtt_message(hass, UPTIME_TOPIC, "00000001")
+    await hass.async_block_till_done()
+
+
+async def when_the_device_sends_a_heartbeat(hass: HomeAssistant) -> None:
+    """Fire an uptime MQTT message."""
+    await given_the_device_sends_a_heartbeat(hass)
+
+
+async def when_time_passes(seconds: float, hass: HomeAssistant) -> None:
+    """Move time forward one availability tick at a time."""
+    for _ in range(round(seconds / AVAILABILITY_TICK)):
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=AVAILABILITY_TICK)
+        )
+        await hass.async_block_till_done()
+
+
+def the_sensor_value_should_be(name: str, state: str, hass: HomeAssistant) -> None:
+    """Assert the value of the sensor."""
+    if (entity := hass.states.get(name)) is not None:
+        assert entity.state == state
+    else:
+        pytest.fail(f"Could not find sensor {name}")
+
+
+def the_batch_should_round_trip(erds: list[tuple[Erd, bytes]]) -> None:
+    """Assert the ERDs decode from their batch frame unchanged."""
+    assert decode_erd_batch(encode_erd_batch(erds)) == erds
+
+
+class TestErdBatch:
+    """Hold ERD batch tests."""
+
+    async def test_updates_every_erd_in_the_batch(self, hass: HomeAssistant) -> None:
+        """Test a batch discovers the appliance API and updates every ERD, even when the values come before the appliance API."""
+        await when_a_batch_is_received(
+            encode_erd_batch(
+                [(0x0001, b"\x07"), (0x0002, b"\x01\x2c"), *APPLIANCE_API_ERDS]
+            ).hex(),
+            hass,
+        )
+
+        the_sensor_value_should_be("sensor.test_test", "7", hass)
+        the_sensor_value_should_be("sensor.another_test_another_test", "300", hass)
+
+    async def test_reads_binary_batches(self, hass: HomeAssistant) -> None:
+        """Test a batch is read from raw bytes when payloads are binary."""
+        await given_payloads_are_binary(hass)
+
+        await when_a_batch_is_received(
+            encode_erd_batch([*APPLIANCE_API_ERDS, (0x0001, b"\x05")]), hass
+        )
+
+        the_sensor_value_should_be("sensor.test_test", "5", hass)
+
+    async def test_ignores_truncated_batches(self, hass: HomeAssistant) -> None:
+        """Test a batch with a truncated record is dropped without updating any ERD."""
+        frame = encode_erd_batch([*APPLIANCE_API_ERDS, (0x0001, b"\x05")])
+
+        await when_a_batch_is_received(frame[:-1].hex(), hass)
+
+        assert hass.states.get("sensor.test_test") is None
+
+    def test_encodes_records(self) -> None:
+        """Test records are packed as a u16 ERD, a u8 length and the value."""
+        assert encode_erd_batch([(0x0001, b"\x07"), (0x1234, b"")]) == bytes.fromhex(
+            "0001 01 07 1234 00"
+        )
+        the_batch_should_round_trip([])
+        the_batch_should_round_trip([(0x0001, b"\x07"), (0xFFFF, bytes(255))])
+
+    def test_rejects_records_that_do_not_fit(self) -> None:
+        """Test the encoder rejects values too long for a record and the decoder rejects truncated frames."""
+        with pytest.raises(ValueError):
+            encode_erd_batch([(0x0001, bytes(256))])
+        with pytest.raises(ValueError):
+            decode_erd_batch(bytes.fromhex("0001"))
+        with pytest.raises(ValueError):
+            decode_erd_batch(bytes.fromhex("0001 02 07"))
+
+
+class TestAvailability:
+    """Hold device availability tests."""
+
+    @pytest.fixture(autouse=True)
+    async def given_the_sensors_are_discovered(self, hass: HomeAssistant) -> None:
+        """Discover the sensors of the device."""
+        await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+        await given_the_erd_is_set_to(0x0001, "07", hass)
+
+    async def test_device_goes_unavailable_when_heartbeats_stop(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test the entities of a device go unavailable once its heartbeats stop for the timeout."""
+        await given_the_device_sends_a_heartbeat(hass)
+
+        await when_time_passes(DEFAULT_AVAILABILITY_TIMEOUT - AVAILABILITY_TICK, hass)
+        the_sensor_value_should_be("sensor.test_test", "7", hass)
+
+        await when_time_passes(2 * AVAILABILITY_TICK, hass)
+        the_sensor_value_should_be("sensor.test_test", STATE_UNAVAILABLE, hass)
+
+        await when_the_device_sends_a_heartbeat(hass)
+        the_sensor_value_should_be("sensor.test_test", "7", hass)
+
+    async def test_erd_updates_keep_the_device_available(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test ERD updates from a device that sends heartbeats keep it available."""
+        await given_the_device_sends_a_heartbeat(hass)
+
+        await when_time_passes(DEFAULT_AVAILABILITY_TIMEOUT / 2, hass)
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+        await when_time_passes(DEFAULT_AVAILABILITY_TIMEOUT * 3 / 4, hass)
+
+        the_sensor_value_should_be("sensor.test_test", "8", hass)
+
+    async def test_device_without_heartbeats_stays_available(
+        self, hass: HomeAssistant
+    ) -> None:
+        """Test a device that never sends a heartbeat is never marked unavailable."""
+        await when_time_passes(DEFAULT_AVAILABILITY_TIMEOUT * 2, hass)
+
+        the_sensor_value_should_be("sensor.test_test", "7", hass)
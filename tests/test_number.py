@@ -1,11 +1,21 @@
 """Test GE Appliances number."""
 
+from custom_components.geappliances.const import (
+    ATTR_MAX_VAL,
+    ATTR_UNIQUE_ID,
+    DOMAIN,
+    SERVICE_SET_MAX,
+)
 import pytest
 from pytest_homeassistant_custom_component.typing import MqttMockHAClient
 
 from homeassistant.components import number
 from homeassistant.components.number import NumberDeviceClass
-from homeassistant.components.number.const import ATTR_VALUE, SERVICE_SET_VALUE
+from homeassistant.components.number.const import (
+    ATTR_MAX,
+    ATTR_VALUE,
+    SERVICE_SET_VALUE,
+)
 from homeassistant.const import ATTR_ENTITY_ID, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -501,6 +511,23 @@ async def when_the_number_is_set_to(
     await hass.services.async_call(
         number.DOMAIN, SERVICE_SET_VALUE, data, blocking=True
     )
+    await hass.async_block_till_done()
+
+
+async def when_the_max_is_set_by_unique_id(
+    unique_id: str, max_val: float, hass: HomeAssistant
+) -> None:
+    """Set the max value through the integration service without an entity ID."""
+    data = {ATTR_ENTITY_ID: None, ATTR_UNIQUE_ID: unique_id, ATTR_MAX_VAL: max_val}
+    await hass.services.async_call(DOMAIN, SERVICE_SET_MAX, data, blocking=True)
+
+
+def the_number_max_should_be(name: str, max_val: float, hass: HomeAssistant) -> None:
+    """Assert the max value of the number."""
+    if (entity := hass.states.get(name)) is not None:
+        assert entity.attributes[ATTR_MAX] == max_val
+    else:
+        pytest.fail(f"Could not find number {name}")
 
 
 def the_number_value_should_be(name: str, state: str, hass: HomeAssistant) -> None:
@@ -582,6 +609,16 @@ class TestNumber:
         the_number_value_should_be("number.bitfield_test_field_one", "15", hass)
         the_number_value_should_be("number.bitfield_test_field_two", "7", hass)
 
+    async def test_service_resolves_target_by_unique_id(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test services without an entity ID only update the entity with the matching unique ID."""
+        await given_the_erd_is_set_to(0x0002, "0000", hass)
+
+        await when_the_max_is_set_by_unique_id("test_0002_Field_One", 100.0, hass)
+        the_number_max_should_be("number.multi_field_test_field_one", 100.0, hass)
+        the_number_max_should_be("number.multi_field_test_field_two", 255.0, hass)
+
     async def test_shows_unknown_when_unsupported(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None:
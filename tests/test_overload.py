@@ -0,0 +1,137 @@
+"""Test GE Appliances overload controller."""
+
+from collections.abc import Generator
+from datetime import timedelta
+import logging
+
+from custom_components.geappliances.const import DOMAIN, ISSUE_OVERLOADED
+from custom_components.geappliances.ha_compatibility.overload import (
+    OverloadController,
+    OverloadLevel,
+)
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.util import dt as dt_util
+
+LAG = 2.0
+RECOVERY_LAG = 0.2
+HOLD = 10.0
+
+
+@pytest.fixture
+def overload(hass: HomeAssistant) -> Generator[OverloadController]:
+    """Return an overload controller."""
+    overload = OverloadController(hass, lag=LAG, recovery_lag=RECOVERY_LAG, hold=HOLD)
+    yield overload
+    overload.shutdown()
+
+
+def when_the_lag_is_observed(
+    lags: list[tuple[float, float]], overload: OverloadController
+) -> None:
+    """Observe each (lag, time) pair."""
+    for lag, now in lags:
+        overload.observe(lag, now)
+
+
+async def when_hold_periods_pass(count: int, hass: HomeAssistant) -> None:
+    """Move time forward the given number of hold periods, one at a time."""
+    for _ in range(count):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=HOLD))
+        await hass.async_block_till_done()
+
+
+def the_level_should_be(level: OverloadLevel, overload: OverloadController) -> None:
+    """Assert the overload level."""
+    assert overload.level == level
+
+
+def the_repair_issue_should_exist(exists: bool, hass: HomeAssistant) -> None:
+    """Assert whether the overload repair issue is shown."""
+    issue = ir.async_get(hass).async_get_issue(DOMAIN, ISSUE_OVERLOADED)
+    assert (issue is not None) == exists
+
+
+class TestOverloadController:
+    """Hold overload controller tests."""
+
+    async def test_steps_up_once_per_hold_while_lagging(
+        self, hass: HomeAssistant, overload
+    ) -> None:
+        """Test the level goes up one step per hold period while the lag is over the limit."""
+        when_the_lag_is_observed([(LAG / 2, 0)], overload)
+        the_level_should_be(OverloadLevel.NORMAL, overload)
+        the_repair_issue_should_exist(False, hass)
+
+        when_the_lag_is_observed([(LAG * 2, 1), (LAG * 2, 2)], overload)
+        the_level_should_be(OverloadLevel.LATEST_ONLY, overload)
+        the_repair_issue_should_exist(True, hass)
+
+        when_the_lag_is_observed(
+            [(LAG * 2, 1 + HOLD), (LAG * 2, 1 + 2 * HOLD), (LAG * 2, 1 + 3 * HOLD)],
+            overload,
+        )
+        the_level_should_be(OverloadLevel.PAUSE_META_TRANSFORMS, overload)
+        assert overload.metrics.level_changes == 3
+        assert overload.metrics.max_lag == LAG * 2
+
+    async def test_steps_down_and_clears_the_issue_once_caught_up(
+        self, hass: HomeAssistant, overload
+    ) -> None:
+        """Test the level comes back down once the lag is under the recovery limit and the repair issue clears at normal."""
+        when_the_lag_is_observed([(LAG * 2, 0), (LAG * 2, HOLD)], overload)
+        the_level_should_be(OverloadLevel.SKIP_PERIODIC, overload)
+
+        when_the_lag_is_observed([(LAG / 2, 2 * HOLD)], overload)
+        the_level_should_be(OverloadLevel.SKIP_PERIODIC, overload)
+
+        when_the_lag_is_observed([(0, 3 * HOLD), (0, 4 * HOLD)], overload)
+        the_level_should_be(OverloadLevel.NORMAL, overload)
+        the_repair_issue_should_exist(False, hass)
+
+    async def test_logs_level_changes_with_counters(
+        self, overload, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test level changes are logged with the shed counters."""
+        overload.record_coalesced()
+        overload.record_skipped_periodic()
+
+        when_the_lag_is_observed([(LAG * 2, 0)], overload)
+
+        assert (
+            "custom_components.geappliances.ha_compatibility.overload",
+            logging.WARNING,
+            "GE Appliances overload level changed from NORMAL to LATEST_ONLY with 4.00s lag "
+            "(coalesced: 1, skipped periodic: 1, paused transforms: 0)",
+        ) in caplog.record_tuples
+
+    async def test_steps_down_once_telemetry_stops(
+        self, hass: HomeAssistant, overload
+    ) -> None:
+        """Test the level comes back down one step per hold period and the repair issue clears once no telemetry is queued."""
+        when_the_lag_is_observed([(LAG * 2, 0), (LAG * 2, HOLD)], overload)
+        the_level_should_be(OverloadLevel.SKIP_PERIODIC, overload)
+
+        await when_hold_periods_pass(1, hass)
+        the_level_should_be(OverloadLevel.LATEST_ONLY, overload)
+        the_repair_issue_should_exist(True, hass)
+
+        await when_hold_periods_pass(1, hass)
+        the_level_should_be(OverloadLevel.NORMAL, overload)
+        the_repair_issue_should_exist(False, hass)
+
+    async def test_stays_up_while_telemetry_is_still_queued(
+        self, hass: HomeAssistant, overload
+    ) -> None:
+        """Test the level does not step down on the timer while lag is still being observed."""
+        when_the_lag_is_observed([(LAG * 2, 0)], overload)
+
+        when_the_lag_is_observed([(LAG / 2, 1)], overload)
+        await when_hold_periods_pass(1, hass)
+        the_level_should_be(OverloadLevel.LATEST_ONLY, overload)
+
+        await when_hold_periods_pass(1, hass)
+        the_level_should_be(OverloadLevel.NORMAL, overload)
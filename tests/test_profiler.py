@@ -0,0 +1,154 @@
+"""Test GE Appliances profiling services."""
+
+from pathlib import Path
+import sys
+import threading
+
+from custom_components.geappliances.const import (
+    ATTR_INTERVAL,
+    ATTR_PATH,
+    DOMAIN,
+    SERVICE_START_PROFILE,
+    SERVICE_STOP_PROFILE,
+)
+from custom_components.geappliances.ha_compatibility.profiler import SamplingProfiler
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant, ServiceResponse
+from homeassistant.exceptions import ServiceValidationError
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+    when_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Test", "length": 1 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Test",
+            "id": "0x0001",
+            "operations": ["read"],
+            "data": [
+                { "name": "Test", "type": "u8", "offset": 0, "size": 1 }
+            ]
+        }
+    ]
+}"""
+
+
+@pytest.fixture(autouse=True)
+async def initialize(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient, tmp_path: Path
+) -> None:
+    """Set up for all tests."""
+    hass.config.config_dir = str(tmp_path)
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0001, "07", hass)
+
+
+async def when_profiling_starts(hass: HomeAssistant) -> None:
+    """Call the start profile service."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_PROFILE, {ATTR_INTERVAL: 1}, blocking=True
+    )
+
+
+async def when_profiling_stops(hass: HomeAssistant) -> ServiceResponse:
+    """Call the stop profile service and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_PROFILE, {}, blocking=True, return_response=True
+    )
+
+
+def given_a_profiler_for_the_tests() -> SamplingProfiler:
+    """Return a profiler that treats the tests as the integration."""
+    return SamplingProfiler(
+        threading.get_ident(), 1, package_dir=str(Path(__file__).parent)
+    )
+
+
+def when_a_stack_through_the_tests_is_sampled(profiler: SamplingProfiler) -> None:
+    """Sample from a function called by a test."""
+
+    def inner() -> None:
+        profiler.sample(sys._getframe())  # noqa: SLF001
+
+    inner()
+
+
+def the_profile_should_be_written(response: ServiceResponse, tmp_path: Path) -> None:
+    """Assert the profile was written to the config directory."""
+    assert response is not None
+    path = Path(str(response[ATTR_PATH]))
+    assert path.parent == tmp_path
+    assert path.suffix == ".collapsed"
+    assert path.exists()
+
+
+class TestProfiler:
+    """Hold profiling tests."""
+
+    async def test_writes_the_profile_to_the_config_directory(
+        self, hass: HomeAssistant, tmp_path: Path
+    ) -> None:
+        """Test a profile is written to the config directory when profiling stops."""
+        await when_profiling_starts(hass)
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+
+        response = await when_profiling_stops(hass)
+
+        the_profile_should_be_written(response, tmp_path)
+
+    async def test_cannot_start_twice(self, hass: HomeAssistant) -> None:
+        """Test starting the profiler while it is running raises."""
+        await when_profiling_starts(hass)
+
+        with pytest.raises(ServiceValidationError):
+            await when_profiling_starts(hass)
+
+        await when_profiling_stops(hass)
+
+    async def test_cannot_stop_before_starting(self, hass: HomeAssistant) -> None:
+        """Test stopping the profiler when it is not running raises."""
+        with pytest.raises(ServiceValidationError):
+            await when_profiling_stops(hass)
+
+    def test_collapses_stacks_from_the_outermost_package_frame(self) -> None:
+        """Test sampled stacks start at the outermost package frame and are counted."""
+        profiler = given_a_profiler_for_the_tests()
+
+        when_a_stack_through_the_tests_is_sampled(profiler)
+        when_a_stack_through_the_tests_is_sampled(profiler)
+        profiler.sample(None)
+
+        assert profiler.samples == 3
+        assert profiler.collapsed() == (
+            "tests.test_profiler:TestProfiler.test_collapses_stacks_from_the_outermost_package_frame;"
+            "tests.test_profiler:when_a_stack_through_the_tests_is_sampled;"
+            "tests.test_profiler:when_a_stack_through_the_tests_is_sampled.<locals>.inner 2\n"
+        )
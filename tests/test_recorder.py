@@ -0,0 +1,173 @@
+"""Test recording the GE Appliances MQTT stream and replaying recordings."""
+
+from pathlib import Path
+
+from custom_components.geappliances.const import (
+    ATTR_MESSAGES,
+    ATTR_PATH,
+    ATTR_TRUNCATED,
+    DOMAIN,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+)
+from custom_components.geappliances.ha_compatibility.recorder import (
+    MqttRecorder,
+    RecordedMessage,
+    read_recording,
+)
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant, ServiceResponse
+from homeassistant.exceptions import ServiceValidationError
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+)
+from .simulator.catalog import Catalog
+from .simulator.fleet import Fleet
+from .simulator.replay import async_replay, entity_states
+from .test_simulator import (
+    every_appliance_should_be_in_the_device_registry,
+    the_integration_should_have_the_fleet_values,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+FLEET_SIZE = 3
+
+
+@pytest.fixture(autouse=True)
+async def initialize(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient, tmp_path: Path
+) -> None:
+    """Set up for all tests."""
+    hass.config.config_dir = str(tmp_path)
+    await given_integration_is_initialized(hass, mqtt_mock)
+
+
+def given_a_recorded_fleet(
+    catalog: Catalog, seconds: float, tmp_path: Path
+) -> tuple[Fleet, Path]:
+    """Record a simulated fleet starting up and running for a while, and return the fleet and the saved recording."""
+    fleet = Fleet(
+        catalog, FLEET_SIZE, lambda topic, payload: recorder.record(topic, payload)
+    )
+    recorder = MqttRecorder(clock=lambda: fleet.time)
+    fleet.start()
+    fleet.advance(seconds)
+
+    path = tmp_path / "fleet.mqtt.gz"
+    recorder.save(str(path))
+    return fleet, path
+
+
+async def when_recording_starts(hass: HomeAssistant) -> None:
+    """Call the start recording service."""
+    await hass.services.async_call(DOMAIN, SERVICE_START_RECORDING, {}, blocking=True)
+
+
+async def when_recording_stops(hass: HomeAssistant) -> ServiceResponse:
+    """Call the stop recording service and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_RECORDING, {}, blocking=True, return_response=True
+    )
+
+
+async def when_messages_are_received(hass: HomeAssistant) -> None:
+    """Fire a hex and a binary message."""
+    async_fire_mqtt_message(hass, "geappliances/test/erd/0x0001/value", "07")
+    async_fire_mqtt_message(hass, "geappliances/test/uptime", b"\x00\x00\x00\x01")
+    await hass.async_block_till_done()
+
+
+def the_recording_should_hold(
+    response: ServiceResponse, messages: list[tuple[str, str | bytes]]
+) -> None:
+    """Assert the recording saved by the service holds the messages in order."""
+    assert response is not None
+    assert response[ATTR_MESSAGES] == len(messages)
+    assert not response[ATTR_TRUNCATED]
+
+    recording = read_recording(str(response[ATTR_PATH]))
+    assert [(message.topic, message.payload) for message in recording] == messages
+    assert all(
+        earlier.seconds <= later.seconds
+        for earlier, later in zip(recording, recording[1:], strict=False)
+    )
+
+
+class TestRecorder:
+    """Hold MQTT recording and replay tests."""
+
+    async def test_records_the_inbound_stream(self, hass: HomeAssistant) -> None:
+        """Test messages received while recording are saved as they arrived."""
+        await when_recording_starts(hass)
+        await when_messages_are_received(hass)
+
+        response = await when_recording_stops(hass)
+
+        the_recording_should_hold(
+            response,
+            [
+                ("geappliances/test/erd/0x0001/value", b"07"),
+                ("geappliances/test/uptime", b"\x00\x00\x00\x01"),
+            ],
+        )
+
+    async def test_cannot_start_twice(self, hass: HomeAssistant) -> None:
+        """Test starting a recording while one is running raises."""
+        await when_recording_starts(hass)
+
+        with pytest.raises(ServiceValidationError):
+            await when_recording_starts(hass)
+
+        await when_recording_stops(hass)
+
+    async def test_cannot_stop_before_starting(self, hass: HomeAssistant) -> None:
+        """Test stopping a recording when none is running raises."""
+        with pytest.raises(ServiceValidationError):
+            await when_recording_stops(hass)
+
+    def test_stops_recording_when_full(self, tmp_path: Path) -> None:
+        """Test messages past the size limit are dropped and the recording is marked truncated."""
+        recorder = MqttRecorder(max_bytes=64, clock=lambda: 0.0)
+        recorder.record("geappliances/test/uptime", b"\x00\x00\x00\x01")
+        recorder.record("geappliances/test/uptime", b"\x00\x00\x00\x02")
+        recorder.save(str(tmp_path / "recording.mqtt.gz"))
+
+        assert recorder.messages == 1
+        assert recorder.truncated
+        assert read_recording(str(tmp_path / "recording.mqtt.gz")) == [
+            RecordedMessage(0.0, "geappliances/test/uptime", b"\x00\x00\x00\x01")
+        ]
+
+    async def test_replays_a_recorded_fleet(
+        self, hass: HomeAssistant, tmp_path: Path
+    ) -> None:
+        """Test replaying a recorded fleet leaves the integration with the fleet's values, however fast it is replayed."""
+        catalog = Catalog.load()
+        given_the_appliance_api_is(catalog.appliance_api_json, hass)
+        given_the_appliance_api_erd_defs_are(catalog.erd_defs_json, hass)
+        fleet, path = given_a_recorded_fleet(catalog, 300, tmp_path)
+
+        seconds = await async_replay(hass, read_recording(str(path)))
+
+        assert seconds > 0
+        every_appliance_should_be_in_the_device_registry(fleet, hass)
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+        assert entity_states(hass)
+
+    async def test_replays_at_the_recorded_speed(self, hass: HomeAssistant) -> None:
+        """Test a realtime replay waits for each message's recorded time."""
+        messages = [
+            RecordedMessage(0.0, "geappliances/test/uptime", b"\x00\x00\x00\x01"),
+            RecordedMessage(0.05, "geappliances/test/uptime", b"\x00\x00\x00\x02"),
+        ]
+
+        seconds = await async_replay(hass, messages, realtime=True)
+
+        assert seconds >= 0.05
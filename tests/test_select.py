@@ -214,6 +214,7 @@ async def when_the_select_is_set_to(
     await hass.services.async_call(
         select.DOMAIN, select.SERVICE_SELECT_OPTION, data, blocking=True
     )
+    await hass.async_block_till_done()
 
 
 def the_select_value_should_be(name: str, state: str, hass: HomeAssistant) -> None:
@@ -282,6 +283,18 @@ class TestSelect:
         the_mqtt_topic_value_should_be(0x0003, "FFFF", mqtt_mock)
         the_select_value_should_be("select.bigger_enum_test_enum", "Max", hass)
 
+    async def test_shows_unknown_for_value_without_option(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test a value outside the enum only makes its own select unknown, and the ERD's other selects still update."""
+        await when_the_erd_is_set_to(0x0002, "0101", hass)
+
+        await when_the_erd_is_set_to(0x0002, "0500", hass)
+        the_select_value_should_be(
+            "select.multi_field_test_field_one", STATE_UNKNOWN, hass
+        )
+        the_select_value_should_be("select.multi_field_test_field_two", "Zero", hass)
+
     async def test_shows_unknown_when_unsupported(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None:
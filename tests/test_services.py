@@ -0,0 +1,279 @@
+"""Test GE Appliances device services."""
+
+from typing import Any
+
+from custom_components.geappliances.const import (
+    ATTR_DEVICE,
+    ATTR_ERD,
+    ATTR_ERDS,
+    ATTR_FIELDS,
+    DOMAIN,
+    SERVICE_GET_DEVICE_SNAPSHOT,
+    SERVICE_WRITE_ERDS,
+)
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant, ServiceResponse
+from homeassistant.exceptions import ServiceValidationError
+
+from .common import (
+    ERD_WRITE_TOPIC,
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+    mqtt_client_should_not_publish,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Cycle Test", "length": 4 },
+                    { "erd": "0x0002", "name": "Read Only Test", "length": 1 },
+                    { "erd": "0x0003", "name": "Temperature Test", "length": 2 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Cycle Test",
+            "id": "0x0001",
+            "operations": ["read", "write"],
+            "data": [
+                {
+                    "name": "Mode",
+                    "type": "enum",
+                    "values": { "0": "Off", "1": "Eco", "2": "Heavy" },
+                    "offset": 0,
+                    "size": 1
+                },
+                {
+                    "name": "Delay",
+                    "type": "u16",
+                    "offset": 1,
+                    "size": 2
+                },
+                {
+                    "name": "Dry",
+                    "type": "bool",
+                    "bits": { "offset": 0, "size": 1 },
+                    "offset": 3,
+                    "size": 1
+                },
+                {
+                    "name": "Rinse",
+                    "type": "bool",
+                    "bits": { "offset": 1, "size": 1 },
+                    "offset": 3,
+                    "size": 1
+                }
+            ]
+        },
+        {
+            "name": "Read Only Test",
+            "id": "0x0002",
+            "operations": ["read"],
+            "data": [
+                {
+                    "name": "Read Only Test",
+                    "type": "u8",
+                    "offset": 0,
+                    "size": 1
+                }
+            ]
+        },
+        {
+            "name": "Temperature Test",
+            "id": "0x0003",
+            "operations": ["read", "write"],
+            "data": [
+                {
+                    "name": "Temperature",
+                    "type": "i16",
+                    "offset": 0,
+                    "size": 2
+                }
+            ]
+        }
+    ]
+}"""
+
+
+@pytest.fixture(autouse=True)
+async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Set up for all tests."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0001, "00 0000 02", hass)
+    await given_the_erd_is_set_to(0x0002, "00", hass)
+    await given_the_erd_is_set_to(0x0003, "0000", hass)
+    mqtt_mock.async_publish.reset_mock()
+
+
+async def when_the_erds_are_written(
+    erds: list[dict[str, Any]], hass: HomeAssistant
+) -> None:
+    """Write the ERD field assignments with a single service call."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_WRITE_ERDS,
+        {ATTR_DEVICE: "test", ATTR_ERDS: erds},
+        blocking=True,
+    )
+
+
+async def writing_the_erds_should_fail(
+    erds: list[dict[str, Any]], hass: HomeAssistant
+) -> None:
+    """Assert the service call is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await when_the_erds_are_written(erds, hass)
+
+
+def the_mqtt_topics_should_be_published(
+    values: dict[int, str], mqtt_mock: MqttMockHAClient
+) -> None:
+    """Assert exactly the given ERDs were published with the given values."""
+    assert mqtt_mock.async_publish.call_count == len(values)
+    for erd, value in values.items():
+        mqtt_mock.async_publish.assert_any_call(
+            ERD_WRITE_TOPIC.format(f"{erd:#06x}"), value, 0, False
+        )
+
+
+async def when_the_device_snapshot_is_requested(
+    device_name: str, hass: HomeAssistant
+) -> ServiceResponse:
+    """Request the decoded snapshot of the device."""
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_DEVICE_SNAPSHOT,
+        {ATTR_DEVICE: device_name},
+        blocking=True,
+        return_response=True,
+    )
+
+
+class TestWriteErds:
+    """Hold write ERDs service tests."""
+
+    async def test_writes_several_erds_in_one_call(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the service encodes each ERD once and publishes every ERD."""
+        await when_the_erds_are_written(
+            [
+                {ATTR_ERD: "0x0001", ATTR_FIELDS: {"Mode": "Eco", "Delay": 300}},
+                {ATTR_ERD: 0x0003, ATTR_FIELDS: {"Temperature": -2}},
+                {ATTR_ERD: "0x0001", ATTR_FIELDS: {"Dry": True}},
+            ],
+            hass,
+        )
+
+        the_mqtt_topics_should_be_published(
+            {0x0001: "01012c03", 0x0003: "fffe"}, mqtt_mock
+        )
+
+    async def test_accepts_enum_values_by_number(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the service accepts an enum value given as its number."""
+        await when_the_erds_are_written(
+            [{ATTR_ERD: "0x0001", ATTR_FIELDS: {"Mode": 2}}], hass
+        )
+
+        the_mqtt_topics_should_be_published({0x0001: "02000002"}, mqtt_mock)
+
+    async def test_rejects_invalid_assignments(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the service rejects assignments that do not match the ERD definitions without publishing anything."""
+        await writing_the_erds_should_fail(
+            [{ATTR_ERD: "0x0001", ATTR_FIELDS: {"Unknown": 1}}], hass
+        )
+        await writing_the_erds_should_fail(
+            [{ATTR_ERD: "0x0001", ATTR_FIELDS: {"Mode": "Turbo"}}], hass
+        )
+        await writing_the_erds_should_fail(
+            [{ATTR_ERD: "0x0001", ATTR_FIELDS: {"Delay": 70000}}], hass
+        )
+        await writing_the_erds_should_fail(
+            [
+                {ATTR_ERD: "0x0003", ATTR_FIELDS: {"Temperature": 1}},
+                {ATTR_ERD: "0x0002", ATTR_FIELDS: {"Read Only Test": 1}},
+            ],
+            hass,
+        )
+        await writing_the_erds_should_fail(
+            [{ATTR_ERD: "0x0004", ATTR_FIELDS: {"Test": 1}}], hass
+        )
+
+        mqtt_client_should_not_publish(mqtt_mock)
+
+    async def test_rejects_unknown_device(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the service rejects a device that has not been discovered."""
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_WRITE_ERDS,
+                {ATTR_DEVICE: "unknown", ATTR_ERDS: []},
+                blocking=True,
+            )
+
+
+class TestGetDeviceSnapshot:
+    """Hold device snapshot service tests."""
+
+    async def test_returns_every_supported_erd_decoded(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the snapshot decodes every supported ERD of the device with its field definitions."""
+        await given_the_erd_is_set_to(0x0001, "01 012C 02", hass)
+        await given_the_erd_is_set_to(0x0003, "FFFE", hass)
+
+        snapshot = await when_the_device_snapshot_is_requested("test", hass)
+
+        assert snapshot == {
+            ATTR_DEVICE: "test",
+            ATTR_ERDS: {
+                "0x0001": {
+                    "name": "Cycle Test",
+                    "value": "01012c02",
+                    "fields": {"Mode": "Eco", "Delay": 300, "Dry": 0, "Rinse": 1},
+                },
+                "0x0002": {
+                    "name": "Read Only Test",
+                    "value": "00",
+                    "fields": {"Read Only Test": 0},
+                },
+                "0x0003": {
+                    "name": "Temperature Test",
+                    "value": "fffe",
+                    "fields": {"Temperature": -2},
+                },
+            },
+        }
+
+    async def test_rejects_unknown_device(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the snapshot rejects a device that has not been discovered."""
+        with pytest.raises(ServiceValidationError):
+            await when_the_device_snapshot_is_requested("unknown", hass)
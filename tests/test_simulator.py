@@ -0,0 +1,170 @@
+"""Test the appliance fleet simulator."""
+
+from custom_components.geappliances.const import DATA_SOURCE, DOMAIN, Erd
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+)
+from .simulator.catalog import Catalog
+from .simulator.fleet import WRITE_TOPIC, Fleet
+from .simulator.transport import HassTransport, LocalBroker, topic_matches
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+FLEET_SIZE = 3
+BOOT_LOADER_VERSION_ERD = 0x0039
+
+
+@pytest.fixture(scope="module")
+def catalog() -> Catalog:
+    """Load the catalog shipped with the integration once for every test."""
+    return Catalog.load()
+
+
+async def given_a_fleet_connected_to_home_assistant(
+    catalog: Catalog, hass: HomeAssistant, mqtt_mock: MqttMockHAClient, **kwargs
+) -> Fleet:
+    """Start a fleet publishing to the integration through the MQTT test harness."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(catalog.appliance_api_json, hass)
+    given_the_appliance_api_erd_defs_are(catalog.erd_defs_json, hass)
+
+    transport = HassTransport(hass, mqtt_mock)
+    fleet = Fleet(catalog, FLEET_SIZE, transport.publish, **kwargs)
+    transport.connect(fleet)
+    fleet.start()
+    await hass.async_block_till_done()
+    return fleet
+
+
+def given_a_fleet_on_a_local_broker(
+    catalog: Catalog, count: int
+) -> tuple[Fleet, LocalBroker, list[str]]:
+    """Start a fleet on a local broker and return the topics it publishes to."""
+    broker = LocalBroker()
+    topics: list[str] = []
+    broker.subscribe("geappliances/#", lambda topic, payload: topics.append(topic))
+    fleet = Fleet(catalog, count, broker.publish)
+    broker.subscribe(WRITE_TOPIC, fleet.handle_write)
+    fleet.start()
+    return fleet, broker, topics
+
+
+async def when_the_integration_writes(
+    device_name: str, erd: Erd, value: bytes, hass: HomeAssistant
+) -> None:
+    """Publish a write to a simulated appliance."""
+    await hass.data[DOMAIN][DATA_SOURCE].erd_publish(device_name, erd, value)
+    await hass.async_block_till_done()
+
+
+async def the_integration_should_have_the_fleet_values(
+    fleet: Fleet, hass: HomeAssistant
+) -> None:
+    """Check the integration set up every simulated appliance with its latest values."""
+    data_source = hass.data[DOMAIN][DATA_SOURCE]
+    for name, appliance in fleet.appliances.items():
+        assert await data_source.device_exists(name)
+        for erd, value in appliance.values.items():
+            assert await data_source.erd_read(name, erd) == value
+
+
+def every_appliance_should_be_in_the_device_registry(
+    fleet: Fleet, hass: HomeAssistant
+) -> None:
+    """Check a device was registered for every simulated appliance."""
+    device_registry = dr.async_get(hass)
+    for name in fleet.appliances:
+        assert device_registry.async_get_device(identifiers={(DOMAIN, name)})
+
+
+class TestSimulator:
+    """Hold appliance fleet simulator tests."""
+
+    async def test_fleet_is_discovered(
+        self, catalog: Catalog, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the integration discovers every simulated appliance from its manifests."""
+        fleet = await given_a_fleet_connected_to_home_assistant(
+            catalog, hass, mqtt_mock
+        )
+        every_appliance_should_be_in_the_device_registry(fleet, hass)
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+
+    async def test_fleet_publishes_updates_as_time_passes(
+        self, catalog: Catalog, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test values changed by the simulated appliances reach the integration."""
+        fleet = await given_a_fleet_connected_to_home_assistant(
+            catalog, hass, mqtt_mock
+        )
+        published = fleet.published
+
+        fleet.advance(600)
+        await hass.async_block_till_done()
+
+        assert fleet.published > published
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+
+    async def test_fleet_publishes_batches(
+        self, catalog: Catalog, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the integration discovers simulated appliances publishing on their erds topic."""
+        fleet = await given_a_fleet_connected_to_home_assistant(
+            catalog, hass, mqtt_mock, batch=True
+        )
+        every_appliance_should_be_in_the_device_registry(fleet, hass)
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+
+    async def test_writes_are_echoed(
+        self, catalog: Catalog, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test a simulated appliance echoes a written value back to the integration."""
+        fleet = await given_a_fleet_connected_to_home_assistant(
+            catalog, hass, mqtt_mock
+        )
+
+        await when_the_integration_writes(
+            "sim-0000", BOOT_LOADER_VERSION_ERD, bytes.fromhex("01020304"), hass
+        )
+
+        assert fleet.appliances["sim-0000"].values[
+            BOOT_LOADER_VERSION_ERD
+        ] == bytes.fromhex("01020304")
+        await the_integration_should_have_the_fleet_values(fleet, hass)
+
+    def test_fleet_runs_on_a_local_broker(self, catalog: Catalog) -> None:
+        """Test a large fleet publishes manifests first and echoes writes on a local broker."""
+        fleet, broker, topics = given_a_fleet_on_a_local_broker(catalog, 100)
+
+        assert topics[0] == "geappliances/sim-0000/erd/0x0092/value"
+        assert len(topics) == fleet.published
+
+        broker.publish(
+            f"geappliances/sim-0001/erd/{BOOT_LOADER_VERSION_ERD:#06x}/write",
+            "01020304",
+        )
+
+        assert topics[-1] == (
+            f"geappliances/sim-0001/erd/{BOOT_LOADER_VERSION_ERD:#06x}/value"
+        )
+
+    @pytest.mark.parametrize(
+        ("pattern", "topic", "matches"),
+        [
+            ("geappliances/#", "geappliances/sim-0000/uptime", True),
+            ("geappliances/+/erd/+/write", "geappliances/a/erd/0x0001/write", True),
+            ("geappliances/+/erd/+/write", "geappliances/a/erd/0x0001/value", False),
+            ("geappliances/+/uptime", "geappliances/a/erd/0x0001/value", False),
+        ],
+    )
+    def test_topic_matching(self, pattern: str, topic: str, matches: bool) -> None:
+        """Test the local broker matches MQTT wildcards."""
+        assert topic_matches(pattern, topic) == matches
@@ -0,0 +1,172 @@
+"""Test GE Appliances stall detection."""
+
+import logging
+
+from custom_components.geappliances.const import (
+    ATTR_DEVICE,
+    CONF_STALL_THRESHOLD,
+    DOMAIN,
+    SERVICE_GET_DEVICE_SNAPSHOT,
+    STALL_DETECTOR,
+)
+from custom_components.geappliances.ha_compatibility.stall_detector import StallDetector
+import pytest
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from .common import (
+    given_integration_is_initialized,
+    given_the_appliance_api_erd_defs_are,
+    given_the_appliance_api_is,
+    given_the_erd_is_set_to,
+    when_the_erd_is_set_to,
+)
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+# Low enough that every callback is slower
+TINY_THRESHOLD_MS = 0.000001
+
+APPLIANCE_API_JSON = """
+{
+    "common": {
+        "versions": {
+            "1": {
+                "required": [
+                    { "erd": "0x0001", "name": "Test", "length": 1 }
+                ],
+                "features": []
+            }
+        }
+    },
+    "featureApis": {}
+}"""
+
+APPLIANCE_API_DEFINTION_JSON = """
+{
+    "erds" :[
+        {
+            "name": "Test",
+            "id": "0x0001",
+            "operations": ["read"],
+            "data": [
+                { "name": "Test", "type": "u8", "offset": 0, "size": 1 }
+            ]
+        }
+    ]
+}"""
+
+
+@pytest.fixture(autouse=True)
+async def initialize(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Set up for all tests."""
+    await given_integration_is_initialized(hass, mqtt_mock)
+    given_the_appliance_api_is(APPLIANCE_API_JSON, hass)
+    given_the_appliance_api_erd_defs_are(APPLIANCE_API_DEFINTION_JSON, hass)
+
+
+async def given_the_stall_threshold_is(
+    milliseconds: float, hass: HomeAssistant
+) -> None:
+    """Log callbacks slower than the threshold."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_STALL_THRESHOLD: milliseconds}
+    )
+    await hass.async_block_till_done()
+
+
+async def when_the_device_is_discovered(hass: HomeAssistant) -> None:
+    """Publish the device's manifest and the value of its ERD."""
+    await given_the_erd_is_set_to(0x0092, "0000 0001 0000 0000", hass)
+    await given_the_erd_is_set_to(0x0001, "07", hass)
+
+
+async def when_the_snapshot_is_requested(hass: HomeAssistant) -> None:
+    """Call the device snapshot service."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_DEVICE_SNAPSHOT,
+        {ATTR_DEVICE: "test"},
+        blocking=True,
+        return_response=True,
+    )
+
+
+def the_stall_should_be_logged(
+    caplog: pytest.LogCaptureFixture, stage: str, device_name: str, erd: str
+) -> None:
+    """Assert a warning was logged for the stage, device and ERD."""
+    assert any(
+        record.levelno == logging.WARNING
+        and record.getMessage().startswith(f"GE Appliances {stage} took")
+        and f"(device: {device_name}, ERD: {erd})" in record.getMessage()
+        for record in caplog.records
+    )
+
+
+def no_stall_should_be_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Assert no stall warning was logged."""
+    assert not any(" took " in record.getMessage() for record in caplog.records)
+
+
+class TestStallDetector:
+    """Hold stall detection tests."""
+
+    async def test_is_off_by_default(
+        self, hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test nothing is timed or logged until a threshold is set."""
+        await when_the_device_is_discovered(hass)
+
+        assert hass.data[DOMAIN][STALL_DETECTOR].stalls == 0
+        no_stall_should_be_logged(caplog)
+
+    async def test_logs_slow_handlers_and_discovery(
+        self, hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test slow MQTT handlers and entity discovery are logged with the device and ERD."""
+        await given_the_stall_threshold_is(TINY_THRESHOLD_MS, hass)
+
+        await when_the_device_is_discovered(hass)
+
+        the_stall_should_be_logged(caplog, "MQTT handler", "test", "0x0092")
+        the_stall_should_be_logged(caplog, "sensor discovery", "test", "0x0001")
+
+    async def test_logs_slow_services(
+        self, hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test slow device services are logged with the device."""
+        await when_the_device_is_discovered(hass)
+        await given_the_stall_threshold_is(TINY_THRESHOLD_MS, hass)
+
+        await when_the_snapshot_is_requested(hass)
+
+        the_stall_should_be_logged(
+            caplog, "get_device_snapshot service", "test", "None"
+        )
+
+    async def test_stops_logging_when_turned_off(
+        self, hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test setting the threshold back to zero turns detection off."""
+        await given_the_stall_threshold_is(TINY_THRESHOLD_MS, hass)
+        await given_the_stall_threshold_is(0, hass)
+
+        await when_the_device_is_discovered(hass)
+        await when_the_erd_is_set_to(0x0001, "08", hass)
+
+        no_stall_should_be_logged(caplog)
+
+    def test_only_logs_callbacks_over_the_threshold(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test callbacks at or under the threshold are not logged."""
+        detector = StallDetector(0.01)
+
+        detector.report(0.01, "meta ERD transform", "test", 0x0001)
+        detector.report(0.02, "meta ERD transform", "test", 0x0001)
+
+        assert detector.stalls == 1
+        the_stall_should_be_logged(caplog, "meta ERD transform", "test", "0x0001")
@@ -1,6 +1,17 @@
 """Test GE Appliances switch."""
 
+import asyncio
+from datetime import timedelta
+
+from custom_components.geappliances.const import (
+    CONF_WRITE_RETRIES,
+    CONF_WRITE_WINDOW,
+    DATA_SOURCE,
+    DOMAIN,
+    Erd,
+)
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 from pytest_homeassistant_custom_component.typing import MqttMockHAClient
 
 from homeassistant.components import switch
@@ -14,14 +25,20 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
 from .common import (
     given_integration_is_initialized,
+    given_payloads_are_binary,
     given_the_appliance_api_erd_defs_are,
     given_the_appliance_api_is,
     given_the_status_pair_dict_is,
+    given_writes_are_optimistic,
+    the_mqtt_topic_bytes_should_be,
     the_mqtt_topic_value_should_be,
     when_the_erd_is_set_to,
+    when_the_erd_is_set_to_bytes,
 )
 
 pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
@@ -55,7 +72,8 @@ APPLIANCE_API_JSON = """
                         { "erd": "0x0002", "name": "Multi Field Test", "length": 2 },
                         { "erd": "0x0004", "name": "Bitfield Test", "length": 1 },
                         { "erd": "0x0005", "name": "Test Pair Status", "length": 1 },
-                        { "erd": "0x0006", "name": "Test Pair Request", "length": 1 }
+                        { "erd": "0x0006", "name": "Test Pair Request", "length": 1 },
+                        { "erd": "0x0007", "name": "Offset Bitfield Test", "length": 2 }
                     ],
                     "features": []
                 }
@@ -149,6 +167,23 @@ APPLIANCE_API_DEFINTION_JSON = """
                 }
             ]
         },
+        {
+            "name": "Offset Bitfield Test",
+            "id": "0x0007",
+            "operations": ["read", "write"],
+            "data": [
+                {
+                    "name": "Bit",
+                    "type": "bool",
+                    "bits": {
+                        "offset": 1,
+                        "size": 1
+                    },
+                    "offset": 1,
+                    "size": 1
+                }
+            ]
+        },
         {
             "name": "Test Pair Status",
             "id": "0x0005",
@@ -211,6 +246,36 @@ async def when_the_switch_is_turned_on(name: str, hass: HomeAssistant) -> None:
     await hass.services.async_call(
         switch.const.DOMAIN, SERVICE_TURN_ON, data, blocking=True
     )
+    await hass.async_block_till_done()
+
+
+async def when_the_switches_are_turned_on(
+    names: list[str], hass: HomeAssistant
+) -> None:
+    """Turn the switches on with a single service call."""
+    data = {ATTR_ENTITY_ID: names}
+    await hass.services.async_call(
+        switch.const.DOMAIN, SERVICE_TURN_ON, data, blocking=True
+    )
+    await hass.async_block_till_done()
+
+
+async def given_write_options_are(options: dict, hass: HomeAssistant) -> None:
+    """Set the write options of the config entry."""
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    hass.config_entries.async_update_entry(entry, options=options)
+    await hass.async_block_till_done()
+
+
+def given_mqtt_publishes_fail(mqtt_mock: MqttMockHAClient) -> None:
+    """Make every MQTT publish fail."""
+    mqtt_mock.async_publish.side_effect = HomeAssistantError("publish failed")
+
+
+async def when_the_erd_becomes_unsupported(erd: Erd, hass: HomeAssistant) -> None:
+    """Stop supporting the ERD on the test device."""
+    await hass.data[DOMAIN][DATA_SOURCE].move_erd_to_unsupported("test", erd)
+    await hass.async_block_till_done()
 
 
 async def when_the_switch_is_turned_off(name: str, hass: HomeAssistant) -> None:
@@ -219,6 +284,7 @@ async def when_the_switch_is_turned_off(name: str, hass: HomeAssistant) -> None:
     await hass.services.async_call(
         switch.const.DOMAIN, SERVICE_TURN_OFF, data, blocking=True
     )
+    await hass.async_block_till_done()
 
 
 async def when_the_switch_is_toggled(name: str, hass: HomeAssistant) -> None:
@@ -227,6 +293,13 @@ async def when_the_switch_is_toggled(name: str, hass: HomeAssistant) -> None:
     await hass.services.async_call(
         switch.const.DOMAIN, SERVICE_TOGGLE, data, blocking=True
     )
+    await hass.async_block_till_done()
+
+
+async def when_time_passes(seconds: float, hass: HomeAssistant) -> None:
+    """Move time forward."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done(wait_background_tasks=True)
 
 
 def the_switch_state_should_be(name: str, state: str, hass: HomeAssistant) -> None:
@@ -332,6 +405,71 @@ class TestSwitch:
         the_switch_state_should_be("switch.bitfield_test_bit_one", STATE_OFF, hass)
         the_switch_state_should_be("switch.bitfield_test_bit_two", STATE_ON, hass)
 
+    async def test_merges_bitfield_writes_to_the_same_erd(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test switches sharing an ERD that are turned on together publish a single write with both bits set."""
+        await when_the_erd_is_set_to(0x0004, "00", hass)
+        mqtt_mock.async_publish.reset_mock()
+
+        await when_the_switches_are_turned_on(
+            ["switch.bitfield_test_bit_one", "switch.bitfield_test_bit_two"], hass
+        )
+        the_mqtt_topic_value_should_be(0x0004, "03", mqtt_mock)
+        assert mqtt_mock.async_publish.call_count == 1
+        the_switch_state_should_be("switch.bitfield_test_bit_one", STATE_ON, hass)
+        the_switch_state_should_be("switch.bitfield_test_bit_two", STATE_ON, hass)
+
+    async def test_publishes_a_lone_write_without_waiting_for_the_window(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test a write with no other write to the same ERD alongside it is published right away."""
+        await given_write_options_are({CONF_WRITE_WINDOW: 1000.0}, hass)
+        await when_the_erd_is_set_to(0x0004, "00", hass)
+
+        async with asyncio.timeout(0.5):
+            await when_the_switch_is_turned_on("switch.bitfield_test_bit_one", hass)
+        the_mqtt_topic_value_should_be(0x0004, "01", mqtt_mock)
+
+    async def test_raises_when_the_write_is_not_published(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the service call fails when the write could not be published."""
+        await given_write_options_are({CONF_WRITE_RETRIES: 0}, hass)
+        await when_the_erd_is_set_to(0x0004, "00", hass)
+        given_mqtt_publishes_fail(mqtt_mock)
+
+        with pytest.raises(HomeAssistantError):
+            await when_the_switch_is_turned_on("switch.bitfield_test_bit_one", hass)
+        the_switch_state_should_be("switch.bitfield_test_bit_one", STATE_OFF, hass)
+
+    async def test_sets_bit_of_field_after_the_first_byte(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test a switch for a bit of a field that does not start the ERD writes only that bit."""
+        await when_the_erd_is_set_to(0x0007, "ff00", hass)
+        the_switch_state_should_be("switch.offset_bitfield_test_bit", STATE_OFF, hass)
+
+        await when_the_switch_is_turned_on("switch.offset_bitfield_test_bit", hass)
+        the_mqtt_topic_value_should_be(0x0007, "ff02", mqtt_mock)
+        the_switch_state_should_be("switch.offset_bitfield_test_bit", STATE_ON, hass)
+
+        await when_the_erd_is_set_to(0x0007, "ff03", hass)
+        await when_the_switch_is_turned_off("switch.offset_bitfield_test_bit", hass)
+        the_mqtt_topic_value_should_be(0x0007, "ff01", mqtt_mock)
+
+    async def test_reads_and_writes_binary_payloads(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test the switch reads and publishes raw bytes when payloads are binary."""
+        await given_payloads_are_binary(hass)
+        await when_the_erd_is_set_to_bytes(0x0004, b"\x02", hass)
+        the_switch_state_should_be("switch.bitfield_test_bit_two", STATE_ON, hass)
+        the_switch_state_should_be("switch.bitfield_test_bit_one", STATE_OFF, hass)
+
+        await when_the_switch_is_turned_on("switch.bitfield_test_bit_one", hass)
+        the_mqtt_topic_bytes_should_be(0x0004, b"\x03", mqtt_mock)
+
     async def test_shows_unknown_when_unsupported(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None:
@@ -367,3 +505,52 @@ class TestSwitch:
 
         await when_the_erd_is_set_to(0x0005, "01", hass)
         the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+    async def test_optimistic_switch_shows_written_value_until_confirmed(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test optimistic paired switch shows the written value right away and keeps it once the status ERD confirms it."""
+        await given_writes_are_optimistic(5, hass)
+        await when_the_erd_is_set_to(0x0005, "00", hass)
+        await when_the_erd_is_set_to(0x0006, "00", hass)
+
+        await when_the_switch_is_turned_on("switch.test_pair_test_switch", hass)
+        the_mqtt_topic_value_should_be(0x0006, "01", mqtt_mock)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+        await when_the_erd_is_set_to(0x0005, "01", hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+        await when_time_passes(10, hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+    async def test_optimistic_switch_rolls_back_when_not_confirmed(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test optimistic paired switch returns to the reported value when the status ERD does not confirm the write in time."""
+        await given_writes_are_optimistic(5, hass)
+        await when_the_erd_is_set_to(0x0005, "00", hass)
+        await when_the_erd_is_set_to(0x0006, "00", hass)
+
+        await when_the_switch_is_turned_on("switch.test_pair_test_switch", hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+        await when_time_passes(10, hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_OFF, hass)
+
+    async def test_optimistic_switch_shows_unknown_when_unsupported_while_pending(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test optimistic paired switch shows STATE_UNKNOWN when its status ERD stops being supported before the write is confirmed."""
+        await given_writes_are_optimistic(5, hass)
+        await when_the_erd_is_set_to(0x0005, "00", hass)
+        await when_the_erd_is_set_to(0x0006, "00", hass)
+
+        await when_the_switch_is_turned_on("switch.test_pair_test_switch", hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_ON, hass)
+
+        await when_the_erd_becomes_unsupported(0x0005, hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_UNKNOWN, hass)
+
+        await when_time_passes(10, hass)
+        the_switch_state_should_be("switch.test_pair_test_switch", STATE_UNKNOWN, hass)
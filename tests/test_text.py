@@ -206,6 +206,7 @@ async def when_the_text_is_set_to(name: str, value: str, hass: HomeAssistant) ->
     """Set the text value."""
     data = {ATTR_ENTITY_ID: name, ATTR_VALUE: value}
     await hass.services.async_call(text.DOMAIN, SERVICE_SET_VALUE, data, blocking=True)
+    await hass.async_block_till_done()
 
 
 def the_text_value_should_be(name: str, state: str, hass: HomeAssistant) -> None:
@@ -249,6 +250,14 @@ class TestText:
         the_text_value_should_be("text.multi_field_test_field_one", "hello", hass)
         the_text_value_should_be("text.multi_field_test_field_two", ",world", hass)
 
+    async def test_replaces_invalid_characters(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test bytes that aren't UTF-8 are replaced instead of failing the update for every field."""
+        await when_the_erd_is_set_to(0x0002, "ff656c6c6f" + b",world".hex(), hass)
+        the_text_value_should_be("text.multi_field_test_field_one", "\ufffdello", hass)
+        the_text_value_should_be("text.multi_field_test_field_two", ",world", hass)
+
     async def test_sets_correct_bytes(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None:
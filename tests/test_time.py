@@ -365,6 +365,15 @@ class TestTime:
         )
         the_time_value_should_be("time.read_only_test_read_only_test", "00:00:00", hass)
 
+    async def test_shows_unknown_for_invalid_time(
+        self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
+    ) -> None:
+        """Test an out of range time shows STATE_UNKNOWN instead of failing the update."""
+        await when_the_erd_is_set_to(0x0001, "010101", hass)
+
+        await when_the_erd_is_set_to(0x0001, "1A0000", hass)
+        the_time_value_should_be("time.time_test_time_test", STATE_UNKNOWN, hass)
+
     async def test_shows_unknown_when_unsupported(
         self, hass: HomeAssistant, mqtt_mock: MqttMockHAClient
     ) -> None: